@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .models import User
+
+
+def user_cache_key(user_id, fingerprint):
+    return f"auth_user:{user_id}:{fingerprint}"
+
+
+def password_fingerprint(user):
+    # The token version: simplejwt's revoke claim, which changes whenever the password does
+    return get_md5_hash_password(user.password)
+
+
+def get_cached_user(user_id, fingerprint):
+    # User for a token, from a short-lived cache keyed on user id and token version.
+    # Only tokens carrying the current version populate the cache, so stale tokens always miss.
+    key = user_cache_key(user_id, fingerprint)
+    user = cache.get(key)
+    if user is None:
+        user = User.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+        if user is not None and fingerprint == password_fingerprint(user):
+            cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+    return user
+
+
+def invalidate_cached_user(user, *passwords):
+    # Drop the entries for the user's current password hash and any it was just changed from
+    passwords = {user.password, *passwords} - {None, ""}
+    cache.delete_many([user_cache_key(user.pk, get_md5_hash_password(password)) for password in passwords])
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    # JWTAuthentication without the per-request primary-key lookup on the users table
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        fingerprint = validated_token.get(api_settings.REVOKE_TOKEN_CLAIM)
+        user = get_cached_user(user_id, fingerprint)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        # Tokens issued before they carried a version stay valid until they expire (access tokens
+        # within ACCESS_TOKEN_LIFETIME; refresh tokens pick the claim up on their next rotation)
+        if fingerprint is not None and fingerprint != password_fingerprint(user):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return user
@@ -76,6 +76,11 @@ class User(AbstractBaseUser, PermissionsMixin):
 
         super().save(*args, **kwargs)
 
+    def set_password(self, raw_password):
+        # Keep the outgoing hash so cached auth entries for old tokens can be dropped on save (see signals.py)
+        self._previous_password = self.password
+        super().set_password(raw_password)
+
     def __str__(self):
         return self.email
 
@@ -1,7 +1,17 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+    TokenVerifySerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import UntypedToken
+from .authentication import get_cached_user, password_fingerprint
 from .models import User, PasswordResetToken, UserOTP, UserProfile
+from .tokens import RedisBlacklistRefreshToken, is_blacklisted, touch_last_login
 import hashlib, re
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -150,8 +160,11 @@ class VerifyOTPSerializer(serializers.Serializer):
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     # Custom JWT serializer to include message and user data
+    token_class = RedisBlacklistRefreshToken
+
     def validate(self, attrs):
         data = super().validate(attrs)
+        touch_last_login(self.user)
 
         new_data = {
             "message": "Login successful",
@@ -166,6 +179,45 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
 
         return new_data
 
+class CachedTokenRefreshSerializer(TokenRefreshSerializer):
+    # Refresh/rotation against the cached user and the Redis blacklist instead of two table lookups
+    token_class = RedisBlacklistRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+
+        fingerprint = refresh.get(api_settings.REVOKE_TOKEN_CLAIM)
+        user = get_cached_user(refresh.get(api_settings.USER_ID_CLAIM), fingerprint)
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(_("No active account found for the given token."), code="no_active_account")
+
+        current = password_fingerprint(user)
+        if fingerprint is None:
+            # Issued before tokens carried a version; upgraded here so the access token passes authentication
+            refresh[api_settings.REVOKE_TOKEN_CLAIM] = current
+        elif fingerprint != current:
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        data = {"access": str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data["refresh"] = str(refresh)
+        return data
+
+
+class CachedTokenVerifySerializer(TokenVerifySerializer):
+    def validate(self, attrs):
+        token = UntypedToken(attrs["token"])
+        if api_settings.BLACKLIST_AFTER_ROTATION and is_blacklisted(token.get(api_settings.JTI_CLAIM)):
+            raise serializers.ValidationError(_("Token is blacklisted"))
+        return {}
+
+
 class UserProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = UserProfile
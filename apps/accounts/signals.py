@@ -0,0 +1,29 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from .authentication import invalidate_cached_user
+from .models import User
+from .tokens import add_to_blacklist
+
+
+@receiver(post_save, sender=User, dispatch_uid="accounts:user_saved")
+def user_saved(sender, instance, update_fields=None, **kwargs):
+    # Deactivation, password changes and profile edits all have to reach cached request.user objects
+    if update_fields and set(update_fields) <= {"last_login"}:
+        return
+    invalidate_cached_user(instance, getattr(instance, "_previous_password", None))
+    instance._previous_password = None
+
+
+@receiver(post_delete, sender=User, dispatch_uid="accounts:user_deleted")
+def user_deleted(sender, instance, **kwargs):
+    invalidate_cached_user(instance)
+
+
+@receiver(post_save, sender=BlacklistedToken, dispatch_uid="accounts:token_blacklisted")
+def token_blacklisted(sender, instance, created, **kwargs):
+    if created:
+        token = instance.token
+        transaction.on_commit(lambda: add_to_blacklist(token.jti, token.expires_at))
@@ -0,0 +1,92 @@
+import functools
+import logging
+import time
+
+import redis
+from django.conf import settings
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+# Sorted set of blacklisted jti -> expiry timestamp. The database stays the source of truth;
+# the loaded marker disappears with the set on a Redis flush, which triggers a reload.
+BLACKLIST_KEY = "welleazy:jwt:blacklist"
+BLACKLIST_LOADED_KEY = "welleazy:jwt:blacklist:loaded"
+
+
+@functools.cache
+def _redis():
+    return redis.Redis.from_url(settings.JWT_BLACKLIST_REDIS_URL)
+
+
+def _load_blacklist(client):
+    rows = BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now()).values_list(
+        "token__jti", "token__expires_at"
+    )
+    pipe = client.pipeline()
+    for jti, expires_at in rows.iterator(chunk_size=2000):
+        pipe.zadd(BLACKLIST_KEY, {jti: expires_at.timestamp()})
+    pipe.set(BLACKLIST_LOADED_KEY, 1)
+    pipe.execute()
+
+
+def add_to_blacklist(jti, expires_at):
+    try:
+        client = _redis()
+        pipe = client.pipeline()
+        pipe.zadd(BLACKLIST_KEY, {jti: expires_at.timestamp()})
+        # Expired tokens fail signature checks anyway, so their entries can go
+        pipe.zremrangebyscore(BLACKLIST_KEY, "-inf", time.time())
+        pipe.execute()
+    except redis.RedisError:
+        # The reload on the next check picks the token up from the database
+        logger.warning("Could not mirror blacklisted token %s to Redis", jti, exc_info=True)
+        try:
+            _redis().delete(BLACKLIST_LOADED_KEY)
+        except redis.RedisError:
+            pass
+
+
+def is_blacklisted(jti):
+    if not jti:
+        return False
+    try:
+        client = _redis()
+        loaded, score = client.pipeline().exists(BLACKLIST_LOADED_KEY).zscore(BLACKLIST_KEY, jti).execute()
+        if not loaded:
+            _load_blacklist(client)
+            score = client.zscore(BLACKLIST_KEY, jti)
+        return score is not None
+    except redis.RedisError:
+        logger.warning("Redis unavailable, checking token blacklist in the database", exc_info=True)
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+
+class RedisBlacklistRefreshToken(RefreshToken):
+    # Same token, but the blacklist check on every refresh/verify is a Redis lookup instead of a join
+
+    def check_blacklist(self):
+        if is_blacklisted(self.payload.get(api_settings.JTI_CLAIM)):
+            raise TokenError(_("Token is blacklisted"))
+
+
+def touch_last_login(user):
+    # Replaces UPDATE_LAST_LOGIN: at most one write per interval, and a queryset update so no post_save fires
+    now = timezone.now()
+    if user.last_login and now - user.last_login < settings.LAST_LOGIN_UPDATE_INTERVAL:
+        return
+    User.objects.filter(pk=user.pk).update(last_login=now)
+    user.last_login = now
+
+
+def tokens_for_user(user):
+    refresh = RedisBlacklistRefreshToken.for_user(user)
+    touch_last_login(user)
+    return refresh
@@ -4,9 +4,9 @@ from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
 from rest_framework.authtoken.models import Token
 from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.tokens import RefreshToken
+from .tokens import RedisBlacklistRefreshToken, tokens_for_user
 from django.core.mail import send_mail
-from twilio.rest import Client
+from apps.common.utils.http_client import twilio_client
 from django.conf import settings
 from rest_framework_simplejwt.views import TokenObtainPairView
 from .serializers import CustomTokenObtainPairSerializer
@@ -44,7 +44,7 @@ class LoginView(APIView):
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data["user"]
 
-        refresh = RefreshToken.for_user(user)
+        refresh = tokens_for_user(user)
         return Response({
             "message": "Login successful",
             "refresh": str(refresh),
@@ -125,7 +125,7 @@ class RequestOTPView(APIView):
                 fail_silently=False,
             )
         else:
-            client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
+            client = twilio_client()
             client.messages.create(
                 body=f"Your login OTP is {otp_plain}. It expires in 10 minutes.",
                 from_=settings.TWILIO_PHONE_NUMBER,
@@ -199,7 +199,7 @@ class VerifyOTPView(APIView):
         otp_obj.is_used = True
         otp_obj.save()
 
-        refresh = RefreshToken.for_user(user)
+        refresh = tokens_for_user(user)
         return Response({
             "message": "Login successful",
             "refresh": str(refresh),
@@ -218,7 +218,7 @@ class LogoutView(APIView):
     def post(self, request):
         try:
             refresh_token = request.data["refresh"]
-            token = RefreshToken(refresh_token)
+            token = RedisBlacklistRefreshToken(refresh_token)
             token.blacklist()
             return Response({"message": "Logout successful"}, status=status.HTTP_200_OK)
         except Exception:
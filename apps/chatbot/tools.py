@@ -4,10 +4,7 @@ from django.db.models import Q
 # Import models
 from apps.accounts.models import UserProfile
 from apps.appointments.models import Appointment
-from apps.health_records.health.models import (
-    HeightRecord, WeightRecord, BmiRecord, BloodPressureRecord, 
-    HeartRateRecord, OxygenSaturationRecord, GlucoseRecord
-)
+from apps.health_records.health.latest import get_latest_vitals
 from apps.health_records.prescriptions.models import PrescriptionRecord
 from apps.health_records.medical_bills.models import MedicalBillRecord
 from apps.health_records.hospitalizations.models import HospitalizationRecord
@@ -103,25 +100,21 @@ class ChatbotTools:
         # Get latest health metrics (BP, Weight, etc.)
         if not self.user: return "User not authenticated."
         vitals = {}
-        
-        latest_bp = BloodPressureRecord.objects.filter(user=self.user).first()
-        if latest_bp: vitals["blood_pressure"] = f"{latest_bp.systolic}/{latest_bp.diastolic} {latest_bp.unit}"
-        
-        latest_weight = WeightRecord.objects.filter(user=self.user).first()
-        if latest_weight: vitals["weight"] = f"{latest_weight.value} {latest_weight.unit}"
+        latest = get_latest_vitals(self.user.pk)
 
-        latest_height = HeightRecord.objects.filter(user=self.user).first()
-        if latest_height: vitals["height"] = f"{latest_height.value} {latest_height.unit}"
-        
-        latest_hr = HeartRateRecord.objects.filter(user=self.user).first()
-        if latest_hr: vitals["heart_rate"] = f"{latest_hr.value} {latest_hr.unit}"
+        bp = latest.get("blood_pressure")
+        if bp: vitals["blood_pressure"] = f"{bp['systolic']}/{bp['diastolic']} {bp['unit']}"
+
+        for module in ("weight", "height", "heart_rate"):
+            record = latest.get(module)
+            if record: vitals[module] = f"{record['value']} {record['unit']}"
+
+        spo2 = latest.get("oxygen")
+        if spo2: vitals["spo2"] = f"{spo2['value']}{spo2['unit']}"
+
+        glucose = latest.get("glucose")
+        if glucose: vitals["glucose"] = f"{glucose['value']} {glucose['unit']} ({glucose['test_type']})"
 
-        latest_spo2 = OxygenSaturationRecord.objects.filter(user=self.user).first()
-        if latest_spo2: vitals["spo2"] = f"{latest_spo2.value}{latest_spo2.unit}"
-        
-        latest_glucose = GlucoseRecord.objects.filter(user=self.user).first()
-        if latest_glucose: vitals["glucose"] = f"{latest_glucose.value} {latest_glucose.unit} ({latest_glucose.test_type})"
-        
         return vitals if vitals else "No health vitals found."
 
     def get_user_medical_documents(self):
@@ -3,4 +3,12 @@ from django.apps import AppConfig
 
 class CommonConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'common'
+    name = 'apps.common'
+    # "common" is taken by apps.health_records.common
+    label = 'core'
+
+    def ready(self):
+        import apps.common.signals
+        from apps.common.metadata import static_sections
+
+        static_sections()
@@ -0,0 +1,115 @@
+import functools
+import hashlib
+import threading
+
+from apps.common.renderers import ORJSONRenderer
+from apps.common.utils import tiered_cache
+
+SPECIALITY_TAGS = ("doctor_specialities",)
+SPECIALITY_CACHE_TIMEOUT = 60 * 60
+# Cache lifetime of the unversioned bundle URL; clients revalidate with the ETag after this
+BUNDLE_MAX_AGE = 60 * 60
+
+_lock = threading.Lock()
+_rendered = {}
+
+
+@functools.cache
+def static_sections():
+    # Every *_CHOICES-backed dropdown in the app. Choices only change with a deploy, so this is
+    # built once per process; each section has the same shape as the endpoint it came from.
+    from apps.health_assessment.models import FamilyIllnessRecord, HealthAssessment
+    from apps.health_packages.models import HealthPackage
+    from apps.health_records.health.models import (
+        BloodPressureRecord, BmiRecord, GlucoseRecord, HeartRateRecord, HeightRecord,
+        OxygenSaturationRecord, WeightRecord,
+    )
+    from apps.health_records.hospitalizations.models import HospitalizationRecord
+    from apps.health_records.medical_bills.models import MedicalBillRecord
+    from apps.health_records.medicine_reminders.models import MedicineReminder
+    from apps.health_records.prescriptions.models import PrescriptionRecord
+    from apps.health_records.vaccination_certificates.models import VaccinationCertificateRecord
+    from apps.insurance_records.models import InsurancePolicyRecord
+
+    hra = HealthAssessment
+    return {
+        "health_records": {
+            "height_units": dict(HeightRecord.UNIT_CHOICES),
+            "weight_units": dict(WeightRecord.UNIT_CHOICES),
+            "blood_pressure_units": dict(BloodPressureRecord.UNIT_CHOICES),
+            "blood_pressure_types": dict(BloodPressureRecord.TYPE_CHOICES),
+            "bmi_units": dict(BmiRecord.UNIT_CHOICES),
+            "heart_rate_units": dict(HeartRateRecord.UNIT_CHOICES),
+            "oxygen_saturation_units": dict(OxygenSaturationRecord.UNIT_CHOICES),
+            "glucose_units": dict(GlucoseRecord.UNIT_CHOICES),
+            "glucose_test_types": dict(GlucoseRecord.TYPE_CHOICES),
+        },
+        "health_assessment": {
+            "mood_today": dict(hra.MOOD_CHOICES),
+            "height_unit": dict(hra.HEIGHT_UNIT_CHOICES),
+            "eat_frequency": dict(hra.FREQ5_CHOICES),
+            "water_intake": dict(hra.WATER_CHOICES),
+            "sleep_hours": dict(hra.SLEEP_HOURS_CHOICES),
+            "checkup_frequency": dict(hra.CHECKUP_FREQ_CHOICES),
+            "fitness_duration": dict(hra.DURATION4_CHOICES),
+            "other_activity": dict(hra.OTHER_ACTIVITY_CHOICES),
+            "risk_category": dict(hra.RISK_CATEGORY_CHOICES),
+            "wakeup_midnight_reasons": dict(hra.WAKEUP_REASON_CHOICES),
+            "alcohol_frequency": dict(hra.ALCOHOL_FREQUENCY_CHOICES),
+            "alcohol_duration": dict(hra.ALCOHOL_DURATION_CHOICES),
+            "alcohol_quit_period": dict(hra.ALCOHOL_QUIT_CHOICES),
+            "family_disease_list": dict(FamilyIllnessRecord.DISEASE_CHOICES),
+            "urine_difficulty_reasons": dict(hra.URINE_DIFFICULTY_REASON_CHOICES),
+            "work_stress_reasons": dict(hra.WORK_STRESS_REASON_CHOICES),
+        },
+        "insurance_records": {
+            "policy_owner_type": dict(InsurancePolicyRecord.POLICY_OWNER_CHOICES),
+            "plan_type": dict(InsurancePolicyRecord.PLAN_TYPE_CHOICES),
+            "type_of_insurance": dict(InsurancePolicyRecord.TYPE_OF_INSURANCE_CHOICES),
+            "renewal_frequency": dict(InsurancePolicyRecord.RENEWAL_FREQUENCY_CHOICES),
+            "renewal_reminder_type": dict(InsurancePolicyRecord.REMINDER_TYPE_CHOICES),
+        },
+        "medicine_reminders": {
+            "medicine_type": dict(MedicineReminder.MEDICINE_TYPE_CHOICES),
+            "frequency_type": dict(MedicineReminder.FREQUENCY_TYPE_CHOICES),
+            "intake_frequency": dict(MedicineReminder.INTAKE_FREQUENCY_CHOICES),
+            "interval_type": dict(MedicineReminder.INTERVAL_TYPE_CHOICES),
+            "duration_unit": dict(MedicineReminder.DURATION_UNIT_CHOICES),
+            "dosage_unit": dict(MedicineReminder.DOSAGE_UNIT_CHOICES),
+            "meal_relation": dict(MedicineReminder.MEAL_RELATION_CHOICES),
+        },
+        "health_package_types": dict(HealthPackage.HEALTH_PACKAGE_TYPES),
+        "prescription_types": dict(PrescriptionRecord.PRESCRIPTION_TYPE_CHOICES),
+        "vaccine_types": dict(VaccinationCertificateRecord.VACCINE_TYPE_CHOICES),
+        "hospitalization_types": dict(HospitalizationRecord.HOSPITALIZATION_TYPE_CHOICES),
+        "medical_bill_types": dict(MedicalBillRecord.MEDICAL_BILL_TYPE_CHOICES),
+    }
+
+
+def section(name):
+    return static_sections()[name]
+
+
+@tiered_cache.cached("metadata:specializations", timeout=SPECIALITY_CACHE_TIMEOUT, tags=SPECIALITY_TAGS)
+def specializations():
+    # The one database-backed list in the bundle; follows the doctor_specialities cache tag
+    from apps.consultation_filter.models import DoctorSpeciality
+    from apps.consultation_filter.serializers import DoctorSpecialitySerializer
+
+    return DoctorSpecialitySerializer(DoctorSpeciality.objects.filter(is_active=True), many=True).data
+
+
+def bundle():
+    # (version, rendered JSON) of the full bundle. Rendered once per process and again only
+    # when the specialities change; the version is a hash of the content.
+    key = tiered_cache.tag_versions(SPECIALITY_TAGS)
+    entry = _rendered.get(key)
+    if entry is None:
+        data = {**static_sections(), "doctor_specializations": specializations()}
+        renderer = ORJSONRenderer()
+        version = hashlib.sha256(renderer.render(data)).hexdigest()[:16]
+        entry = (version, renderer.render({"version": version, "data": data}))
+        with _lock:
+            _rendered.clear()
+            _rendered[key] = entry
+    return entry
@@ -0,0 +1,115 @@
+import gzip
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+from django.utils.text import compress_sequence
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+MIN_SIZE = getattr(settings, "RESPONSE_COMPRESSION_MIN_BYTES", 1024)
+BROTLI_QUALITY = getattr(settings, "RESPONSE_COMPRESSION_BROTLI_QUALITY", 4)
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/fhir+json",
+    "application/x-ndjson",
+    "application/xml",
+    "application/javascript",
+    "text/",
+)
+
+_coding_re = _lazy_re_compile(r"\s*([^\s;,]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?")
+
+
+def accepted_encodings(header):
+    # Codings the client accepts (q > 0), lower-cased
+    accepted = set()
+    for part in header.split(","):
+        match = _coding_re.match(part)
+        if not match:
+            continue
+        coding, q = match.groups()
+        try:
+            if q is not None and float(q) <= 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(coding.lower())
+    return accepted
+
+
+def _brotli_sequence(sequence):
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    for chunk in sequence:
+        data = compressor.process(chunk)
+        if data:
+            yield data
+        # Flush per chunk so streamed exports reach the client as they are produced
+        data = compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware:
+    # Brotli or gzip for text-like responses above MIN_SIZE, picked from Accept-Encoding.
+    # Like Django's GZipMiddleware, but with brotli, a size threshold suited to API payloads
+    # and no compression of already-compressed files (PDFs, images) that some views serve.
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        return self.process_response(request, response)
+
+    def process_response(self, request, response):
+        if response.has_header("Content-Encoding"):
+            return response
+        # Byte ranges address the identity body; compressing a slice would corrupt the download
+        if response.status_code == 206 or response.has_header("Content-Range"):
+            return response
+        content_type = response.get("Content-Type", "").split(";")[0].strip().lower()
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return response
+        if not response.streaming and len(response.content) < MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        accepted = accepted_encodings(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if brotli is not None and "br" in accepted:
+            encoding = "br"
+        elif "gzip" in accepted or "*" in accepted:
+            encoding = "gzip"
+        else:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                # Async iterators are left alone, as GZipMiddleware does for WSGI deployments
+                return response
+            if encoding == "br":
+                response.streaming_content = _brotli_sequence(response.streaming_content)
+            else:
+                response.streaming_content = compress_sequence(response.streaming_content)
+            del response.headers["Content-Length"]
+        else:
+            if encoding == "br":
+                compressed = brotli.compress(response.content, quality=BROTLI_QUALITY)
+            else:
+                compressed = gzip.compress(response.content, compresslevel=6, mtime=0)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        # The body now differs per encoding, so a strong validator would be wrong (RFC 9110 8.8.3)
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
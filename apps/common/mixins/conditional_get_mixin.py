@@ -0,0 +1,17 @@
+from apps.common.utils.conditional import conditional_response
+
+
+class ConditionalListMixin:
+    # Conditional GET for a viewset's list(); set conditional_related to the reverse
+    # relations (e.g. documents) whose changes should also change the ETag.
+    conditional_related = ()
+
+    def list(self, request, *args, **kwargs):
+        parent_list = super().list
+        return conditional_response(
+            self,
+            request,
+            lambda: parent_list(request, *args, **kwargs),
+            related=self.conditional_related,
+            per_user=True,
+        )
@@ -0,0 +1,44 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from apps.common.utils.tiered_cache import MODEL_TAGS, invalidate_tags
+
+# Catalog M2M through model -> tags of both sides; center listings embed these relations
+M2M_TAGS = {
+    "diagnostic_center.DiagnosticCenter_tests": ("diagnostic_centers", "tests"),
+    "diagnostic_center.DiagnosticCenter_visit_types": ("diagnostic_centers",),
+    "diagnostic_center.DiagnosticCenter_health_packages": ("diagnostic_centers", "health_packages"),
+    "diagnostic_center.DiagnosticCenter_sponsored_packages": ("diagnostic_centers", "sponsored_packages"),
+}
+
+
+def _invalidate_on_commit(*tags):
+    # Bump after commit, so no reader can re-cache the old rows between the bump and the commit
+    transaction.on_commit(partial(invalidate_tags, *tags))
+
+
+def invalidate_catalog_tag(sender, **kwargs):
+    _invalidate_on_commit(MODEL_TAGS[sender._meta.label])
+
+
+def invalidate_catalog_relation(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        _invalidate_on_commit(*M2M_TAGS[sender._meta.label])
+
+
+for model_label in MODEL_TAGS:
+    for signal in (post_save, post_delete):
+        signal.connect(
+            invalidate_catalog_tag,
+            sender=model_label,
+            dispatch_uid=f"tiered_cache:{id(signal)}:{model_label}",
+        )
+
+for through_label in M2M_TAGS:
+    m2m_changed.connect(
+        invalidate_catalog_relation,
+        sender=through_label,
+        dispatch_uid=f"tiered_cache:m2m:{through_label}",
+    )
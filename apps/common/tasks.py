@@ -0,0 +1,41 @@
+from celery import shared_task
+
+from apps.common.utils.catalog_sync import (
+    sync_all_catalogs,
+    sync_catalog,
+    sync_doctors,
+    sync_vendors,
+)
+from apps.common.utils.http_client import log_upstream_metrics
+
+
+@shared_task
+def sync_client_catalogs():
+    results = sync_all_catalogs()
+    # Bulk upserts bypass the signals that keep the center price matrix current
+    from apps.diagnostic_center.pricing import refresh_center_prices
+
+    refresh_center_prices()
+    log_upstream_metrics()
+    return results
+
+
+@shared_task
+def sync_client_catalog(name):
+    return sync_catalog(name)
+
+
+@shared_task
+def sync_client_vendors():
+    try:
+        return sync_vendors()
+    finally:
+        log_upstream_metrics()
+
+
+@shared_task
+def sync_client_doctors():
+    try:
+        return sync_doctors()
+    finally:
+        log_upstream_metrics()
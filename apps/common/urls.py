@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .views import SignedFileDownloadView
+
+urlpatterns = [
+    path("signed/<str:token>/", SignedFileDownloadView.as_view(), name="signed-file"),
+]
@@ -0,0 +1,167 @@
+import logging
+import threading
+import time
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.common.utils import http_client
+from apps.common.utils.tiered_cache import MODEL_TAGS, invalidate_tags
+
+logger = logging.getLogger(__name__)
+
+
+# Catalog name -> (settings key holding the client URL, fresh TTL in seconds)
+CATALOG_ENDPOINTS = {
+    "tests": ("CLIENT_TEST_API_URL", 15 * 60),
+    "diagnostic_centers": ("CLIENT_DIAGNOSTIC_API_URL", 15 * 60),
+    "health_packages": ("CLIENT_HEALTH_PACKAGE_API_URL", 15 * 60),
+    "sponsored_packages": ("CLIENT_SPONSORED_PACKAGE_API_URL", 15 * 60),
+    "visit_types": ("CLIENT_VISIT_TYPE_API_URL", 60 * 60),
+    "doctor_specialities": ("CLIENT_DOCTORSPECIALITY_API_URL", 60 * 60),
+    "languages": ("CLIENT_LANGUAGE_API_URL", 24 * 60 * 60),
+    "pincodes": ("CLIENT_PINCODE_API_URL", 24 * 60 * 60),
+}
+
+# Catalogs whose proxied list endpoints are behind a tiered-cache tag of the same name
+CATALOG_TAGS = set(CATALOG_ENDPOINTS) & set(MODEL_TAGS.values())
+
+KEY_PREFIX = "client_catalog"
+LOCK_TIMEOUT = 30
+WAIT_INTERVAL = 0.1
+
+
+def catalog_url(name):
+    setting_key, _ = CATALOG_ENDPOINTS[name]
+    return getattr(settings, setting_key, None)
+
+
+def _fresh_ttl(name):
+    overrides = getattr(settings, "CLIENT_CATALOG_CACHE_TTLS", {})
+    return overrides.get(name, CATALOG_ENDPOINTS[name][1])
+
+
+def _stale_ttl():
+    # How long past freshness an entry may still be served while refreshing / on error
+    return getattr(settings, "CLIENT_CATALOG_STALE_TTL", 24 * 60 * 60)
+
+
+def _data_key(name):
+    return f"{KEY_PREFIX}:{name}:data"
+
+
+def _lock_key(name):
+    return f"{KEY_PREFIX}:{name}:lock"
+
+
+def client_headers():
+    headers = {}
+    token = getattr(settings, "CLIENT_API_TOKEN", None)
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+
+def _fetch_upstream(name):
+    return http_client.get_json(catalog_url(name), headers=client_headers(), timeout=10)
+
+
+def _store(name, data):
+    previous = cache.get(_data_key(name))
+    entry = {"data": data, "fetched_at": time.time()}
+    cache.set(_data_key(name), entry, _fresh_ttl(name) + _stale_ttl())
+    if previous is None or previous["data"] != data:
+        # Proxied list endpoints are cached and ETagged on the catalog's tag (named after it);
+        # local saves never bump it in proxy mode, so a changed upstream payload has to
+        if name in CATALOG_TAGS:
+            invalidate_tags(name)
+    return entry
+
+
+def _refresh_locked(name):
+    # Caller holds the lock; released once the entry is stored (or the fetch fails)
+    try:
+        return _store(name, _fetch_upstream(name))
+    finally:
+        cache.delete(_lock_key(name))
+
+
+def refresh_catalog(name):
+    # Fetch and store one catalog; only the holder of the lock talks to upstream.
+    if not cache.add(_lock_key(name), 1, LOCK_TIMEOUT):
+        return None
+    return _refresh_locked(name)
+
+
+def _refresh_in_background(name):
+    # The lock is taken before the thread starts, so a hot stale key gets one refresh thread
+    # at a time rather than one per request
+    if not cache.add(_lock_key(name), 1, LOCK_TIMEOUT):
+        return
+
+    def run():
+        try:
+            _refresh_locked(name)
+        except requests.RequestException as e:
+            logger.warning("Background refresh of %s catalog failed: %s", name, e)
+
+    threading.Thread(target=run, name=f"catalog-refresh-{name}", daemon=True).start()
+
+
+def _wait_for_entry(name):
+    # Another worker holds the lock for a cold key; wait for it to publish
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        entry = cache.get(_data_key(name))
+        if entry is not None:
+            return entry
+        if cache.get(_lock_key(name)) is None:
+            return None
+        time.sleep(WAIT_INTERVAL)
+    return None
+
+
+def get_catalog(name):
+    """
+    Return the raw client payload for a catalog.
+
+    Fresh entries are returned as-is, stale ones are returned immediately while a
+    single background refresh runs, and cold misses are single-flighted. Raises
+    requests.RequestException only when upstream fails and nothing is cached.
+    """
+    entry = cache.get(_data_key(name))
+
+    if entry is not None:
+        if time.time() - entry["fetched_at"] >= _fresh_ttl(name):
+            _refresh_in_background(name)
+        return entry["data"]
+
+    try:
+        entry = refresh_catalog(name)
+    except requests.RequestException:
+        entry = cache.get(_data_key(name))
+        if entry is None:
+            raise
+        return entry["data"]
+
+    if entry is None:
+        entry = _wait_for_entry(name)
+    if entry is None:
+        # The other fetch failed or timed out; try once ourselves
+        entry = _store(name, _fetch_upstream(name))
+    return entry["data"]
+
+
+def fetch_catalog_now(name):
+    # Bypass freshness checks (used by the mirror sync) and repopulate the cache entry.
+    return _store(name, _fetch_upstream(name))["data"]
+
+
+def catalog_mirrored():
+    # "mirror": list endpoints read the locally synced tables; "proxy": they read through this cache
+    return getattr(settings, "CLIENT_CATALOG_SOURCE", "mirror") == "mirror"
+
+
+def invalidate_catalog(name):
+    cache.delete(_data_key(name))
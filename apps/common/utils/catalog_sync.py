@@ -0,0 +1,640 @@
+import logging
+import re
+from decimal import Decimal
+from functools import partial
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from apps.common.utils.catalog_cache import catalog_url, client_headers, fetch_catalog_now
+from apps.common.utils import http_client
+from apps.common.utils.http_client import fetch_many
+from apps.common.utils.tiered_cache import invalidate_model
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+VENDOR_LIST_CACHE_KEY = "vendors:list"
+# Bumped after every doctor sync that changes rows; doctor directory cache keys embed it
+DOCTOR_DIRECTORY_VERSION_KEY = "doctor_directory:version"
+
+_PINCODE_RE = re.compile(r"^\d{6}$")
+
+
+def _text(value):
+    return str(value).strip() if value not in (None, "") else None
+
+
+# Mappers turn one upstream item into model field values (or None to skip the row)
+
+def _map_test(item, ctx):
+    name = _text(item.get("test_name") or item.get("name"))
+    if not name:
+        return None
+    return {
+        "name": name,
+        "code": _text(item.get("code")),
+        "description": item.get("description"),
+        "price": item.get("price"),
+        "active": item.get("active", True),
+    }
+
+
+def _map_package(item, ctx):
+    name = _text(item.get("package_name") or item.get("name"))
+    if not name:
+        return None
+    return {
+        "name": name,
+        "code": _text(item.get("code")),
+        "description": item.get("description"),
+        "price": item.get("price"),
+        "validity_till": item.get("validity_till") or None,
+        "active": item.get("active", True),
+    }
+
+
+def _map_health_package(item, ctx):
+    fields = _map_package(item, ctx)
+    if fields is not None:
+        fields["package_type"] = item.get("package_type") or "regular_package"
+    return fields
+
+
+def _map_visit_type(item, ctx):
+    name = _text(item.get("name"))
+    return {"name": name[:50]} if name else None
+
+
+def _map_speciality(item, ctx):
+    name = _text(item.get("doctorspeciality_name") or item.get("name"))
+    if not name:
+        return None
+    return {"name": name, "description": item.get("description"), "is_active": True}
+
+
+def _map_language(item, ctx):
+    name = _text(item.get("language_name") or item.get("name"))
+    code = _text(item.get("code"))
+    if not name or not code:
+        return None
+    return {"name": name, "code": code[:10], "is_active": True}
+
+
+def _map_pincode(item, ctx):
+    code = _text(item.get("pincode") or item.get("code"))
+    city_name = _text(item.get("city_name"))
+    city_id = ctx["cities"].get(city_name.lower()) if city_name else None
+    if not code or not _PINCODE_RE.match(code) or not city_id:
+        return None
+    return {"code": code, "city_id": city_id}
+
+
+def _map_diagnostic_center(item, ctx):
+    name = _text(item.get("center_name") or item.get("name"))
+    pincode = _text(item.get("pincode"))
+    city_name = _text(item.get("city_name"))
+    city_id = ctx["pincode_cities"].get(pincode) or (
+        ctx["cities"].get(city_name.lower()) if city_name else None
+    )
+    if not name or not city_id:
+        return None
+    # Upstream coordinates when sent, otherwise the pincode's centroid
+    latitude, longitude = item.get("latitude"), item.get("longitude")
+    if latitude in (None, "") or longitude in (None, ""):
+        latitude, longitude = ctx["centroids"].get(pincode, (None, None))
+    return {
+        "name": name,
+        "code": _text(item.get("code")),
+        "address": item.get("address"),
+        "latitude": latitude,
+        "longitude": longitude,
+        "area": item.get("area"),
+        "pincode": pincode,
+        "contact_number": item.get("contact_number"),
+        "email": item.get("email") or None,
+        "active": item.get("active", True),
+        "city_id": city_id,
+    }
+
+
+# Catalog name -> target model, the row mapper and the model's other unique columns.
+# Every catalog upserts on external_id; the natural keys are checked before the write so one
+# upstream rename can't abort the whole batch.
+# Order matters: pincodes are synced before centers so centers can resolve their city.
+SYNC_SPECS = {
+    "visit_types": {"model": "labfilter.VisitType", "natural_keys": ["name"], "map": _map_visit_type},
+    "doctor_specialities": {"model": "consultation_filter.DoctorSpeciality", "natural_keys": ["name"], "map": _map_speciality},
+    "languages": {"model": "consultation_filter.Language", "natural_keys": ["name", "code"], "map": _map_language},
+    "pincodes": {"model": "consultation_filter.Pincode", "natural_keys": ["code"], "map": _map_pincode},
+    "tests": {"model": "labtest.Test", "natural_keys": [], "map": _map_test},
+    "health_packages": {"model": "health_packages.HealthPackage", "natural_keys": [], "map": _map_health_package},
+    "sponsored_packages": {"model": "sponsored_packages.SponsoredPackage", "natural_keys": [], "map": _map_package},
+    "diagnostic_centers": {"model": "diagnostic_center.DiagnosticCenter", "natural_keys": [], "map": _map_diagnostic_center},
+}
+
+
+def _build_context():
+    City = apps.get_model("location", "City")
+    Pincode = apps.get_model("consultation_filter", "Pincode")
+    PincodeCentroid = apps.get_model("location", "PincodeCentroid")
+    cities = {}
+    for city_id, name in City.objects.filter(deleted_at__isnull=True).values_list("id", "name"):
+        cities.setdefault(name.lower(), city_id)
+    return {
+        "cities": cities,
+        "pincode_cities": dict(
+            Pincode.objects.filter(deleted_at__isnull=True).values_list("code", "city_id")
+        ),
+        "centroids": {
+            code: (lat, lon)
+            for code, lat, lon in PincodeCentroid.objects.values_list("pincode", "latitude", "longitude")
+        },
+    }
+
+
+def _claim_natural_keys(model, rows, natural_keys, name):
+    # Make rows (external_id -> fields) safe to upsert on external_id against the model's other
+    # unique columns. A local row holding the same key without an external_id (seeded before the
+    # sync existed) is adopted; a key held by a different upstream row, or repeated within the
+    # feed, drops the incoming row with a warning. Dropped rows that already exist keep their
+    # current values and are not soft-deleted. Returns the number of rows dropped.
+    if not natural_keys:
+        return 0
+    known = set(
+        model.objects.filter(external_id__in=list(rows)).values_list("external_id", flat=True)
+    )
+    dropped = set()
+    for field in natural_keys:
+        claims = {}
+        for external_id, fields in rows.items():
+            if external_id in dropped:
+                continue
+            if fields[field] in claims:
+                dropped.add(external_id)
+            else:
+                claims[fields[field]] = external_id
+        holders = model.objects.filter(**{f"{field}__in": list(claims)}).values_list(field, "external_id")
+        for value, holder in holders:
+            external_id = claims[value]
+            if holder == external_id:
+                continue
+            if holder is None and external_id not in known:
+                model.objects.filter(**{field: value}, external_id__isnull=True).update(external_id=external_id)
+                known.add(external_id)
+            else:
+                dropped.add(external_id)
+
+    if dropped:
+        logger.warning(
+            "Catalog %s: skipped %d rows whose %s clash with other rows (external ids %s)",
+            name, len(dropped), "/".join(natural_keys), sorted(dropped)[:20],
+        )
+        model.objects.filter(external_id__in=dropped).update(updated_at=timezone.now())
+        for external_id in dropped:
+            del rows[external_id]
+    return len(dropped)
+
+
+def sync_catalog(name, ctx=None, data=None):
+    """
+    Mirror one client catalog into its local table.
+
+    Rows are upserted in batches on external_id, and rows that
+    came from a previous sync but are missing upstream are soft-deleted.
+    Returns a small stats dict.
+    """
+    spec = SYNC_SPECS[name]
+    model = apps.get_model(spec["model"])
+    ctx = ctx if ctx is not None else _build_context()
+
+    started_at = timezone.now()
+    if data is None:
+        data = fetch_catalog_now(name)
+
+    rows = {}
+    skipped = 0
+    for item in data:
+        fields = spec["map"](item, ctx)
+        external_id = _text(item.get("id"))
+        if fields is None or external_id is None:
+            skipped += 1
+            continue
+        fields["external_id"] = external_id
+        fields["deleted_at"] = None
+        rows[external_id] = fields
+
+    if not rows:
+        # An empty upstream answer is far more likely an outage than a wiped catalog
+        logger.warning("Catalog %s returned no usable rows; skipping sync", name)
+        return {"catalog": name, "upserted": 0, "removed": 0, "skipped": skipped}
+
+    update_fields = sorted(
+        {field for fields in rows.values() for field in fields} - {"external_id"}
+    ) + ["updated_at"]
+
+    with transaction.atomic():
+        skipped += _claim_natural_keys(model, rows, spec["natural_keys"], name)
+        objs = [model(**fields) for fields in rows.values()]
+        model.objects.bulk_create(
+            objs,
+            batch_size=BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["external_id"],
+            update_fields=update_fields,
+        )
+        # Every row seen above just had updated_at bumped; older synced rows are gone upstream
+        removed = (
+            model.objects
+            .filter(external_id__isnull=False, deleted_at__isnull=True, updated_at__lt=started_at)
+            .update(deleted_at=timezone.now())
+        )
+
+    # Bulk upserts don't send post_save, so bump the catalog's cache tag here
+    invalidate_model(model)
+
+    if name == "pincodes":
+        ctx.update(_build_context())
+
+    return {"catalog": name, "upserted": len(objs), "removed": removed, "skipped": skipped}
+
+
+def _speciality_lookup(names):
+    # Lower-cased name -> id for every speciality the vendor feed mentions, creating missing ones in one insert
+    DoctorSpeciality = apps.get_model("consultation_filter", "DoctorSpeciality")
+    lookup = {
+        name.lower(): spec_id
+        for spec_id, name in DoctorSpeciality.objects.values_list("id", "name")
+    }
+    missing = {name.lower(): name for name in names if name.lower() not in lookup}
+    if missing:
+        DoctorSpeciality.objects.bulk_create(
+            [DoctorSpeciality(name=name) for name in missing.values()],
+            ignore_conflicts=True,
+        )
+        lookup.update(
+            (name.lower(), spec_id)
+            for spec_id, name in DoctorSpeciality.objects.filter(
+                name__in=list(missing.values())
+            ).values_list("id", "name")
+        )
+    return lookup
+
+
+def sync_vendors():
+    # Incremental vendor mirror: only new or changed vendors are written, in bulk.
+    Vendor = apps.get_model("consultation_filter", "Vendor")
+    client_url = getattr(settings, "CLIENT_VENDOR_URL", None)
+    if not client_url:
+        return {"catalog": "vendors", "upserted": 0, "updated": 0}
+
+    data = http_client.get_json(client_url, timeout=10)
+
+    # Vendor names are unique too: keep the first upstream row per name
+    incoming, names = {}, {}
+    skipped = 0
+    for item in data:
+        external_id = _text(item.get("id"))
+        name = _text(item.get("name"))
+        if not external_id or not name or external_id in incoming:
+            continue
+        if name in names:
+            logger.warning("Vendor sync: %s repeats the name %r of %s; skipped", external_id, name, names[name])
+            skipped += 1
+            continue
+        names[name] = external_id
+        incoming[external_id] = item
+
+    specialities = _speciality_lookup(
+        {_text(item.get("specialization")) for item in incoming.values()} - {None}
+    )
+    existing = {
+        vendor.external_id: vendor
+        for vendor in Vendor.objects.filter(external_id__in=list(incoming))
+    }
+    # Local rows already holding an incoming name, by name
+    holders = {
+        vendor.name: vendor
+        for vendor in Vendor.objects.filter(name__in=list(names))
+    }
+
+    to_create, to_update = [], []
+    for external_id, item in incoming.items():
+        spec_name = _text(item.get("specialization"))
+        values = {
+            "name": _text(item.get("name")),
+            "available": item.get("available", True),
+            "specialization_id": specialities.get(spec_name.lower()) if spec_name else None,
+        }
+        vendor = existing.get(external_id)
+        adopted = False
+        holder = holders.get(values["name"])
+        if holder is not None and holder.external_id != external_id:
+            if vendor is None and holder.external_id is None:
+                # Vendor added locally before the sync knew it: adopt the row
+                vendor, adopted = holder, True
+                vendor.external_id = external_id
+            else:
+                logger.warning(
+                    "Vendor sync: %s wants the name %r held by vendor %s; skipped",
+                    external_id, values["name"], holder.pk,
+                )
+                skipped += 1
+                continue
+        if vendor is None:
+            to_create.append(Vendor(external_id=external_id, **values))
+        elif adopted or any(getattr(vendor, field) != value for field, value in values.items()):
+            for field, value in values.items():
+                setattr(vendor, field, value)
+            vendor.updated_at = timezone.now()
+            to_update.append(vendor)
+
+    with transaction.atomic():
+        Vendor.objects.bulk_create(
+            to_create,
+            batch_size=BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["external_id"],
+            update_fields=["name", "available", "specialization", "updated_at"],
+        )
+        Vendor.objects.bulk_update(
+            to_update,
+            ["external_id", "name", "available", "specialization", "updated_at"],
+            batch_size=BATCH_SIZE,
+        )
+
+    if to_create or to_update:
+        cache.delete(VENDOR_LIST_CACHE_KEY)
+    return {
+        "catalog": "vendors",
+        "created": len(to_create),
+        "updated": len(to_update),
+        "skipped": skipped,
+    }
+
+
+def _as_list(value):
+    if value in (None, ""):
+        return []
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def _external_ids(model_label):
+    model = apps.get_model(model_label)
+    return dict(model.objects.filter(external_id__isnull=False).values_list("external_id", "id"))
+
+
+DOCTOR_PERSONAL_FIELDS = [
+    "full_name", "city", "gender", "phone", "email", "age", "blood_group", "address",
+]
+DOCTOR_PROFESSIONAL_FIELDS = [
+    "vendor", "qualification", "experience_years", "consultation_fee",
+    "license_number", "clinic_address", "e_consultation", "in_clinic",
+]
+
+
+DOCTOR_GENDERS = {"male": "Male", "m": "Male", "female": "Female", "f": "Female"}
+
+
+def invalidate_doctor_directory():
+    cache.set(DOCTOR_DIRECTORY_VERSION_KEY, timezone.now().timestamp(), None)
+
+
+def _map_doctor(item, ctx):
+    name = _text(item.get("full_name") or item.get("name"))
+    city_name = _text(item.get("city_name") or item.get("city"))
+    city_id = ctx["cities"].get(city_name.lower()) if city_name else None
+    # Only the two values the model allows; a doctor without one is skipped rather than guessed
+    gender = DOCTOR_GENDERS.get((_text(item.get("gender")) or "").lower())
+    if not name or not city_id or not gender:
+        return None
+
+    external_id = _text(item.get("id"))
+    personal = {
+        "full_name": name[:150],
+        "city_id": city_id,
+        "gender": gender,
+        "phone": _text(item.get("phone")),
+        "email": _text(item.get("email")) or "",
+        "age": item.get("age") or 0,
+        "blood_group": (_text(item.get("blood_group")) or "")[:5],
+        "address": item.get("address"),
+    }
+    professional = {
+        "vendor_id": ctx["vendors"].get(_text(item.get("vendor"))),
+        "qualification": _text(item.get("qualification")),
+        "experience_years": item.get("experience_years") or 0,
+        "consultation_fee": Decimal(str(item.get("consultation_fee") or 0)),
+        "license_number": _text(item.get("license_number")) or f"client-{external_id}",
+        "clinic_address": item.get("clinic_address"),
+        "e_consultation": bool(item.get("e_consultation")),
+        "in_clinic": bool(item.get("in_clinic")),
+    }
+    specialities = {
+        ctx["specialities"][key]
+        for key in map(_text, _as_list(item.get("specialization")))
+        if key in ctx["specialities"]
+    }
+    languages = {
+        ctx["languages"][key]
+        for key in map(_text, _as_list(item.get("language")))
+        if key in ctx["languages"]
+    }
+    return personal, professional, specialities, languages
+
+
+def _changed(obj, values):
+    changed = [field for field, value in values.items() if getattr(obj, field) != value]
+    for field in changed:
+        setattr(obj, field, values[field])
+    return bool(changed)
+
+
+def _sync_m2m(through, owner_field, target_field, wanted):
+    # Rewrite the join rows of every owner whose set differs from upstream, in two bulk statements
+    current = {}
+    for owner_id, target_id in through.objects.filter(
+        **{f"{owner_field}__in": list(wanted)}
+    ).values_list(owner_field, target_field):
+        current.setdefault(owner_id, set()).add(target_id)
+
+    stale = [owner_id for owner_id, targets in wanted.items() if current.get(owner_id, set()) != targets]
+    if not stale:
+        return 0
+    through.objects.filter(**{f"{owner_field}__in": stale}).delete()
+    through.objects.bulk_create(
+        [
+            through(**{owner_field: owner_id, target_field: target_id})
+            for owner_id in stale
+            for target_id in wanted[owner_id]
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    return len(stale)
+
+
+def _claim_licences(model, incoming):
+    # license_number is unique: drop incoming doctors whose licence is held by another row
+    # (another upstream doctor or a locally registered one) or repeated in the feed, instead of
+    # failing the whole directory write. Returns the dropped external ids.
+    licences = {external_id: row[1]["license_number"] for external_id, row in incoming.items()}
+    holders = dict(
+        model.objects.filter(license_number__in=set(licences.values()))
+        .values_list("license_number", "external_id")
+    )
+    claimed, dropped = set(), set()
+    for external_id, licence in licences.items():
+        holder = holders.get(licence, external_id)
+        if holder != external_id or licence in claimed:
+            dropped.add(external_id)
+        else:
+            claimed.add(licence)
+    if dropped:
+        logger.warning(
+            "Doctor sync: skipped %d doctors whose licence number is held by another doctor (external ids %s)",
+            len(dropped), sorted(dropped)[:20],
+        )
+        for external_id in dropped:
+            del incoming[external_id]
+    return dropped
+
+
+def sync_doctors():
+    # Mirror the client doctor directory into DoctorPersonalDetails/DoctorProfessionalDetails.
+    # Upstream specialization, language and vendor ids are resolved through the
+    # external_id columns filled by the catalog and vendor syncs, so those run first.
+    DoctorPersonalDetails = apps.get_model("doctor_details", "DoctorPersonalDetails")
+    DoctorProfessionalDetails = apps.get_model("doctor_details", "DoctorProfessionalDetails")
+    client_url = getattr(settings, "CLIENT_DOCTOR_URL", None)
+    if not client_url:
+        return {"catalog": "doctors", "created": 0, "updated": 0, "removed": 0}
+
+    data = http_client.get_json(client_url, headers=client_headers(), timeout=10)
+
+    ctx = _build_context()
+    ctx.update(
+        specialities=_external_ids("consultation_filter.DoctorSpeciality"),
+        languages=_external_ids("consultation_filter.Language"),
+        vendors=_external_ids("consultation_filter.Vendor"),
+    )
+
+    incoming = {}
+    skipped = 0
+    for item in data:
+        external_id = _text(item.get("id"))
+        mapped = _map_doctor(item, ctx) if external_id else None
+        if mapped is None:
+            skipped += 1
+            continue
+        incoming[external_id] = mapped
+
+    if not incoming:
+        logger.warning("Doctor directory returned no usable rows; skipping sync")
+        return {"catalog": "doctors", "created": 0, "updated": 0, "removed": 0, "skipped": skipped}
+
+    # Doctors held back by a licence clash keep their current row rather than being removed
+    held_back = _claim_licences(DoctorProfessionalDetails, incoming)
+    skipped += len(held_back)
+
+    existing = {
+        doctor.external_id: doctor
+        for doctor in DoctorProfessionalDetails.objects.select_related("doctor").filter(
+            external_id__in=list(incoming)
+        )
+    }
+
+    now = timezone.now()
+    new_personal, new_professional = [], []
+    changed_personal, changed_professional = [], []
+    for external_id, (personal, professional, _, _) in incoming.items():
+        doctor = existing.get(external_id)
+        if doctor is None:
+            person = DoctorPersonalDetails(**personal)
+            new_personal.append(person)
+            new_professional.append(
+                DoctorProfessionalDetails(doctor=person, external_id=external_id, **professional)
+            )
+            continue
+        professional["deleted_at"] = None
+        if _changed(doctor.doctor, personal):
+            doctor.doctor.updated_at = now
+            changed_personal.append(doctor.doctor)
+        if _changed(doctor, professional):
+            doctor.updated_at = now
+            changed_professional.append(doctor)
+
+    with transaction.atomic():
+        DoctorPersonalDetails.objects.bulk_create(new_personal, batch_size=BATCH_SIZE)
+        for doctor in new_professional:
+            doctor.doctor_id = doctor.doctor.pk
+        DoctorProfessionalDetails.objects.bulk_create(new_professional, batch_size=BATCH_SIZE)
+        DoctorPersonalDetails.objects.bulk_update(
+            changed_personal,
+            [*DOCTOR_PERSONAL_FIELDS, "updated_at"],
+            batch_size=BATCH_SIZE,
+        )
+        DoctorProfessionalDetails.objects.bulk_update(
+            changed_professional,
+            [*DOCTOR_PROFESSIONAL_FIELDS, "deleted_at", "updated_at"],
+            batch_size=BATCH_SIZE,
+        )
+
+        ids = {doctor.external_id: doctor.pk for doctor in [*existing.values(), *new_professional]}
+        relinked = _sync_m2m(
+            DoctorProfessionalDetails.specialization.through,
+            "doctorprofessionaldetails_id",
+            "doctorspeciality_id",
+            {ids[key]: row[2] for key, row in incoming.items()},
+        )
+        relinked += _sync_m2m(
+            DoctorProfessionalDetails.language.through,
+            "doctorprofessionaldetails_id",
+            "language_id",
+            {ids[key]: row[3] for key, row in incoming.items()},
+        )
+
+        removed = (
+            DoctorProfessionalDetails.objects
+            .filter(external_id__isnull=False, deleted_at__isnull=True)
+            .exclude(external_id__in=[*incoming, *held_back])
+            .update(deleted_at=now)
+        )
+
+    from apps.doctor_details.search import refresh_search_index
+
+    # Full pass: also picks up renamed specialities, languages, vendors and cities
+    reindexed = refresh_search_index()
+    if new_professional or changed_personal or changed_professional or relinked or removed or reindexed:
+        invalidate_doctor_directory()
+    return {
+        "catalog": "doctors",
+        "created": len(new_professional),
+        "updated": len(changed_professional) + len(changed_personal),
+        "removed": removed,
+        "skipped": skipped,
+    }
+
+
+def sync_all_catalogs():
+    names = [name for name in SYNC_SPECS if catalog_url(name)]
+    # Download every catalog in parallel, then apply them in dependency order
+    payloads = fetch_many({name: partial(fetch_catalog_now, name) for name in names})
+
+    ctx = _build_context()
+    results = []
+    for name in names:
+        data = payloads[name]
+        if isinstance(data, Exception):
+            logger.error("Catalog fetch failed for %s: %s", name, data)
+            results.append({"catalog": name, "error": True})
+            continue
+        try:
+            results.append(sync_catalog(name, ctx, data))
+        except Exception:
+            logger.exception("Catalog sync failed for %s", name)
+            results.append({"catalog": name, "error": True})
+    return results
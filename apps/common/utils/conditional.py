@@ -0,0 +1,71 @@
+import functools
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from apps.common.utils.tiered_cache import tag_versions
+
+
+def queryset_stamp(queryset, related=()):
+    # (last updated_at, row count) of a queryset, plus the same for each related set.
+    # Catches edits, inserts and deletes without loading or serializing any row.
+    aggregates = {"last": Max("updated_at"), "count": Count("pk", distinct=True)}
+    for name in related:
+        aggregates[f"{name}_last"] = Max(f"{name}__updated_at")
+        aggregates[f"{name}_count"] = Count(name, distinct=True)
+    stamp = queryset.order_by().aggregate(**aggregates)
+    last_modified = max((value for key, value in stamp.items() if key.endswith("last") and value), default=None)
+    return sorted(stamp.items()), last_modified
+
+
+def _etag(*parts):
+    return '"%s"' % hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+
+
+def conditional_response(view, request, get_response, tags=(), related=(), per_user=False):
+    # Answer a GET with 304 when the client's ETag/Last-Modified is still current, before any serialization.
+    # With tags the version is the tiered-cache tag counters (catalog data); otherwise it is the
+    # queryset_stamp of the view's filtered queryset (per-user record lists).
+    if request.method != "GET":
+        return get_response()
+
+    user_part = request.user.pk if per_user else None
+    last_modified = None
+    if tags:
+        version = tag_versions(tags)
+    else:
+        version, last_modified = queryset_stamp(view.filter_queryset(view.get_queryset()), related)
+    etag = _etag(request.get_full_path(), user_part, version)
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if not_modified is not None:
+        return not_modified
+
+    response = get_response()
+    if response.status_code == 200:
+        response["ETag"] = etag
+        if timestamp:
+            response["Last-Modified"] = http_date(timestamp)
+        response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def conditional_get(tags=(), related=(), per_user=False):
+    def decorator(view_method):
+        @functools.wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            return conditional_response(
+                self,
+                request,
+                lambda: view_method(self, request, *args, **kwargs),
+                tags=tags,
+                related=related,
+                per_user=per_user,
+            )
+
+        return wrapper
+
+    return decorator
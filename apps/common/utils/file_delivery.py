@@ -0,0 +1,176 @@
+import hashlib
+import mimetypes
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core import signing
+from django.http import FileResponse, HttpResponse, HttpResponseRedirect, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date
+
+
+SIGNED_URL_SALT = "apps.common.file_delivery"
+CHUNK_SIZE = 64 * 1024
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _backend():
+    return getattr(settings, "FILE_DELIVERY_BACKEND", "django")
+
+
+def _file_stat(storage, name):
+    # (size, mtime) of the stored file; mtime is None when the storage can't tell
+    size = storage.size(name)
+    try:
+        mtime = storage.get_modified_time(name)
+    except (NotImplementedError, OSError):
+        mtime = None
+    return size, mtime
+
+
+def _etag(name, size, mtime):
+    stamp = mtime.timestamp() if mtime else ""
+    digest = hashlib.md5(f"{name}:{size}:{stamp}".encode(), usedforsecurity=False).hexdigest()
+    return f'"{digest}"'
+
+
+def _parse_range(header, size):
+    # Single byte range only. Returns (start, end) inclusive, or None when unsatisfiable.
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        length = int(end)
+        if length == 0:
+            return None
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = int(end) if end else size - 1
+    if start >= size or end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def _iter_range(fh, start, length):
+    try:
+        fh.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = fh.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        fh.close()
+
+
+def _set_common_headers(response, filename, as_attachment, etag, mtime):
+    response["Content-Disposition"] = content_disposition_header(as_attachment, filename)
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    if mtime:
+        response["Last-Modified"] = http_date(mtime.timestamp())
+    response["Cache-Control"] = "private, max-age=0, must-revalidate"
+    return response
+
+
+def _proxy_response(storage, name, content_type):
+    # Let the front proxy do the transfer; it also handles Range itself.
+    response = HttpResponse(content_type=content_type)
+    if _backend() == "x-accel":
+        prefix = getattr(settings, "FILE_DELIVERY_ACCEL_PREFIX", "/protected-media/")
+        response["X-Accel-Redirect"] = prefix.rstrip("/") + "/" + quote(name)
+    else:
+        response["X-Sendfile"] = storage.path(name)
+    return response
+
+
+def _django_response(request, storage, name, size, etag, content_type):
+    range_header = request.META.get("HTTP_RANGE")
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if range_header and (not if_range or if_range == etag):
+        byte_range = _parse_range(range_header, size)
+        if byte_range is None:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            _iter_range(storage.open(name, "rb"), start, length),
+            status=206,
+            content_type=content_type,
+        )
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = str(length)
+        return response
+
+    return FileResponse(storage.open(name, "rb"), content_type=content_type)
+
+
+def serve_stored_file(request, storage, name, filename=None, as_attachment=True):
+    # Deliver a stored file directly (Django or front proxy), honouring ETag and Range.
+    filename = filename or name.split("/")[-1]
+    content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+    size, mtime = _file_stat(storage, name)
+    etag = _etag(name, size, mtime)
+
+    not_modified = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(mtime.timestamp()) if mtime else None,
+    )
+    if not_modified is not None:
+        return not_modified
+
+    if _backend() in ("x-accel", "x-sendfile"):
+        response = _proxy_response(storage, name, content_type)
+    else:
+        response = _django_response(request, storage, name, size, etag, content_type)
+    return _set_common_headers(response, filename, as_attachment, etag, mtime)
+
+
+def serve_file(request, field_file, filename=None, as_attachment=True):
+    return serve_stored_file(
+        request, field_file.storage, field_file.name, filename, as_attachment
+    )
+
+
+def signed_storage_url(request, name, filename=None, as_attachment=True):
+    # Time-limited URL that serves a default_storage file without re-running the permission check.
+    token = signing.dumps(
+        {
+            "name": name,
+            "filename": filename or name.split("/")[-1],
+            "attachment": as_attachment,
+        },
+        salt=SIGNED_URL_SALT,
+    )
+    return request.build_absolute_uri(reverse("signed-file", args=[token]))
+
+
+def signed_file_url(request, field_file, filename=None, as_attachment=True):
+    return signed_storage_url(request, field_file.name, filename, as_attachment)
+
+
+def load_signed_token(token):
+    max_age = getattr(settings, "FILE_DELIVERY_SIGNED_URL_MAX_AGE", 300)
+    return signing.loads(token, salt=SIGNED_URL_SALT, max_age=max_age)
+
+
+def deliver_file(request, field_file, filename=None, as_attachment=True):
+    # Entry point for download views; call only after the permission check has passed.
+    if getattr(settings, "FILE_DELIVERY_SIGNED_URLS", False):
+        return HttpResponseRedirect(
+            signed_file_url(request, field_file, filename, as_attachment)
+        )
+    return serve_file(request, field_file, filename, as_attachment)
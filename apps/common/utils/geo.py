@@ -0,0 +1,136 @@
+import hashlib
+import math
+from decimal import Decimal, InvalidOperation
+
+from django.core.cache import cache
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Candidate lists are cached per grid cell of this many degrees (~1.1 km at the equator)
+CELL_DEGREES = 0.01
+CELL_CACHE_TIMEOUT = 5 * 60
+
+DEFAULT_RADIUS_KM = 10
+MAX_RADIUS_KM = 50
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+class GeoLookupError(ValueError):
+    pass
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def bounding_box(lat, lon, radius_km):
+    # (min_lat, max_lat, min_lon, max_lon) enclosing the circle; cheap to test against the lat/long index
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    dlon = math.degrees(radius_km / (EARTH_RADIUS_KM * max(math.cos(math.radians(lat)), 1e-6)))
+    return lat - dlat, lat + dlat, lon - dlon, lon + dlon
+
+
+def _float(value, name):
+    try:
+        return float(Decimal(str(value)))
+    except (InvalidOperation, ValueError):
+        raise GeoLookupError(f"Invalid {name}.")
+
+
+def _bounded_int(value, default, maximum, name):
+    if value in (None, ""):
+        return default
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise GeoLookupError(f"Invalid {name}.")
+    return max(1, min(number, maximum))
+
+
+def resolve_point(params):
+    # (lat, lon) from lat/lng query params, falling back to the pincode's centroid
+    lat, lng = params.get("lat"), params.get("lng") or params.get("lon")
+    if lat not in (None, "") and lng not in (None, ""):
+        lat, lng = _float(lat, "lat"), _float(lng, "lng")
+        if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+            raise GeoLookupError("Coordinates out of range.")
+        return lat, lng
+
+    pincode = params.get("pincode")
+    if pincode:
+        from apps.location.models import PincodeCentroid
+
+        centroid = PincodeCentroid.objects.filter(pincode=pincode.strip()).first()
+        if centroid is None:
+            raise GeoLookupError("Unknown pincode.")
+        return float(centroid.latitude), float(centroid.longitude)
+
+    raise GeoLookupError("Provide lat and lng, or a pincode.")
+
+
+def search_params(params):
+    # Validated (lat, lon, radius_km, limit) for a proximity request
+    lat, lon = resolve_point(params)
+    radius = params.get("radius_km") or params.get("radius")
+    radius = DEFAULT_RADIUS_KM if radius in (None, "") else _float(radius, "radius_km")
+    radius = max(0.1, min(radius, MAX_RADIUS_KM))
+    limit = _bounded_int(params.get("limit"), DEFAULT_LIMIT, MAX_LIMIT, "limit")
+    return lat, lon, radius, limit
+
+
+def _cell(value):
+    return math.floor(value / CELL_DEGREES)
+
+
+def _candidates(queryset, lat, lon, radius_km):
+    # (id, lat, lon) of every row inside the bounding box of the point's cell grown by the radius.
+    # The answer only depends on the cell, so nearby users share one cached list.
+    cell_lat, cell_lon = _cell(lat), _cell(lon)
+    query_key = hashlib.md5(str(queryset.query).encode(), usedforsecurity=False).hexdigest()
+    key = f"geo:{queryset.model._meta.label_lower}:{query_key}:{cell_lat}:{cell_lon}:{radius_km}"
+    rows = cache.get(key)
+    if rows is not None:
+        return rows
+
+    # Box around the cell's centre, padded by half a cell diagonal so every point in the cell is covered
+    centre_lat = (cell_lat + 0.5) * CELL_DEGREES
+    centre_lon = (cell_lon + 0.5) * CELL_DEGREES
+    padding = haversine_km(centre_lat, centre_lon, centre_lat + CELL_DEGREES / 2, centre_lon + CELL_DEGREES / 2)
+    min_lat, max_lat, min_lon, max_lon = bounding_box(centre_lat, centre_lon, radius_km + padding)
+
+    rows = [
+        (pk, float(row_lat), float(row_lon))
+        for pk, row_lat, row_lon in queryset.filter(
+            latitude__isnull=False,
+            longitude__isnull=False,
+            latitude__range=(min_lat, max_lat),
+            longitude__range=(min_lon, max_lon),
+        ).values_list("pk", "latitude", "longitude")
+    ]
+    cache.set(key, rows, CELL_CACHE_TIMEOUT)
+    return rows
+
+
+def nearest(queryset, lat, lon, radius_km=DEFAULT_RADIUS_KM, limit=DEFAULT_LIMIT):
+    # Up to `limit` rows within radius_km, nearest first, each with a `distance_km` attribute.
+    # Bounding-box prefilter in SQL, exact haversine ranking in Python.
+    ranked = sorted(
+        (distance, pk)
+        for pk, row_lat, row_lon in _candidates(queryset, lat, lon, radius_km)
+        if (distance := haversine_km(lat, lon, row_lat, row_lon)) <= radius_km
+    )[:limit]
+
+    objects = queryset.in_bulk([pk for _, pk in ranked])
+    results = []
+    for distance, pk in ranked:
+        obj = objects.get(pk)
+        if obj is not None:
+            obj.distance_km = round(distance, 2)
+            results.append(obj)
+    return results
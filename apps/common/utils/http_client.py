@@ -0,0 +1,259 @@
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from urllib.parse import urlparse
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+RETRY_STATUSES = {429, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+SLOW_CALL_SECONDS = 2.0
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+class CircuitOpenError(requests.RequestException):
+    # Raised without touching the network while an upstream's breaker is open.
+    pass
+
+
+class CircuitBreaker:
+    # closed -> open after N consecutive failures -> half-open after cooldown (one trial call)
+
+    def __init__(self, threshold, cooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half_open"
+        return "open"
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.trial_in_flight = False
+            if self.failures >= self.threshold or self.opened_at is not None:
+                self.opened_at = time.monotonic()
+
+
+class UpstreamStats:
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.short_circuited = 0
+        self.latencies = deque(maxlen=500)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds, ok):
+        with self._lock:
+            self.calls += 1
+            if not ok:
+                self.failures += 1
+            self.latencies.append(seconds)
+
+    def snapshot(self):
+        with self._lock:
+            ordered = sorted(self.latencies)
+            calls, failures = self.calls, self.failures
+            retries, short_circuited = self.retries, self.short_circuited
+
+        def pct(p):
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 1)
+
+        return {
+            "calls": calls,
+            "failures": failures,
+            "retries": retries,
+            "short_circuited": short_circuited,
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+        }
+
+
+class Upstream:
+    # Pooled keep-alive session, breaker and stats for one upstream host.
+
+    def __init__(self, host):
+        self.host = host
+        pool_size = _setting("HTTP_CLIENT_POOL_SIZE", 20)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.breaker = CircuitBreaker(
+            threshold=_setting("HTTP_CLIENT_BREAKER_THRESHOLD", 5),
+            cooldown=_setting("HTTP_CLIENT_BREAKER_COOLDOWN", 30),
+        )
+        self.stats = UpstreamStats()
+
+
+_upstreams = {}
+_upstreams_lock = threading.Lock()
+
+
+def get_upstream(url):
+    host = urlparse(url).netloc
+    upstream = _upstreams.get(host)
+    if upstream is None:
+        with _upstreams_lock:
+            upstream = _upstreams.setdefault(host, Upstream(host))
+    return upstream
+
+
+def _backoff(attempt):
+    # Exponential backoff with full jitter
+    base = _setting("HTTP_CLIENT_BACKOFF", 0.2)
+    return random.uniform(0, base * (2 ** attempt))
+
+
+def request(method, url, retries=None, timeout=10, **kwargs):
+    # Send a request through the pooled session for the URL's host.
+    # Idempotent methods are retried on connection errors, timeouts and
+    # 429/502/503/504; any other requests error fails at once. Returns the final Response (status is not raised);
+    # raises CircuitOpenError while the host's breaker is open.
+    method = method.upper()
+    upstream = get_upstream(url)
+    if retries is None:
+        retries = _setting("HTTP_CLIENT_RETRIES", 2) if method in IDEMPOTENT_METHODS else 0
+
+    attempt = 0
+    while True:
+        if not upstream.breaker.allow():
+            upstream.stats.short_circuited += 1
+            raise CircuitOpenError(f"Circuit open for upstream {upstream.host}")
+
+        started = time.monotonic()
+        try:
+            response = upstream.session.request(method, url, timeout=timeout, **kwargs)
+        except requests.RequestException as exc:
+            response, error = None, exc
+        except BaseException:
+            # Still settle the breaker, or a half-open trial would stay in flight forever
+            upstream.breaker.record_failure()
+            raise
+        else:
+            error = None
+        elapsed = time.monotonic() - started
+
+        failed = error is not None or response.status_code >= 500
+        upstream.stats.observe(elapsed, ok=not failed)
+        if failed:
+            upstream.breaker.record_failure()
+        else:
+            upstream.breaker.record_success()
+
+        if elapsed >= SLOW_CALL_SECONDS:
+            logger.warning("Slow upstream call %s %s took %.2fs", method, url, elapsed)
+
+        if error is not None:
+            retryable = isinstance(error, (requests.ConnectionError, requests.Timeout))
+        else:
+            retryable = response.status_code in RETRY_STATUSES
+        if not retryable or attempt >= retries:
+            if error is not None:
+                raise error
+            return response
+
+        attempt += 1
+        upstream.stats.retries += 1
+        time.sleep(_backoff(attempt))
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+def get_json(url, **kwargs):
+    response = get(url, **kwargs)
+    response.raise_for_status()
+    return response.json()
+
+
+def fetch_many(calls, max_workers=8):
+    # Run several upstream fetches concurrently.
+    # `calls` maps a key to either a URL (fetched with get_json) or a
+    # zero-argument callable. Returns {key: result}; a failed call's value is
+    # the exception it raised, so one slow or broken upstream does not sink
+    # the others.
+    def run(call):
+        try:
+            return call() if callable(call) else get_json(call)
+        except Exception as exc:
+            return exc
+
+    if not calls:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(calls))) as pool:
+        futures = {key: pool.submit(run, call) for key, call in calls.items()}
+        return {key: future.result() for key, future in futures.items()}
+
+
+def upstream_metrics():
+    # Per-host call counts, latency percentiles and breaker state for this process
+    return {
+        host: {**upstream.stats.snapshot(), "breaker": upstream.breaker.state}
+        for host, upstream in list(_upstreams.items())
+    }
+
+
+def log_upstream_metrics():
+    # One line per upstream host, so worker processes (which no endpoint can reach) report too
+    for host, metrics in upstream_metrics().items():
+        logger.info("Upstream %s: %s", host, metrics)
+
+
+@lru_cache(maxsize=1)
+def razorpay_client():
+    # One client per process so its requests session keeps connections alive
+    import razorpay
+
+    return razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
+
+
+@lru_cache(maxsize=1)
+def twilio_client():
+    from twilio.rest import Client
+
+    return Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
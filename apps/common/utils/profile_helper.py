@@ -1,5 +1,37 @@
+from django.core.cache import cache
+
 from apps.dependants.models import ProfileSwitch
 
+ACTIVE_PROFILE_CACHE_TIMEOUT = 5 * 60
+
+
+def _resolve_active_profile(request):
+    # Active dependant for the request's user, resolved once per request.
+    # Memoized on the underlying HttpRequest so DRF and plain Django views share it,
+    # and backed by a per-user cache entry that ProfileSwitch.activate/deactivate clear.
+    raw_request = getattr(request, "_request", request)
+    state = getattr(raw_request, "_active_profile", None)
+    if state is not None:
+        return state
+
+    user = request.user
+    cache_key = ProfileSwitch.active_cache_key(user.pk)
+    dependant_id = cache.get(cache_key)
+    dependant = None
+    if dependant_id is None:
+        switch = (
+            ProfileSwitch.objects.select_related("dependant")
+            .filter(user=user, is_active=True)
+            .first()
+        )
+        dependant = switch.dependant if switch else None
+        dependant_id = dependant.id if dependant else 0
+        cache.set(cache_key, dependant_id, ACTIVE_PROFILE_CACHE_TIMEOUT)
+
+    state = {"dependant_id": dependant_id or None, "dependant": dependant}
+    raw_request._active_profile = state
+    return state
+
 
 def get_effective_user(request):
     #Get the effective user and active dependant for the current request.
@@ -8,12 +40,7 @@ def get_effective_user(request):
     if not user.is_authenticated:
         return user, None
     
-    active_switch = ProfileSwitch.get_active_switch(user)
-    
-    if active_switch:
-        return user, active_switch.dependant.id
-    
-    return user, None
+    return user, _resolve_active_profile(request)["dependant_id"]
 
 
 def filter_by_effective_user(queryset, request, for_whom_field='for_whom', dependant_field='dependant'):
@@ -39,12 +66,20 @@ def get_active_profile_info(request):
     user, dependant_id = get_effective_user(request)
     
     if dependant_id:
-        from apps.dependants.models import Dependant
-        dependant = Dependant.objects.get(id=dependant_id)
+        state = _resolve_active_profile(request)
+        if state["dependant"] is None:
+            # Id came from the shared cache; load the row once for this request
+            from apps.dependants.models import Dependant
+            state["dependant"] = Dependant.objects.filter(id=dependant_id, is_active=True).first()
+        if state["dependant"] is None:
+            # Dependant removed behind a stale cache entry: drop it and fall back to self
+            ProfileSwitch.invalidate_active_cache(user.pk)
+            state["dependant_id"] = None
+            return {'profile_type': 'self', 'user': user, 'dependant': None}
         return {
             'profile_type': 'dependant',
             'user': user,
-            'dependant': dependant
+            'dependant': state["dependant"]
         }
     else:
         return {
@@ -0,0 +1,194 @@
+import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.response import Response
+
+MISSING = object()
+
+L1_MAX_ENTRIES = getattr(settings, "TIERED_CACHE_L1_MAX_ENTRIES", 1024)
+L1_TIMEOUT = getattr(settings, "TIERED_CACHE_L1_TIMEOUT", 30)
+# How long a worker trusts its local copy of a tag version before re-reading it from Redis.
+# This bounds how stale L1 can be in processes other than the one that invalidated.
+TAG_CHECK_INTERVAL = getattr(settings, "TIERED_CACHE_TAG_CHECK_INTERVAL", 5)
+DEFAULT_TIMEOUT = 5 * 60
+
+# Catalog model -> cache tag bumped on every save/delete (see apps.common.signals)
+MODEL_TAGS = {
+    "labtest.Test": "tests",
+    "health_packages.HealthPackage": "health_packages",
+    "sponsored_packages.SponsoredPackage": "sponsored_packages",
+    "diagnostic_center.DiagnosticCenter": "diagnostic_centers",
+    "consultation_filter.DoctorSpeciality": "doctor_specialities",
+    "consultation_filter.Language": "languages",
+    "consultation_filter.Pincode": "pincodes",
+    "location.City": "cities",
+    "location.State": "states",
+    "pharmacy.Medicine": "medicines",
+}
+
+
+class LRUCache:
+    # Small thread-safe in-process LRU with per-entry expiry
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return MISSING
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return MISSING
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + timeout)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_l1 = LRUCache(L1_MAX_ENTRIES)
+_tags = LRUCache(L1_MAX_ENTRIES)
+
+
+def _l2():
+    return caches[getattr(settings, "TIERED_CACHE_ALIAS", "default")]
+
+
+def _tag_key(tag):
+    return f"tag:{tag}"
+
+
+def tag_versions(tags):
+    # Current version of each tag, as a tuple in the given order
+    versions = {tag: _tags.get(tag) for tag in tags}
+    missing = [tag for tag, version in versions.items() if version is MISSING]
+    if missing:
+        l2 = _l2()
+        found = l2.get_many([_tag_key(tag) for tag in missing])
+        for tag in missing:
+            version = found.get(_tag_key(tag))
+            if version is None:
+                # First use of the tag: start it at 1 unless another worker just did
+                l2.add(_tag_key(tag), 1, None)
+                version = l2.get(_tag_key(tag), 1)
+            _tags.set(tag, version, TAG_CHECK_INTERVAL)
+            versions[tag] = version
+    return tuple(versions[tag] for tag in tags)
+
+
+def invalidate_tags(*tags):
+    # Entries stored under an older version of any of their tags are ignored from now on
+    l2 = _l2()
+    for tag in tags:
+        try:
+            l2.incr(_tag_key(tag))
+        except ValueError:
+            l2.set(_tag_key(tag), 2, None)
+        _tags.delete(tag)
+
+
+def invalidate_model(model):
+    tag = MODEL_TAGS.get(model._meta.label)
+    if tag:
+        invalidate_tags(tag)
+
+
+def make_key(namespace, *parts):
+    digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return f"tc:{namespace}:{digest}"
+
+
+def get(key, tags=()):
+    versions = tag_versions(tags)
+    entry = _l1.get(key)
+    if entry is not MISSING and entry[0] == versions:
+        return entry[1]
+
+    entry = _l2().get(key)
+    if entry is not None and tuple(entry[0]) == versions:
+        _l1.set(key, (versions, entry[1]), L1_TIMEOUT)
+        return entry[1]
+    return MISSING
+
+
+def set(key, value, timeout=DEFAULT_TIMEOUT, tags=()):
+    entry = (tag_versions(tags), value)
+    _l2().set(key, entry, timeout)
+    _l1.set(key, entry, min(L1_TIMEOUT, timeout))
+
+
+def delete(key):
+    _l1.delete(key)
+    _l2().delete(key)
+
+
+def get_or_set(key, compute, timeout=DEFAULT_TIMEOUT, tags=()):
+    value = get(key, tags)
+    if value is MISSING:
+        value = compute()
+        set(key, value, timeout, tags)
+    return value
+
+
+def cached(namespace, timeout=DEFAULT_TIMEOUT, tags=()):
+    # Function-level caching keyed on the call arguments (which must have a stable repr)
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = make_key(namespace, args, sorted(kwargs.items()))
+            return get_or_set(key, lambda: func(*args, **kwargs), timeout, tags)
+
+        wrapper.invalidate = lambda *args, **kwargs: delete(
+            make_key(namespace, args, sorted(kwargs.items()))
+        )
+        return wrapper
+
+    return decorator
+
+
+def cache_response(namespace, timeout=DEFAULT_TIMEOUT, tags=(), per_user=False):
+    # Caches the data of successful GET responses from a DRF view method, keyed on the full path.
+    # Use per_user for anything whose body depends on who is asking.
+    def decorator(view_method):
+        @functools.wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            if request.method != "GET":
+                return view_method(self, request, *args, **kwargs)
+
+            user_part = request.user.pk if per_user else None
+            key = make_key(namespace, request.get_full_path(), user_part)
+            data = get(key, tags)
+            if data is not MISSING:
+                return Response(data, status=status.HTTP_200_OK)
+
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                set(key, response.data, timeout, tags)
+            return response
+
+        return wrapper
+
+    return decorator
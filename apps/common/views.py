@@ -1,3 +1,66 @@
-from django.shortcuts import render
+from django.core import signing
+from django.core.files.storage import default_storage
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response
 
-# Create your views here.
+from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.common.metadata import BUNDLE_MAX_AGE, bundle
+from apps.common.utils.file_delivery import load_signed_token, serve_stored_file
+from apps.common.utils.http_client import upstream_metrics
+
+
+class SignedFileDownloadView(APIView):
+    # The signed token is the credential, so no auth/permission checks here.
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request, token):
+        try:
+            payload = load_signed_token(token)
+        except signing.BadSignature:
+            raise Http404("Link expired or invalid")
+
+        name = payload["name"]
+        if not default_storage.exists(name):
+            raise Http404("File not found")
+
+        return serve_stored_file(
+            request,
+            default_storage,
+            name,
+            filename=payload.get("filename"),
+            as_attachment=payload.get("attachment", True),
+        )
+
+
+class MetadataBundleView(APIView):
+    # Every dropdown/choice list in one response, served from memory. The same for all users and
+    # needed before login, so no auth. Clients that request ?v=<version> get an immutable response.
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        version, body = bundle()
+        etag = f'"{version}"'
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(body, content_type="application/json")
+        response["ETag"] = etag
+        if request.GET.get("v") == version:
+            response["Cache-Control"] = "public, max-age=31536000, immutable"
+        else:
+            response["Cache-Control"] = f"public, max-age={BUNDLE_MAX_AGE}"
+        return response
+
+
+class UpstreamMetricsView(APIView):
+    # Call counts, failures, retries, p50/p95 latency and breaker state per upstream host, as seen
+    # by the web process answering the request (Celery workers log theirs after each sync)
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({"upstreams": upstream_metrics()})
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-19 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('consultation_filter', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='doctorspeciality',
+            name='external_id',
+            field=models.CharField(blank=True, max_length=50, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='language',
+            name='external_id',
+            field=models.CharField(blank=True, max_length=50, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='pincode',
+            name='external_id',
+            field=models.CharField(blank=True, max_length=50, null=True, unique=True),
+        ),
+    ]
@@ -15,6 +15,7 @@ class DoctorSpeciality(BaseModel):
     description=models.TextField(blank=True, null=True)
     image=models.ImageField(upload_to='doctor_specializations/images/', blank=True, null=True)
     is_active=models.BooleanField(default=True)
+    external_id = models.CharField(max_length=50, blank=True, null=True, unique=True)
 
     class Meta:
        db_table="doctor_specializations"
@@ -30,6 +31,7 @@ class Language(BaseModel):
     name = models.CharField(max_length=100, unique=True)
     code = models.CharField(max_length=10, unique=True)  # like 'en', 'hi', 'mr'
     is_active = models.BooleanField(default=True)
+    external_id = models.CharField(max_length=50, blank=True, null=True, unique=True)
 
     class Meta:
         db_table="languages"
@@ -52,6 +54,7 @@ class UserLanguagePreference(models.Model):
 class Pincode(BaseModel):
     code = models.CharField(max_length=6, unique=True, validators=[RegexValidator(r'^\d{6}$', 'Enter a valid 6-digit pincode')])
     city = models.ForeignKey(City, on_delete=models.CASCADE, related_name="pincodes")
+    external_id = models.CharField(max_length=50, blank=True, null=True, unique=True)
    
 
 
@@ -8,6 +8,12 @@ from .models import DoctorSpeciality
 from .serializers import DoctorSpecialitySerializer
 from django.conf import settings
 import requests
+from apps.common.utils.catalog_cache import get_catalog, catalog_mirrored
+from apps.common.pagination import OptionalPageNumberPagination
+from apps.common.utils.conditional import conditional_get
+from apps.common.utils.tiered_cache import cache_response
+from apps.common.utils.catalog_sync import VENDOR_LIST_CACHE_KEY
+from django.core.cache import cache
 # from django.contrib.auth.models import User
 from django.conf import settings
 from apps.consultation_filter.models import Language, UserLanguagePreference
@@ -20,6 +26,8 @@ from apps.location.views import CityViewSet
 from .models import Vendor
 from .serializers import VendorSerializer
 import random
+
+VENDOR_LIST_CACHE_TIMEOUT = 60 * 60
 # from django_filters.rest_framework import DjangoFilterBackend
 
 
@@ -34,21 +42,16 @@ class DoctorSpecializationViewSet(viewsets.ModelViewSet):
     queryset = DoctorSpeciality.objects.filter(deleted_at__isnull=True)
     serializer_class = DoctorSpecialitySerializer
 
+    @conditional_get(tags=("doctor_specialities",))
+    @cache_response("doctor_specialities", tags=("doctor_specialities",))
     def list(self, request):
         # Return list of tests (from external API or local DB).
         client_api_url = getattr(settings, "CLIENT_DOCTORSPECIALITY_API_URL", None)
 
         # Optional: Fetch from Client API
-        if client_api_url:
+        if client_api_url and not catalog_mirrored():
             try:
-                headers = {}
-                client_api_token = getattr(settings, "CLIENT_API_TOKEN", None)
-                if client_api_token:
-                    headers["Authorization"] = f"Bearer {client_api_token}"
-
-                response = requests.get(client_api_url, headers=headers, timeout=10)
-                response.raise_for_status()
-                data = response.json()
+                data = get_catalog("doctor_specialities")
 
                 formatted_data = [
                     {
@@ -113,25 +116,20 @@ class DoctorSpecializationViewSet(viewsets.ModelViewSet):
 class LanguageViewSet(viewsets.ModelViewSet):
   
     permission_classes=[IsAuthenticated]
-    queryset = Language.objects.filter(is_active=True)
+    queryset = Language.objects.filter(is_active=True, deleted_at__isnull=True)
     serializer_class = LanguageSerializer
     lookup_field = 'name'
     
 
+    @conditional_get(tags=("languages",))
+    @cache_response("languages", tags=("languages",))
     def list(self, request):
         client_api_url = getattr(settings, "CLIENT_LANGUAGE_API_URL", None)
 
         # Optional: Fetch from Client API
-        if client_api_url:
+        if client_api_url and not catalog_mirrored():
             try:
-                headers = {}
-                client_api_token = getattr(settings, "CLIENT_API_TOKEN", None)
-                if client_api_token:
-                    headers["Authorization"] = f"Bearer {client_api_token}"
-
-                response = requests.get(client_api_url, headers=headers, timeout=10)
-                response.raise_for_status()
-                data = response.json()
+                data = get_catalog("languages")
 
                 formatted_data = [
                     {
@@ -196,24 +194,20 @@ class LanguageViewSet(viewsets.ModelViewSet):
 class PincodeViewSet(viewsets.ModelViewSet):
    
     permission_classes=[IsAuthenticated]
-    queryset = Pincode.objects.select_related('city').all()
+    queryset = Pincode.objects.select_related('city').filter(deleted_at__isnull=True)
     serializer_class = PincodeSerializer
     lookup_field='id'
+    pagination_class = OptionalPageNumberPagination
 
+    @conditional_get(tags=("pincodes", "cities"))
+    @cache_response("pincodes", tags=("pincodes", "cities"))
     def list(self, request):
         client_api_url = getattr(settings, "CLIENT_PINCODE_API_URL", None)
 
         # Optional: Fetch from Client API
-        if client_api_url:
+        if client_api_url and not catalog_mirrored():
             try:
-                headers = {}
-                client_api_token = getattr(settings, "CLIENT_API_TOKEN", None)
-                if client_api_token:
-                    headers["Authorization"] = f"Bearer {client_api_token}"
-
-                response = requests.get(client_api_url, headers=headers, timeout=10)
-                response.raise_for_status()
-                data = response.json()
+                data = get_catalog("pincodes")
 
                 formatted_data = [
                     {
@@ -236,7 +230,20 @@ class PincodeViewSet(viewsets.ModelViewSet):
                 )
     
     # LOCAL DB
-        queryset = Pincode.objects.select_related("city").all()
+        queryset = self.get_queryset().order_by("code")
+
+        city = request.query_params.get("city")
+        if city:
+            queryset = queryset.filter(city_id=city)
+
+        search = request.query_params.get("search")
+        if search:
+            queryset = queryset.filter(code__startswith=search)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
     
@@ -285,36 +292,8 @@ class VendorViewSet(viewsets.ModelViewSet):
     # filter_backends =[DjangoFilterBackend]
     # filterset_fields = ['name']
 
-    # 🔹 Helper function to sync data from client API
-    def _sync_vendors_from_client(self):
-        client_url = getattr(settings, "CLIENT_VENDOR_URL", None)
-        if not client_url:
-            raise ValueError("CLIENT_VENDOR_URL not set in settings.py")
-
-        try:
-            response = requests.get(client_url, timeout=10)
-            response.raise_for_status()
-            client_vendors = response.json()
-        except requests.RequestException as e:
-            raise ValueError(f"Error fetching client vendor list: {e}")
-
-        for data in client_vendors:
-            # Map specialization
-            spec_name = data.get("specialization")
-            specialization = None
-            if spec_name:
-                specialization, _ = DoctorSpeciality.objects.get_or_create(name=spec_name)
-
-            Vendor.objects.update_or_create(
-                external_id=data.get("id"),
-                defaults={
-                    "name": data.get("name", "").strip(),
-                    "available": data.get("available", True),
-                    "specialization": specialization,     # ← IMPORTANT FIX
-                },
-            )
-
-
+    # Vendors are mirrored from the client API by the sync_client_vendors task
+    # (apps.common.utils.catalog_sync.sync_vendors); requests only read the local table.
 
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -329,19 +308,25 @@ class VendorViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'], url_path='list')
     def list_vendors(self, request):
-        # Fetch vendors from client API, sync to DB, and list all vendor names.
+        # List all vendor names from the local mirror.
         # GET /api/vendors/list/
-        try:
-            self._sync_vendors_from_client()
-        except ValueError as e:
-            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-        vendors = Vendor.objects.all().order_by("name")
-        vendor_names = vendors.values_list("name", flat=True)
-        return Response({"vendors": list(vendor_names)}, status=status.HTTP_200_OK)
+        vendor_names = cache.get(VENDOR_LIST_CACHE_KEY)
+        if vendor_names is None:
+            vendor_names = list(Vendor.objects.order_by("name").values_list("name", flat=True))
+            cache.set(VENDOR_LIST_CACHE_KEY, vendor_names, VENDOR_LIST_CACHE_TIMEOUT)
+        return Response({"vendors": vendor_names}, status=status.HTTP_200_OK)
     
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
+        cache.delete(VENDOR_LIST_CACHE_KEY)
+
+    def perform_update(self, serializer):
+        serializer.save()
+        cache.delete(VENDOR_LIST_CACHE_KEY)
+
+    def perform_destroy(self, instance):
+        instance.delete()
+        cache.delete(VENDOR_LIST_CACHE_KEY)
 
 
     @action(detail=False, methods=['post'], url_path='select')
@@ -6,3 +6,5 @@ class DependantsConfig(AppConfig):
     name = 'apps.dependants'
     label = 'dependants'
 
+    def ready(self):
+        import apps.dependants.signals
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.core.cache import cache
 from apps.common.models import BaseModel
 from django.utils import timezone
 from datetime import timedelta
@@ -145,17 +146,28 @@ class ProfileSwitch(models.Model):
         ProfileSwitch.objects.filter(user=self.user, is_active=True).exclude(id=self.id).update(is_active=False)
         self.is_active = True
         self.save()
+        self.invalidate_active_cache(self.user_id)
 
     def deactivate(self):
         #Deactivate this profile switch.
         self.is_active = False
         self.save()
+        self.invalidate_active_cache(self.user_id)
+
+    @staticmethod
+    def active_cache_key(user_id):
+        # Cached active dependant id per user (0 = own profile); see common.utils.profile_helper
+        return f"active_profile:{user_id}"
+
+    @classmethod
+    def invalidate_active_cache(cls, user_id):
+        cache.delete(cls.active_cache_key(user_id))
 
     @classmethod
     def get_active_switch(cls, user):
         #Get the active profile switch for a user, if any.
         try:
-            return cls.objects.get(user=user, is_active=True)
+            return cls.objects.select_related("dependant").get(user=user, is_active=True)
         except cls.DoesNotExist:
             return None
 
@@ -131,15 +131,16 @@ class VerifySwitchOTPSerializer(serializers.Serializer):
         otp_obj.is_used = True
         otp_obj.save()
         
-        # Create or reactivate profile switch
+        # Create or reactivate profile switch. New rows start inactive: inserting an active one
+        # while another switch is active would violate unique_active_switch_per_user
         profile_switch, created = ProfileSwitch.objects.get_or_create(
             user=user,
             dependant=dependant,
-            defaults={'is_active': True}
+            defaults={'is_active': False}
         )
         
-        if not created:
-            profile_switch.activate()
+        # Deactivates any other active switch, activates this one and clears the cached profile
+        profile_switch.activate()
         
         return {
             'message': f'Successfully switched to {dependant.name}\'s profile',
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Dependant, ProfileSwitch
+
+
+@receiver(post_save, sender=Dependant, dispatch_uid="dependants:dependant_saved")
+def dependant_saved(sender, instance, **kwargs):
+    # A deactivated dependant can no longer be the active profile
+    if not instance.is_active:
+        switches = ProfileSwitch.objects.filter(dependant=instance, is_active=True)
+        if switches.update(is_active=False):
+            ProfileSwitch.invalidate_active_cache(instance.user_id)
+
+
+@receiver(post_delete, sender=ProfileSwitch, dispatch_uid="dependants:switch_deleted")
+def switch_deleted(sender, instance, **kwargs):
+    # Also runs for switches removed by a dependant's cascade delete
+    ProfileSwitch.invalidate_active_cache(instance.user_id)
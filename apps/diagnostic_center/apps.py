@@ -5,3 +5,6 @@ class DiagnosticCenterConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.diagnostic_center'
     label = 'diagnostic_center'
+
+    def ready(self):
+        import apps.diagnostic_center.signals
@@ -0,0 +1,31 @@
+from django.db.models import Count, Sum
+
+
+def parse_ids(value):
+    # "1, 2,3" -> [1, 2, 3]; non-numeric and duplicate entries are dropped
+    ids = []
+    for part in (value or "").split(","):
+        part = part.strip()
+        if part.isdigit() and int(part) not in ids:
+            ids.append(int(part))
+    return ids
+
+
+def match_basket(queryset, test_ids, partial=False):
+    # Centers offering the selected tests, from a single join on the center/test table.
+    # Rows are grouped per center; matched_tests counts basket tests the center
+    # offers and basket_price sums their prices. Unless partial is set, a HAVING
+    # clause keeps only centers covering the whole basket. Any other multi-valued
+    # filter on the queryset should be a subquery so it doesn't inflate the sums.
+    test_ids = list(dict.fromkeys(test_ids))
+    if not test_ids:
+        return queryset
+
+    # filter() before annotate() makes the aggregates run over the same, filtered join
+    queryset = queryset.filter(tests__id__in=test_ids).annotate(
+        matched_tests=Count("tests", distinct=True),
+        basket_price=Sum("tests__price"),
+    )
+    if not partial:
+        queryset = queryset.filter(matched_tests=len(test_ids))
+    return queryset.order_by("-matched_tests", "basket_price", "id")
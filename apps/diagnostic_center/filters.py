@@ -3,6 +3,7 @@ from apps.diagnostic_center.models import DiagnosticCenter
 from apps.health_packages.models import HealthPackage
 from apps.sponsored_packages.models import SponsoredPackage
 from apps.labtest.models import Test
+from apps.diagnostic_center.basket import match_basket
 
 class DiagnosticCenterFilter(django_filters.FilterSet):
     city_id = django_filters.NumberFilter(field_name='city__id', required=True)
@@ -14,20 +15,25 @@ class DiagnosticCenterFilter(django_filters.FilterSet):
     def filter_tests_conjoined(self, queryset, name, value):
         if not value:
             return queryset
-        
-        # To get centers that have ALL requested tests, we chain filter() calls
-        for test in value:
-            queryset = queryset.filter(tests=test)
-        return queryset.distinct()
+
+        # Centers that have ALL requested tests, matched in one GROUP BY ... HAVING query
+        return match_basket(queryset, [test.pk for test in value])
     health_package_id = django_filters.ModelChoiceFilter(
         queryset=HealthPackage.objects.all(),
-        field_name='health_packages'
+        method='filter_health_package'
     )
     sponsored_package_id = django_filters.ModelChoiceFilter(
         queryset=SponsoredPackage.objects.all(),
-        field_name='sponsored_packages'
+        method='filter_sponsored_package'
     )
 
+    # Package filters are subqueries so they don't multiply rows under the basket aggregates
+    def filter_health_package(self, queryset, name, value):
+        return queryset.filter(id__in=value.diagnostic_centers.values("id")) if value else queryset
+
+    def filter_sponsored_package(self, queryset, name, value):
+        return queryset.filter(id__in=value.diagnostic_centers.values("id")) if value else queryset
+
     class Meta:
         model = DiagnosticCenter
         fields = ['city_id', 'tests', 'health_package_id', 'sponsored_package_id']
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-19 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('diagnostic_center', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='diagnosticcenter',
+            name='external_id',
+            field=models.CharField(blank=True, max_length=50, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='diagnosticcenter',
+            name='pincode',
+            field=models.CharField(blank=True, db_index=True, max_length=10, null=True),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-19 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('diagnostic_center', '0002_diagnosticcenter_external_id_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='diagnosticcenter',
+            name='latitude',
+            field=models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True),
+        ),
+        migrations.AddField(
+            model_name='diagnosticcenter',
+            name='longitude',
+            field=models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='diagnosticcenter',
+            index=models.Index(fields=['latitude', 'longitude'], name='diag_center_geo_idx'),
+        ),
+    ]
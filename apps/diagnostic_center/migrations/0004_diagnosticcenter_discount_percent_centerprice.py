@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('diagnostic_center', '0003_diagnosticcenter_latitude_longitude'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='diagnosticcenter',
+            name='discount_percent',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=5),
+        ),
+        migrations.CreateModel(
+            name='CenterPrice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('item_type', models.CharField(choices=[('test', 'Test'), ('health_package', 'Health Package'), ('sponsored_package', 'Sponsored Package')], max_length=20)),
+                ('item_id', models.BigIntegerField()),
+                ('list_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('center', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='prices', to='diagnostic_center.diagnosticcenter')),
+            ],
+            options={
+                'db_table': 'diagnostic_center_prices',
+                'indexes': [models.Index(fields=['item_type', 'item_id'], name='center_price_item_idx')],
+                'constraints': [models.UniqueConstraint(fields=('center', 'item_type', 'item_id'), name='unique_center_item_price')],
+            },
+        ),
+    ]
@@ -10,15 +10,19 @@ class DiagnosticCenter(BaseModel):
     code = models.CharField(max_length=100, blank=True, null=True)
     address = models.TextField(blank=True, null=True)
     area = models.CharField(max_length=255, blank=True, null=True)
-    pincode = models.CharField(max_length=10, blank=True, null=True)
+    pincode = models.CharField(max_length=10, blank=True, null=True, db_index=True)
     contact_number = models.CharField(max_length=20, blank=True, null=True)
     email = models.EmailField(blank=True, null=True)
     active = models.BooleanField(default=True)
+    external_id = models.CharField(max_length=50, blank=True, null=True, unique=True)
+    latitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
+    longitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
     work_start = models.TimeField(default=time(8, 0))   # 8 AM
     work_end = models.TimeField(default=time(20, 0))     # 8 PM
 
     slot_interval_minutes = models.IntegerField(default=30)  # 30 min slot
     slot_capacity = models.IntegerField(default=1)           # 1 person per slot
+    discount_percent = models.DecimalField(max_digits=5, decimal_places=2, default=0)
 
     city = models.ForeignKey(City, on_delete=models.CASCADE, related_name="diagnostic_centers")
     tests = models.ManyToManyField(Test, related_name="diagnostic_centers")
@@ -31,5 +35,35 @@ class DiagnosticCenter(BaseModel):
         'sponsored_packages.SponsoredPackage', related_name='diagnostic_centers', blank=True
     )
 
+    class Meta:
+        indexes = [models.Index(fields=["latitude", "longitude"], name="diag_center_geo_idx")]
+
     def __str__(self):
         return f"{self.name} ({self.code or 'N/A'})"
+
+
+
+class CenterPrice(models.Model):
+    # Precomputed price of one catalog item at one center (see pricing.refresh_center_prices)
+    ITEM_TYPES = (
+        ("test", "Test"),
+        ("health_package", "Health Package"),
+        ("sponsored_package", "Sponsored Package"),
+    )
+
+    center = models.ForeignKey(DiagnosticCenter, on_delete=models.CASCADE, related_name="prices")
+    item_type = models.CharField(max_length=20, choices=ITEM_TYPES)
+    item_id = models.BigIntegerField()
+    list_price = models.DecimalField(max_digits=10, decimal_places=2)
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "diagnostic_center_prices"
+        constraints = [
+            models.UniqueConstraint(fields=["center", "item_type", "item_id"], name="unique_center_item_price"),
+        ]
+        indexes = [models.Index(fields=["item_type", "item_id"], name="center_price_item_idx")]
+
+    def __str__(self):
+        return f"{self.center_id} {self.item_type}:{self.item_id} = {self.price}"
@@ -0,0 +1,106 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from .models import CenterPrice, DiagnosticCenter
+
+BATCH_SIZE = 1000
+CENTS = Decimal("0.01")
+
+# Item type -> (M2M on DiagnosticCenter, target column on its join table, has a flat discount_amount)
+PRICED_RELATIONS = {
+    "test": ("tests", "test", False),
+    "health_package": ("health_packages", "healthpackage", True),
+    "sponsored_package": ("sponsored_packages", "sponsoredpackage", True),
+}
+
+
+def final_price(list_price, item_discount, center_percent):
+    # Same rule as CartItem.apply_discount: flat package discount plus the center's percentage of list price
+    discount = (item_discount or 0) + list_price * (center_percent or 0) / 100
+    return max(list_price - discount, Decimal(0)).quantize(CENTS)
+
+
+def refresh_center_prices(center_ids=None):
+    # Rebuild the center x item price matrix for the given centers (all when None)
+    centers = DiagnosticCenter.objects.filter(active=True, deleted_at__isnull=True)
+    if center_ids is not None:
+        centers = centers.filter(id__in=center_ids)
+    percents = dict(centers.values_list("id", "discount_percent"))
+
+    started_at = timezone.now()
+    rows = []
+    for item_type, (relation, target, has_discount) in PRICED_RELATIONS.items():
+        through = getattr(DiagnosticCenter, relation).through
+        fields = ["diagnosticcenter_id", f"{target}_id", f"{target}__price"]
+        if has_discount:
+            fields.append(f"{target}__discount_amount")
+        links = through.objects.filter(
+            **{
+                "diagnosticcenter_id__in": list(percents),
+                f"{target}__active": True,
+                f"{target}__deleted_at__isnull": True,
+                f"{target}__price__isnull": False,
+            }
+        ).values_list(*fields)
+        for center_id, item_id, list_price, *item_discount in links:
+            rows.append(
+                CenterPrice(
+                    center_id=center_id,
+                    item_type=item_type,
+                    item_id=item_id,
+                    list_price=list_price,
+                    price=final_price(list_price, item_discount[0] if item_discount else 0, percents[center_id]),
+                )
+            )
+
+    with transaction.atomic():
+        CenterPrice.objects.bulk_create(
+            rows,
+            batch_size=BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["center", "item_type", "item_id"],
+            update_fields=["list_price", "price", "updated_at"],
+        )
+        # Items a center no longer offers, and centers that were deactivated
+        stale = CenterPrice.objects.filter(updated_at__lt=started_at)
+        if center_ids is not None:
+            stale = stale.filter(center_id__in=center_ids)
+        removed, _ = stale.delete()
+
+    return {"centers": len(percents), "prices": len(rows), "removed": removed}
+
+
+def centers_offering(item_type, item_id):
+    relation, target, _ = PRICED_RELATIONS[item_type]
+    through = getattr(DiagnosticCenter, relation).through
+    return list(
+        through.objects.filter(**{f"{target}_id": item_id}).values_list("diagnosticcenter_id", flat=True)
+    )
+
+
+def compare_basket(basket, centers=None):
+    # Per-center totals for a basket, for centers offering every item in it.
+    # `basket` maps item type -> list of ids. Returns rows of center_id, list_total
+    # and total, cheapest first, from one grouped query over the price matrix.
+    lookup = Q()
+    size = 0
+    for item_type, ids in basket.items():
+        if ids:
+            lookup |= Q(item_type=item_type, item_id__in=ids)
+            size += len(ids)
+    if not size:
+        return []
+
+    prices = CenterPrice.objects.filter(lookup)
+    if centers is not None:
+        prices = prices.filter(center__in=centers)
+    return list(
+        prices.values("center_id")
+        .annotate(items=Count("id"), list_total=Sum("list_price"), total=Sum("price"))
+        .filter(items=size)
+        .order_by("total", "center_id")
+        .values("center_id", "list_total", "total")
+    )
@@ -50,16 +50,24 @@ class DiagnosticCenterSerializer(serializers.ModelSerializer):
     health_packages = serializers.PrimaryKeyRelatedField(read_only=True, many=True)
     sponsored_packages = serializers.PrimaryKeyRelatedField(read_only=True, many=True)
 
+    # Only present on basket searches (see basket.match_basket)
+    matched_tests = serializers.IntegerField(read_only=True)
+    basket_price = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
+    # Only present on nearby searches
+    distance_km = serializers.FloatField(read_only=True)
+
     class Meta:
         model = DiagnosticCenter
         fields = [
             'id', 'name', 'code', 'address', 'area', 'pincode',
             'contact_number', 'email', 'active',
+            'latitude', 'longitude', 'distance_km',
             'city', 'city_id',
             'tests', 'test_ids',
             'visit_types', 'visit_type_ids',
             'health_packages', 'sponsored_packages',
             'health_package_ids', 'sponsored_package_ids',
+            'matched_tests', 'basket_price',
             'created_at', 'updated_at'
         ]
         read_only_fields = ['created_at', 'updated_at']
@@ -0,0 +1,49 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save
+
+from .models import DiagnosticCenter
+from .pricing import PRICED_RELATIONS, centers_offering
+
+
+def _enqueue_refresh(center_ids=None):
+    from .tasks import refresh_center_price_matrix
+
+    transaction.on_commit(partial(refresh_center_price_matrix.delay, center_ids))
+
+
+def center_saved(sender, instance, **kwargs):
+    _enqueue_refresh([instance.pk])
+
+
+def center_items_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        _enqueue_refresh([instance.pk])
+    else:
+        # Changed from the item side: pk_set holds center ids (None after a clear)
+        _enqueue_refresh(list(pk_set) if pk_set else None)
+
+
+def item_saved(sender, instance, item_type, **kwargs):
+    center_ids = centers_offering(item_type, instance.pk)
+    if center_ids:
+        _enqueue_refresh(center_ids)
+
+
+post_save.connect(center_saved, sender=DiagnosticCenter, dispatch_uid="center_prices:center")
+
+for item_type, (relation, _, _) in PRICED_RELATIONS.items():
+    m2m_changed.connect(
+        center_items_changed,
+        sender=getattr(DiagnosticCenter, relation).through,
+        dispatch_uid=f"center_prices:{relation}",
+    )
+    post_save.connect(
+        partial(item_saved, item_type=item_type),
+        sender=DiagnosticCenter._meta.get_field(relation).related_model,
+        weak=False,
+        dispatch_uid=f"center_prices:{item_type}",
+    )
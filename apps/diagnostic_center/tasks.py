@@ -0,0 +1,8 @@
+from celery import shared_task
+
+from .pricing import refresh_center_prices
+
+
+@shared_task
+def refresh_center_price_matrix(center_ids=None):
+    return refresh_center_prices(center_ids)
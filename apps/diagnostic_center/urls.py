@@ -1,12 +1,17 @@
 from rest_framework.routers import DefaultRouter
 from django.urls import path
-from apps.diagnostic_center.views import DiagnosticCenterViewSet, DiagnosticCenterSearchAPIView
+from apps.diagnostic_center.views import (
+    BasketPriceComparisonAPIView,
+    DiagnosticCenterSearchAPIView,
+    DiagnosticCenterViewSet,
+)
 
 router = DefaultRouter()
 router.register(r'', DiagnosticCenterViewSet, basename='diagnosticcenter')
 
 urlpatterns = [
     path('search/', DiagnosticCenterSearchAPIView.as_view(), name='search-centers'),
+    path('compare-prices/', BasketPriceComparisonAPIView.as_view(), name='compare-basket-prices'),
 ]
 
 urlpatterns += router.urls
@@ -4,6 +4,14 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.conf import settings
 import requests
+from apps.common.utils.catalog_cache import get_catalog, catalog_mirrored
+from apps.common.pagination import OptionalPageNumberPagination
+from apps.common.utils.conditional import conditional_get
+from apps.common.utils.tiered_cache import cache_response
+from apps.common.utils.geo import GeoLookupError, nearest, search_params
+from apps.diagnostic_center.basket import parse_ids
+from apps.diagnostic_center.pricing import compare_basket
+from rest_framework.decorators import action
 
 from apps.diagnostic_center.models import DiagnosticCenter
 from apps.diagnostic_center.serializers import DiagnosticCenterSerializer
@@ -24,19 +32,15 @@ class DiagnosticCenterViewSet(viewsets.ModelViewSet):
         .prefetch_related("tests", "visit_types", "health_packages", "sponsored_packages")
     )
     serializer_class = DiagnosticCenterSerializer
+    pagination_class = OptionalPageNumberPagination
 
+    @conditional_get(tags=("diagnostic_centers", "tests", "cities"))
+    @cache_response("diagnostic_centers", tags=("diagnostic_centers", "tests", "cities"))
     def list(self, request):
         client_api_url = getattr(settings, "CLIENT_DIAGNOSTIC_API_URL", None)
-        if client_api_url:
+        if client_api_url and not catalog_mirrored():
             try:
-                headers = {}
-                client_api_token = getattr(settings, "CLIENT_API_TOKEN", None)
-                if client_api_token:
-                    headers["Authorization"] = f"Bearer {client_api_token}"
-
-                response = requests.get(client_api_url, headers=headers, timeout=10)
-                response.raise_for_status()
-                data = response.json()
+                data = get_catalog("diagnostic_centers")
 
                 formatted_data = [
                     {
@@ -61,9 +65,46 @@ class DiagnosticCenterViewSet(viewsets.ModelViewSet):
                 )
 
         queryset = self.get_queryset().order_by("id")
+
+        pincode = request.query_params.get("pincode")
+        if pincode:
+            queryset = queryset.filter(pincode=pincode)
+
+        city = request.query_params.get("city")
+        if city:
+            queryset = queryset.filter(city_id=city)
+
+        search = request.query_params.get("search")
+        if search:
+            queryset = queryset.filter(name__icontains=search)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @action(detail=False, methods=["get"], url_path="nearby")
+    def nearby(self, request):
+        # Nearest active centers to lat/lng (or a pincode's centroid) within radius_km
+        try:
+            lat, lon, radius, limit = search_params(request.query_params)
+        except GeoLookupError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = self.get_queryset().filter(active=True)
+        visit_type = request.query_params.get("visit_type")
+        if visit_type:
+            queryset = queryset.filter(
+                id__in=DiagnosticCenter.visit_types.through.objects.filter(
+                    visittype_id=visit_type
+                ).values("diagnosticcenter_id")
+            )
+
+        centers = nearest(queryset, lat, lon, radius, limit)
+        return Response(self.get_serializer(centers, many=True).data, status=status.HTTP_200_OK)
+
     def create(self, request):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -114,15 +155,69 @@ class DiagnosticCenterSearchAPIView(generics.ListAPIView):
         DiagnosticCenter.objects.filter(deleted_at__isnull=True)
         .select_related("city")
         .prefetch_related("tests", "visit_types", "health_packages", "sponsored_packages")
-        .distinct()
     )
     serializer_class = DiagnosticCenterSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_class = DiagnosticCenterFilter
     permission_classes = [IsAuthenticated]
 
-    def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        
-        return super().list(request, *args, **kwargs)
 
+
+
+class BasketPriceComparisonAPIView(APIView):
+    # Basket total (after package and center discounts) at every nearby center offering the whole basket
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = request.query_params
+        basket = {
+            "test": parse_ids(params.get("test_ids")),
+            "health_package": parse_ids(params.get("health_package_ids")),
+            "sponsored_package": parse_ids(params.get("sponsored_package_ids")),
+        }
+        if not any(basket.values()):
+            return Response(
+                {"error": "Provide test_ids, health_package_ids or sponsored_package_ids."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        centers = DiagnosticCenter.objects.filter(active=True, deleted_at__isnull=True)
+        distances = {}
+        if params.get("city_id"):
+            centers = centers.filter(city_id=params["city_id"])
+        else:
+            try:
+                lat, lon, radius, limit = search_params(params)
+            except GeoLookupError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            distances = {
+                center.id: center.distance_km
+                for center in nearest(centers, lat, lon, radius, limit=100)
+            }
+            centers = centers.filter(id__in=list(distances))
+
+        totals = compare_basket(basket, centers.values("id"))
+        details = DiagnosticCenter.objects.select_related("city").in_bulk(
+            [row["center_id"] for row in totals]
+        )
+
+        results = []
+        for row in totals:
+            center = details[row["center_id"]]
+            results.append({
+                "center_id": center.id,
+                "name": center.name,
+                "address": center.address,
+                "area": center.area,
+                "pincode": center.pincode,
+                "city": center.city.name,
+                "distance_km": distances.get(center.id),
+                "list_total": row["list_total"],
+                "discount": row["list_total"] - row["total"],
+                "total": row["total"],
+            })
+
+        return Response(
+            {"items": sum(len(ids) for ids in basket.values()), "centers": results},
+            status=status.HTTP_200_OK,
+        )
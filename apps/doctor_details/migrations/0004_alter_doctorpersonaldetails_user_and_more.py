@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doctor_details', '0003_doctorpersonaldetails_city'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='doctorpersonaldetails',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='doctor_personal', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='doctorprofessionaldetails',
+            name='external_id',
+            field=models.CharField(blank=True, max_length=50, null=True, unique=True),
+        ),
+    ]
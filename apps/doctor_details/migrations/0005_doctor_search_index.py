@@ -0,0 +1,60 @@
+# Generated by Django 5.2.7 on 2026-10-19 12:10
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+def populate_search_text(apps, schema_editor):
+    DoctorProfessionalDetails = apps.get_model('doctor_details', 'DoctorProfessionalDetails')
+    doctors = (
+        DoctorProfessionalDetails.objects
+        .select_related('doctor__city', 'vendor')
+        .prefetch_related('specialization', 'language')
+    )
+    changed = []
+    for doctor in doctors.iterator(chunk_size=500):
+        parts = [
+            doctor.doctor.full_name,
+            *(s.name for s in doctor.specialization.all()),
+            *(l.name for l in doctor.language.all()),
+            doctor.vendor.name if doctor.vendor_id else None,
+            doctor.doctor.city.name if doctor.doctor.city_id else None,
+        ]
+        doctor.search_text = " ".join(p for p in parts if p)
+        changed.append(doctor)
+    DoctorProfessionalDetails.objects.bulk_update(changed, ['search_text'], batch_size=500)
+    DoctorProfessionalDetails.objects.update(
+        search_vector=django.contrib.postgres.search.SearchVector('search_text', config='simple')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doctor_details', '0004_alter_doctorpersonaldetails_user_and_more'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='doctorprofessionaldetails',
+            name='search_text',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='doctorprofessionaldetails',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='doctorprofessionaldetails',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='doctor_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='doctorprofessionaldetails',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_text'], name='doctor_search_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.RunPython(populate_search_text, migrations.RunPython.noop),
+    ]
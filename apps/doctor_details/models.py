@@ -1,4 +1,6 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 
 # Create your models here.
 
@@ -11,7 +13,8 @@ from django.conf import settings
 User=settings.AUTH_USER_MODEL
 class DoctorPersonalDetails(BaseModel):
 
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="doctor_personal")
+    # Doctors mirrored from the client directory have no owning account
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="doctor_personal", null=True, blank=True)
     city = models.ForeignKey(City , on_delete=models.CASCADE , blank=True)
     full_name = models.CharField(max_length=150)
     gender = models.CharField(max_length=20, choices=[('Male', 'Male'), ('Female', 'Female')])
@@ -53,10 +56,19 @@ class DoctorProfessionalDetails(BaseModel):
     clinic_address = models.TextField(null=True, blank=True)
     e_consultation = models.BooleanField(null=True, blank=True)
     in_clinic = models.BooleanField(null=True, blank=True)
+    external_id = models.CharField(max_length=50, blank=True, null=True, unique=True)
+
+    # Denormalised name/specialization/language/vendor/city text, maintained by search.refresh_search_index
+    search_text = models.TextField(blank=True, default="")
+    search_vector = SearchVectorField(null=True, blank=True)
     
 
     class Meta:
         db_table="doctor_professional_details"
+        indexes = [
+            GinIndex(fields=["search_vector"], name="doctor_search_vector_idx"),
+            GinIndex(fields=["search_text"], name="doctor_search_trgm_idx", opclasses=["gin_trgm_ops"]),
+        ]
 
     def __str__(self):
         return f"{self.doctor.full_name} - {self.specialization}"
@@ -0,0 +1,169 @@
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramWordSimilarity,
+)
+from django.db.models import Count, F, Q
+from rest_framework.pagination import PageNumberPagination
+
+from .models import DoctorProfessionalDetails
+
+SEARCH_CONFIG = "simple"
+
+CONSULTATION_MODES = ("e_consultation", "in_clinic")
+
+# Facet name -> (id lookup, label lookup) on DoctorProfessionalDetails
+FACETS = {
+    "specialization": ("specialization__id", "specialization__name"),
+    "language": ("language__id", "language__name"),
+    "vendor": ("vendor__id", "vendor__name"),
+    "city": ("doctor__city__id", "doctor__city__name"),
+}
+
+# M2M facet -> target column prefix on its auto-created join table
+THROUGH_TARGETS = {
+    "specialization": "doctorspeciality",
+    "language": "language",
+}
+
+
+class DoctorSearchPagination(PageNumberPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+def build_search_text(doctor):
+    parts = [
+        doctor.doctor.full_name,
+        *(speciality.name for speciality in doctor.specialization.all()),
+        *(language.name for language in doctor.language.all()),
+        doctor.vendor.name if doctor.vendor_id else None,
+        doctor.doctor.city.name if doctor.doctor.city_id else None,
+    ]
+    return " ".join(part for part in parts if part)
+
+
+def refresh_search_index(ids=None):
+    # Rebuild search_text/search_vector for the given doctors (all when ids is None); only changed rows are written.
+    doctors = (
+        DoctorProfessionalDetails.objects
+        .select_related("doctor__city", "vendor")
+        .prefetch_related("specialization", "language")
+    )
+    if ids is not None:
+        doctors = doctors.filter(id__in=ids)
+
+    changed = []
+    for doctor in doctors.iterator(chunk_size=500):
+        text = build_search_text(doctor)
+        if text != doctor.search_text:
+            doctor.search_text = text
+            changed.append(doctor)
+
+    if changed:
+        DoctorProfessionalDetails.objects.bulk_update(changed, ["search_text"], batch_size=500)
+        DoctorProfessionalDetails.objects.filter(id__in=[doctor.id for doctor in changed]).update(
+            search_vector=SearchVector("search_text", config=SEARCH_CONFIG)
+        )
+    return len(changed)
+
+
+def _split(value):
+    return [part.strip() for part in (value or "").split(",") if part.strip()]
+
+
+def _m2m_filter(field, values):
+    # Subquery on the join table: matches any of the values without duplicating doctor rows
+    through = getattr(DoctorProfessionalDetails, field).through
+    target = THROUGH_TARGETS[field]
+    if all(value.isdigit() for value in values):
+        lookup = Q(**{f"{target}_id__in": values})
+    else:
+        lookup = Q()
+        for value in values:
+            lookup |= Q(**{f"{target}__name__icontains": value})
+    return Q(id__in=through.objects.filter(lookup).values("doctorprofessionaldetails_id"))
+
+
+def _fk_filter(id_lookup, name_lookup, values):
+    if all(value.isdigit() for value in values):
+        return Q(**{f"{id_lookup}__in": values})
+    lookup = Q()
+    for value in values:
+        lookup |= Q(**{f"{name_lookup}__icontains": value})
+    return lookup
+
+
+def parse_filters(params):
+    # Facet name -> Q for every filter present in the query string.
+    # Values are comma-separated ids; names are still accepted for older clients.
+    filters = {}
+    for facet in ("specialization", "language"):
+        values = _split(params.get(facet))
+        if values:
+            filters[facet] = _m2m_filter(facet, values)
+    for facet in ("vendor", "city"):
+        values = _split(params.get(facet))
+        if values:
+            filters[facet] = _fk_filter(*FACETS[facet], values)
+
+    mode = params.get("mode") or params.get("available_for")
+    if mode in CONSULTATION_MODES:
+        filters["mode"] = Q(**{mode: True})
+    return filters
+
+
+def _apply(queryset, filters, exclude=None):
+    for facet, lookup in filters.items():
+        if facet != exclude:
+            queryset = queryset.filter(lookup)
+    return queryset
+
+
+def facet_counts(base, filters):
+    # Each facet is counted with every other active filter applied, so chips show what selecting them would add
+    facets = {}
+    for facet, (id_lookup, label_lookup) in FACETS.items():
+        rows = (
+            _apply(base, filters, exclude=facet)
+            .filter(**{f"{id_lookup}__isnull": False})
+            .values_list(id_lookup, label_lookup)
+            .annotate(count=Count("pk", distinct=True))
+            .order_by("-count", label_lookup)
+        )
+        facets[facet] = [{"id": pk, "name": name, "count": count} for pk, name, count in rows]
+
+    facets["mode"] = _apply(base, filters, exclude="mode").aggregate(
+        e_consultation=Count("pk", filter=Q(e_consultation=True)),
+        in_clinic=Count("pk", filter=Q(in_clinic=True)),
+    )
+    return facets
+
+
+def search_doctors(params):
+    # Returns (ranked queryset, facet counts) for the search query string.
+    base = DoctorProfessionalDetails.objects.filter(deleted_at__isnull=True)
+
+    text = (params.get("q") or params.get("name") or "").strip()
+    if text:
+        query = SearchQuery(text, search_type="websearch", config=SEARCH_CONFIG)
+        # Full-text match for whole words, trigram word similarity for partial names and typos; both hit GIN indexes
+        base = base.filter(Q(search_vector=query) | Q(search_text__trigram_word_similar=text))
+
+    filters = parse_filters(params)
+    facets = facet_counts(base, filters)
+
+    results = (
+        _apply(base, filters)
+        .select_related("doctor__city", "vendor")
+        .prefetch_related("specialization", "language")
+    )
+    if text:
+        results = results.annotate(
+            rank=SearchRank(F("search_vector"), query) + TrigramWordSimilarity(text, "search_text")
+        ).order_by("-rank", "id")
+    else:
+        results = results.order_by("doctor__full_name", "id")
+    return results, facets
@@ -7,14 +7,23 @@ from rest_framework import viewsets,status
 from .models import DoctorProfessionalDetails, DoctorPersonalDetails
 from .serializers import DoctorProfessionalDetailsSerializer,DoctorPersonalDetailsSerializer
 from rest_framework.permissions import IsAuthenticated
-import random,requests
-from django.conf import settings
+import hashlib
+from django.core.cache import cache
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from apps.common.pagination import OptionalPageNumberPagination
+from apps.common.utils.catalog_sync import DOCTOR_DIRECTORY_VERSION_KEY, invalidate_doctor_directory
+from .search import DoctorSearchPagination, refresh_search_index, search_doctors
 
 
 from rest_framework.exceptions import ValidationError
 
+DOCTOR_DIRECTORY_CACHE_TIMEOUT = 10 * 60
+
+
+def _doctors_changed(ids):
+    refresh_search_index(list(ids))
+    invalidate_doctor_directory()
 
 
 class DoctorViewSet(viewsets.ModelViewSet):
@@ -26,8 +35,19 @@ class DoctorViewSet(viewsets.ModelViewSet):
     )
     serializer_class = DoctorProfessionalDetailsSerializer
 
-    
-    # Select doctor from CLIENT API
+    def perform_create(self, serializer):
+        serializer.save()
+        _doctors_changed([serializer.instance.id])
+
+    def perform_update(self, serializer):
+        serializer.save()
+        _doctors_changed([serializer.instance.id])
+
+    def perform_destroy(self, instance):
+        instance.delete()
+        invalidate_doctor_directory()
+
+    # Select doctor from the locally mirrored client directory (see sync_client_doctors)
     @action(detail=False, methods=['post'], url_path='select-from-client')
     def select_from_client(self, request):
         available_for = request.data.get('available_for')
@@ -35,40 +55,49 @@ class DoctorViewSet(viewsets.ModelViewSet):
         language_id = request.data.get('language')
         vendor_id = request.data.get('vendor')
 
-        client_url = getattr(settings, "CLIENT_DOCTOR_URL", None)
-        if not client_url:
-            return Response({"error": "CLIENT_DOCTOR_URL not configured in settings.py"},
-                            status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-        # Fetch from client API
-        try:
-            client_response = requests.get(client_url, timeout=10)
-            client_response.raise_for_status()
-            client_doctors = client_response.json()
-        except Exception as e:
-            return Response({"error": f"Failed to fetch from client API: {str(e)}"},
-                            status=status.HTTP_502_BAD_GATEWAY)
-
-        # Filter logic on client data
-        filtered = []
-        for doc in client_doctors:
-            if available_for == "e_consultation" and not doc.get("e_consultation"):
-                continue
-            if available_for == "in_clinic" and not doc.get("in_clinic"):
-                continue
-            if specialization_id and str(doc.get("specialization")) != str(specialization_id):
-                continue
-            if language_id and str(doc.get("language")) != str(language_id):
-                continue
-            if vendor_id and str(doc.get("vendor")) != str(vendor_id):
-                continue
-            filtered.append(doc)
-
-        if not filtered:
+        version = cache.get(DOCTOR_DIRECTORY_VERSION_KEY, 0)
+        cache_key = "doctor_directory:{}:{}".format(
+            version,
+            hashlib.md5(
+                repr((
+                    available_for, specialization_id, language_id, vendor_id,
+                    request.query_params.get("page"), request.query_params.get("page_size"),
+                )).encode(),
+                usedforsecurity=False,
+            ).hexdigest(),
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return Response(cached, status=status.HTTP_200_OK)
+
+        queryset = self.get_queryset().filter(deleted_at__isnull=True)
+        if available_for == "e_consultation":
+            queryset = queryset.filter(e_consultation=True)
+        elif available_for == "in_clinic":
+            queryset = queryset.filter(in_clinic=True)
+        if specialization_id:
+            queryset = queryset.filter(specialization__id=specialization_id)
+        if language_id:
+            queryset = queryset.filter(language__id=language_id)
+        if vendor_id:
+            queryset = queryset.filter(vendor_id=vendor_id)
+        queryset = queryset.distinct().order_by("id")
+
+        paginator = OptionalPageNumberPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        if page is not None:
+            data = paginator.get_paginated_response(self.get_serializer(page, many=True).data).data
+            empty = not data["results"]
+        else:
+            data = self.get_serializer(queryset, many=True).data
+            empty = not data
+
+        if empty:
             return Response({"message": "No doctors available from client API."},
                             status=status.HTTP_404_NOT_FOUND)
 
-        return Response(filtered, status=status.HTTP_200_OK)
+        cache.set(cache_key, data, DOCTOR_DIRECTORY_CACHE_TIMEOUT)
+        return Response(data, status=status.HTTP_200_OK)
 
 
 
@@ -78,7 +107,13 @@ class DoctorPersonalViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user,created_by=self.request.user)
-        
+
+    def perform_update(self, serializer):
+        serializer.save(updated_by=self.request.user)
+        # Name and city are part of the search text
+        _doctors_changed(
+            DoctorProfessionalDetails.objects.filter(doctor=serializer.instance).values_list("id", flat=True)
+        )
 
     
 
@@ -93,35 +128,39 @@ class DoctorProfessionalViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'], url_path='search')
     def search(self, request):
-       
+        # Ranked, paginated doctors plus facet counts (specialization, language, vendor, city, mode) in one response
+        version = cache.get(DOCTOR_DIRECTORY_VERSION_KEY, 0)
+        cache_key = "doctor_search:{}:{}".format(
+            version,
+            hashlib.md5(
+                request.query_params.urlencode().encode(), usedforsecurity=False
+            ).hexdigest(),
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return Response(cached)
 
-        vendor = request.query_params.get('vendor')
-        language = request.query_params.get('language')
-        name = request.query_params.get('name')
-        specialization = request.query_params.get('specialization')
+        results, facets = search_doctors(request.query_params)
 
-        qs = DoctorProfessionalDetails.objects.all()
+        paginator = DoctorSearchPagination()
+        page = paginator.paginate_queryset(results, request, view=self)
+        data = paginator.get_paginated_response(self.get_serializer(page, many=True).data).data
+        data["facets"] = facets
 
-        # Apply filters only if provided
-        if vendor:
-            qs = qs.filter(vendor__name__icontains=vendor)
-
-        if language:
-            qs = qs.filter(language__name__icontains=language)
-
-        if name:
-            qs = qs.filter(doctor__full_name__icontains=name)
-
-        if specialization:
-            qs = qs.filter(specialization__name__icontains=specialization)
-
-        qs = qs.distinct()
-
-        serializer = self.get_serializer(qs, many=True)
-        return Response(serializer.data)
+        cache.set(cache_key, data, DOCTOR_DIRECTORY_CACHE_TIMEOUT)
+        return Response(data)
 
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
+        _doctors_changed([serializer.instance.id])
+
+    def perform_update(self, serializer):
+        serializer.save(updated_by=self.request.user)
+        _doctors_changed([serializer.instance.id])
+
+    def perform_destroy(self, instance):
+        instance.delete()
+        invalidate_doctor_directory()
 
   
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-19 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gym_service', '0002_alter_gymcenter_city_alter_gymcenter_state_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='gymcenter',
+            index=models.Index(fields=['latitude', 'longitude'], name='gym_center_geo_idx'),
+        ),
+    ]
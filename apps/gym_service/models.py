@@ -28,6 +28,9 @@ class GymCenter(models.Model):
     logo = models.ImageField(upload_to='gym_service/logos/', blank=True, null=True)  # store URL/path (or use ImageField with media)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=["latitude", "longitude"], name="gym_center_geo_idx")]
+
     def __str__(self):
         return self.name
 
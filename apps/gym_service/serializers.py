@@ -19,10 +19,13 @@ class GymCenterSerializer(serializers.ModelSerializer):
         required=False,
         allow_null=True
     )
+    # Only present on nearby searches
+    distance_km = serializers.FloatField(read_only=True)
 
     class Meta:
         model = GymCenter
-        fields = ['id', 'name', 'type', 'business_line', 'address', 'city', 'state', 'logo']
+        fields = ['id', 'name', 'type', 'business_line', 'address', 'city', 'state', 'logo',
+                  'latitude', 'longitude', 'distance_km']
 
 
 class GymPackageSerializer(serializers.ModelSerializer):
@@ -5,6 +5,7 @@ from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.utils import timezone
+from apps.common.utils.geo import GeoLookupError, nearest, search_params
 from .models import GymCenter, GymPackage, Voucher, Dependant
 from .serializers import (
     GymCenterSerializer, GymPackageSerializer,
@@ -17,6 +18,16 @@ class GymCenterViewSet(viewsets.ModelViewSet):
     serializer_class = GymCenterSerializer
     permission_classes = [permissions.AllowAny]
 
+    @action(detail=False, methods=['get'], url_path='nearby')
+    def nearby(self, request):
+        try:
+            lat, lon, radius, limit = search_params(request.query_params)
+        except GeoLookupError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        centers = nearest(self.get_queryset(), lat, lon, radius, limit)
+        return Response(self.get_serializer(centers, many=True).data)
+
 
 class GymPackageViewSet(viewsets.ModelViewSet):
     queryset = GymPackage.objects.all().order_by('duration_months')
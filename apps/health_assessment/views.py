@@ -1,7 +1,6 @@
 from datetime import date
 
 from django.utils import timezone
-from django.http import FileResponse
 
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
@@ -13,6 +12,10 @@ from django.utils.timezone import localtime
 
 from .services import HealthAssessmentReportService
 from apps.common.utils.profile_helper import filter_by_effective_user
+from apps.common.utils.file_delivery import deliver_file
+from apps.common import metadata
+from apps.health_records.common.unit_converter import normalize_value
+from apps.health_records.health.latest import get_latest_vitals
 
 from .models import FamilyIllnessRecord, HealthAssessment
 from .serializers import (
@@ -29,6 +32,17 @@ def calculate_age(dob):
     return today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
 
 
+def vitals_prefill(user):
+    # Step 4 height/weight from the user's newest recorded vitals (one snapshot read)
+    latest = get_latest_vitals(user.pk)
+    prefill = {"height_cm": None, "weight_kg": None}
+    for module, key in (("height", "height_cm"), ("weight", "weight_kg")):
+        record = latest.get(module)
+        if record:
+            prefill[key] = round(normalize_value(record["value"], record["unit"], module), 2)
+    return prefill
+
+
 class HealthAssessmentViewSet(SaveUserMixin, viewsets.ModelViewSet):
 
     permission_classes = [permissions.IsAuthenticated]
@@ -125,6 +139,7 @@ class HealthAssessmentViewSet(SaveUserMixin, viewsets.ModelViewSet):
                 "gender": gender,
                 "dob": dob,
                 "age": age,
+                **vitals_prefill(user),
             })
 
         # DEPENDANT PREFILL
@@ -157,25 +172,7 @@ class HealthAssessmentViewSet(SaveUserMixin, viewsets.ModelViewSet):
     # choices for dropdowns/sliders
     @action(detail=False, methods=["get"])
     def choices(self, request):
-        m = HealthAssessment
-        return Response({
-            "mood_today": dict(m.MOOD_CHOICES),
-            "height_unit": dict(m.HEIGHT_UNIT_CHOICES),
-            "eat_frequency": dict(m.FREQ5_CHOICES),
-            "water_intake": dict(m.WATER_CHOICES),
-            "sleep_hours": dict(m.SLEEP_HOURS_CHOICES),
-            "checkup_frequency": dict(m.CHECKUP_FREQ_CHOICES),
-            "fitness_duration": dict(m.DURATION4_CHOICES),
-            "other_activity": dict(m.OTHER_ACTIVITY_CHOICES),
-            "risk_category": dict(m.RISK_CATEGORY_CHOICES),
-            "wakeup_midnight_reasons": dict(m.WAKEUP_REASON_CHOICES),
-            "alcohol_frequency": dict(m.ALCOHOL_FREQUENCY_CHOICES),
-            "alcohol_duration": dict(m.ALCOHOL_DURATION_CHOICES),
-            "alcohol_quit_period": dict(m.ALCOHOL_QUIT_CHOICES),
-            "family_disease_list": dict(FamilyIllnessRecord.DISEASE_CHOICES),
-            "urine_difficulty_reasons": dict(m.URINE_DIFFICULTY_REASON_CHOICES),
-            "work_stress_reasons": dict(m.WORK_STRESS_REASON_CHOICES),
-        })
+        return Response(metadata.section("health_assessment"))
 
     # final submit
     @action(detail=True, methods=["post"])
@@ -206,11 +203,7 @@ class HealthAssessmentViewSet(SaveUserMixin, viewsets.ModelViewSet):
                 {"detail": "Report not generated."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        return FileResponse(
-            hra.report_file.open("rb"),
-            as_attachment=True,
-            filename=hra.report_file.name.split("/")[-1],
-        )
+        return deliver_file(request, hra.report_file)
 
 
 
@@ -23,6 +23,7 @@ class HealthPackage(BaseModel):
     discount_percentage = models.DecimalField(max_digits=5, decimal_places=2, default=0) 
     discount_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0) 
     active = models.BooleanField(default=True)
+    external_id = models.CharField(max_length=50, blank=True, null=True, unique=True)
     status = models.CharField(max_length=20, default="active")
     package_type = models.CharField(max_length=50, choices=HEALTH_PACKAGE_TYPES, default="regular_package")
     
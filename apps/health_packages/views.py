@@ -4,6 +4,11 @@ from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
 from django.conf import settings
 import requests
+from apps.common.utils.catalog_cache import get_catalog, catalog_mirrored
+from apps.common.pagination import OptionalPageNumberPagination
+from apps.common.utils.conditional import conditional_get
+from apps.common.utils.tiered_cache import cache_response
+from apps.common import metadata
 from rest_framework.decorators import action
 from .models import HealthPackage
 from .serializers import HealthPackageSerializer
@@ -12,21 +17,17 @@ class HealthPackageViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     queryset = HealthPackage.objects.filter(deleted_at__isnull=True)
     serializer_class = HealthPackageSerializer
+    pagination_class = OptionalPageNumberPagination
 
+    @conditional_get(tags=("health_packages", "tests"))
+    @cache_response("health_packages", tags=("health_packages", "tests"))
     def list(self, request):
         package_type = request.query_params.get("package_type")
         client_api_url = getattr(settings, "CLIENT_HEALTH_PACKAGE_API_URL", None)
 
-        if client_api_url:
+        if client_api_url and not catalog_mirrored():
             try:
-                headers = {}
-                token = getattr(settings, "CLIENT_API_TOKEN", None)
-                if token:
-                    headers["Authorization"] = f"Bearer {token}"
-
-                response = requests.get(client_api_url, headers=headers, timeout=10)
-                response.raise_for_status()
-                data = response.json()
+                data = get_catalog("health_packages")
 
                 formatted = [
                     {
@@ -61,7 +62,15 @@ class HealthPackageViewSet(viewsets.ModelViewSet):
         if package_type:
             queryset = queryset.filter(package_type__iexact=package_type)
 
+        search = request.query_params.get("search")
+        if search:
+            queryset = queryset.filter(name__icontains=search)
+
         queryset = queryset.order_by("id")
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.serializer_class(page, many=True).data)
+
         serializer = self.serializer_class(queryset, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -110,4 +119,4 @@ class HealthPackageViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get"])
     def choices(self, request):
-        return Response(dict(HealthPackage.HEALTH_PACKAGE_TYPES))
\ No newline at end of file
+        return Response(metadata.section("health_package_types"))
\ No newline at end of file
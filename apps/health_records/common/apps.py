@@ -5,3 +5,6 @@ class CommonConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.health_records.common'
     label = 'common'
+
+    def ready(self):
+        import apps.health_records.common.signals
@@ -1,4 +1,11 @@
+import functools
+import importlib
+import re
+from collections import Counter
+
 from django.apps import apps
+from django.db.models import Exists, OuterRef
+from rest_framework import serializers
 
 def filter_record_for_compare(data):
 
@@ -96,3 +103,179 @@ def dict_diff(records: list[dict]):
 
     return diff
 
+
+
+@functools.cache
+def serializer_for(Model):
+    # <app>.serializers.<Model>Serializer, resolved once per model
+    module = importlib.import_module(apps.get_app_config(Model._meta.app_label).name + ".serializers")
+    return getattr(module, Model.__name__ + "Serializer")
+
+
+@functools.cache
+def nested_prefetches(serializer_class):
+    # Reverse relations the serializer renders in full (parameters, documents, schedule_times)
+    return tuple(
+        field.source
+        for field in serializer_class().fields.values()
+        if isinstance(field, serializers.ListSerializer)
+    )
+
+
+# ---- Lab parameter trends ----
+
+MAX_TREND_RECORDS = 50
+DEFAULT_TREND_RECORDS = 12
+
+# Common spellings and abbreviations on lab reports -> one name
+PARAMETER_ALIASES = {
+    "hb": "hemoglobin",
+    "hgb": "hemoglobin",
+    "haemoglobin": "hemoglobin",
+    "fbs": "fasting blood sugar",
+    "glucose fasting": "fasting blood sugar",
+    "fasting glucose": "fasting blood sugar",
+    "ppbs": "postprandial blood sugar",
+    "rbs": "random blood sugar",
+    "hba1c": "glycated hemoglobin",
+    "glycosylated hemoglobin": "glycated hemoglobin",
+    "tc": "total cholesterol",
+    "cholesterol total": "total cholesterol",
+    "tg": "triglycerides",
+    "hdl": "hdl cholesterol",
+    "ldl": "ldl cholesterol",
+    "tsh": "thyroid stimulating hormone",
+    "sgpt": "alt",
+    "sgot": "ast",
+    "wbc": "total leucocyte count",
+    "tlc": "total leucocyte count",
+    "plt": "platelet count",
+}
+
+UNIT_ALIASES = {
+    "gm/dl": "g/dl",
+    "gms/dl": "g/dl",
+    "g%": "g/dl",
+    "gm%": "g/dl",
+    "mg%": "mg/dl",
+    "mmol/ltr": "mmol/l",
+    "iu/l": "u/l",
+    "µiu/ml": "uiu/ml",
+    "μiu/ml": "uiu/ml",
+    "miu/l": "uiu/ml",
+    "/cumm": "/ul",
+    "cells/cumm": "/ul",
+    "cells/ul": "/ul",
+    "/mm3": "/ul",
+    "lakhs/cumm": "lakh/ul",
+}
+
+# Unit changes that hold for any analyte: (from, to) -> factor
+UNIT_FACTORS = {
+    ("g/l", "g/dl"): 0.1,
+    ("g/dl", "g/l"): 10,
+    ("mg/l", "mg/dl"): 0.1,
+    ("mg/dl", "mg/l"): 10,
+    ("lakh/ul", "/ul"): 100000,
+    ("/ul", "lakh/ul"): 0.00001,
+}
+
+_NUMBER = re.compile(r"[-+]?\d*\.?\d+")
+
+
+def normalize_parameter_name(name):
+    key = re.sub(r"[^a-z0-9%]+", " ", (name or "").lower()).strip()
+    return PARAMETER_ALIASES.get(key, key)
+
+
+def normalize_unit(unit):
+    key = re.sub(r"\s+", "", (unit or "").lower())
+    return UNIT_ALIASES.get(key, key)
+
+
+def parse_number(text):
+    # First number in a result or range ("5.6", "<0.5", "1,20,000"); None for text results
+    match = _NUMBER.search((text or "").replace(",", ""))
+    return float(match.group()) if match else None
+
+
+def _convert(value, unit, target):
+    if value is None or unit == target:
+        return value
+    return round(value * UNIT_FACTORS[(unit, target)], 4)
+
+
+def _flag(value, low, high):
+    if value is None or (low is None and high is None):
+        return None
+    if low is not None and value < low:
+        return "low"
+    if high is not None and value > high:
+        return "high"
+    return "normal"
+
+
+def trend_rows(user, record_ids=None, dependant_id=None, limit=DEFAULT_TREND_RECORDS):
+    # Parameter rows of the user's prescription/lab records in one query, oldest record first.
+    # Without record_ids, the newest `limit` records with parameters (self, or one dependant).
+    PrescriptionRecord = apps.get_model("prescriptions", "PrescriptionRecord")
+    PrescriptionParameter = apps.get_model("prescriptions", "PrescriptionParameter")
+    rows = PrescriptionParameter.objects.filter(
+        record__user=user,
+        record__deleted_at__isnull=True,
+        deleted_at__isnull=True,
+    )
+    if record_ids:
+        rows = rows.filter(record_id__in=record_ids)
+    else:
+        recent = (
+            PrescriptionRecord.objects.filter(user=user, dependant_id=dependant_id, deleted_at__isnull=True)
+            .filter(Exists(PrescriptionParameter.objects.filter(record=OuterRef("pk"), deleted_at__isnull=True)))
+            .order_by("-record_date", "-id")
+            .values("id")[:limit]
+        )
+        rows = rows.filter(record_id__in=recent)
+    return rows.order_by("record__record_date", "record_id", "id").values_list(
+        "record_id", "record__record_date", "record__record_name",
+        "parameter_name", "result", "unit", "start_range", "end_range",
+    )
+
+
+def trend_matrix(rows):
+    # Parameter x record matrix. Names and units are normalized; each parameter is reported in
+    # its most common unit, converting where the factor is analyte independent. Cells carry the
+    # numeric value and a low/high/normal flag against the report's own reference range.
+    columns = {}
+    by_parameter = {}
+    for record_id, record_date, record_name, name, result, unit, start, end in rows:
+        columns.setdefault(record_id, {"record_id": record_id, "date": record_date, "name": record_name})
+        key = normalize_parameter_name(name)
+        entry = by_parameter.setdefault(key, {"parameter": name.strip(), "units": Counter(), "cells": {}})
+        unit = normalize_unit(unit)
+        entry["units"][unit] += 1
+        entry["cells"][record_id] = (result, unit, parse_number(result), parse_number(start), parse_number(end))
+
+    order = list(columns)
+    parameters = []
+    for key, entry in sorted(by_parameter.items()):
+        target = entry["units"].most_common(1)[0][0]
+        values = []
+        for record_id in order:
+            cell = entry["cells"].get(record_id)
+            if cell is None:
+                values.append(None)
+                continue
+            result, unit, value, low, high = cell
+            if unit != target and (unit, target) in UNIT_FACTORS:
+                value, low, high = (_convert(v, unit, target) for v in (value, low, high))
+                unit = target
+            values.append({
+                "result": result,
+                "value": value,
+                "unit": unit,
+                "range": [low, high],
+                "flag": _flag(value, low, high),
+            })
+        parameters.append({"key": key, "parameter": entry["parameter"], "unit": target, "values": values})
+
+    return {"records": list(columns.values()), "parameters": parameters}
@@ -0,0 +1,244 @@
+import hashlib
+import logging
+import mimetypes
+import os
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.base import ContentFile, File
+from django.db import IntegrityError, transaction
+
+from apps.common.utils.file_delivery import deliver_file
+
+from .models import StoredDocument, StoredDocumentLink
+
+logger = logging.getLogger(__name__)
+
+
+# Uploaded document fields that go through the pipeline: "app_label.Model" -> field name
+DOCUMENT_FIELDS = {
+    "pharmacy_cart.Prescription": "file",
+    "appointments.MedicalReports": "file",
+    "appointments.ReportDocument": "file",
+    "prescriptions.PrescriptionDocument": "file",
+    "medicine_reminders.MedicineReminderDocument": "file",
+    "insurance_records.InsurancePolicyDocument": "file",
+}
+
+IMAGE_TYPES = {"image/jpeg", "image/png", "image/webp", "image/bmp", "image/tiff"}
+
+MAX_IMAGE_DIMENSION = getattr(settings, "DOCUMENT_IMAGE_MAX_DIMENSION", 2048)
+IMAGE_QUALITY = getattr(settings, "DOCUMENT_IMAGE_QUALITY", 80)
+THUMBNAIL_SIZE = getattr(settings, "DOCUMENT_THUMBNAIL_SIZE", 320)
+
+
+def hash_file(field_file, chunk_size=64 * 1024):
+    digest = hashlib.sha256()
+    with field_file.storage.open(field_file.name, "rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _open_image(storage, name):
+    from PIL import Image, ImageOps
+
+    with storage.open(name, "rb") as fh:
+        image = Image.open(fh)
+        image.load()
+    return ImageOps.exif_transpose(image)
+
+
+def _encode(image, quality):
+    # JPEG for opaque images, PNG when there is transparency to keep
+    buffer = BytesIO()
+    if image.mode in ("RGBA", "LA", "P"):
+        image.save(buffer, format="PNG", optimize=True)
+        return buffer.getvalue(), ".png"
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    image.save(buffer, format="JPEG", quality=quality, optimize=True, progressive=True)
+    return buffer.getvalue(), ".jpg"
+
+
+def build_renditions(document):
+    # Downscaled/recompressed copy (kept only if smaller) and a preview thumbnail.
+    if document.content_type not in IMAGE_TYPES:
+        return
+
+    try:
+        image = _open_image(document.original.storage, document.original.name)
+    except Exception:
+        logger.exception("Could not open image %s", document.original.name)
+        return
+
+    stem = document.sha256[:32]
+
+    optimized = image.copy()
+    if max(optimized.size) > MAX_IMAGE_DIMENSION:
+        optimized.thumbnail((MAX_IMAGE_DIMENSION, MAX_IMAGE_DIMENSION))
+    data, ext = _encode(optimized, IMAGE_QUALITY)
+    if len(data) < document.size:
+        document.optimized.save(f"{stem}{ext}", ContentFile(data), save=False)
+        document.optimized_size = len(data)
+
+    thumb = image.copy()
+    thumb.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+    data, ext = _encode(thumb, 70)
+    document.thumbnail.save(f"{stem}{ext}", ContentFile(data), save=False)
+
+    document.save(update_fields=["optimized", "optimized_size", "thumbnail"])
+
+
+def canonical_name(digest, filename):
+    # Pipeline-owned home of one content's bytes, independent of any record's upload path
+    ext = os.path.splitext(filename)[1].lower()
+    return f"{StoredDocument._meta.get_field('original').upload_to}{digest[:2]}/{digest}{ext}"
+
+
+def _store_canonical(field_file, digest):
+    # Copy the upload to its canonical name unless those bytes are already there
+    storage = StoredDocument._meta.get_field("original").storage
+    name = canonical_name(digest, field_file.name)
+    if storage.exists(name):
+        return name
+    with field_file.storage.open(field_file.name, "rb") as fh:
+        return storage.save(name, File(fh, name=os.path.basename(name)))
+
+
+def _get_or_create_document(field_file, digest):
+    stored_name = _store_canonical(field_file, digest)
+    defaults = {
+        "original": stored_name,
+        "size": field_file.size,
+        "content_type": mimetypes.guess_type(field_file.name)[0],
+    }
+    try:
+        with transaction.atomic():
+            document, created = StoredDocument.objects.get_or_create(sha256=digest, defaults=defaults)
+    except IntegrityError:
+        # Lost a race with a worker processing the same bytes
+        document, created = StoredDocument.objects.get(sha256=digest), False
+
+    if not created and document.original.name != stored_name:
+        if document.original.name.startswith(canonical_name(digest, "")):
+            # Concurrent copy saved under a suffixed name; the row already has its own
+            document.original.storage.delete(stored_name)
+        else:
+            # Row from before the pipeline kept its own copy: it pointed at an uploader's file
+            document.original = stored_name
+            document.save(update_fields=["original"])
+    return document, created
+
+
+def _shared_names(document):
+    return {document.original.name, document.optimized.name if document.optimized else None}
+
+
+def _release_upload(model, pk, field_name, uploaded, document):
+    # Point the record at the canonical copy and free its own bytes. Only when the field still
+    # holds this upload, so a file replaced in the meantime is left alone.
+    if uploaded in _shared_names(document):
+        return
+    updated = model.objects.filter(pk=pk, **{field_name: uploaded}).update(
+        **{field_name: document.original.name}
+    )
+    if not updated:
+        return
+    try:
+        getattr(model, field_name).field.storage.delete(uploaded)
+    except OSError:
+        logger.exception("Could not delete duplicate upload %s", uploaded)
+
+
+def process_document(model_label, pk, field_name="file"):
+    model = apps.get_model(model_label)
+    record = model.objects.filter(pk=pk).first()
+    if record is None:
+        return None
+
+    field_file = getattr(record, field_name)
+    if not field_file:
+        return None
+
+    digest = hash_file(field_file)
+    document, created = _get_or_create_document(field_file, digest)
+
+    if created:
+        build_renditions(document)
+
+    # Identical bytes are stored once: the link keeps the name the user uploaded under, and the
+    # record is repointed to the canonical copy so its own upload can be deleted
+    uploaded = field_file.name
+    defaults = {"document": document}
+    if uploaded not in _shared_names(document):
+        # Already on the shared copy (a re-run): keep the filename recorded the first time
+        defaults["filename"] = os.path.basename(uploaded)
+    StoredDocumentLink.objects.update_or_create(
+        record_type=ContentType.objects.get_for_model(model),
+        record_id=pk,
+        field_name=field_name,
+        defaults=defaults,
+    )
+    _release_upload(model, pk, field_name, uploaded, document)
+
+    return document.id
+
+
+def get_stored_link(record, field_name="file"):
+    return (
+        StoredDocumentLink.objects
+        .filter(
+            record_type=ContentType.objects.get_for_model(record),
+            record_id=record.pk,
+            field_name=field_name,
+        )
+        .select_related("document")
+        .first()
+    )
+
+
+def get_stored_document(record, field_name="file"):
+    link = get_stored_link(record, field_name)
+    return link.document if link else None
+
+
+def original_file(record, field_name="file"):
+    # The file exactly as uploaded. Records repointed to a rendition by earlier versions of the
+    # pipeline resolve back to the stored original.
+    field_file = getattr(record, field_name)
+    document = get_stored_document(record, field_name)
+    if document and document.optimized and field_file.name == document.optimized.name:
+        return document.original
+    return field_file
+
+
+def optimized_file(record, field_name="file"):
+    document = get_stored_document(record, field_name)
+    return document.optimized if document and document.optimized else None
+
+
+def thumbnail_file(record, field_name="file"):
+    document = get_stored_document(record, field_name)
+    return document.thumbnail if document and document.thumbnail else None
+
+
+def deliver_document(request, record, field_name="file", **kwargs):
+    # The smaller recompressed copy when there is one, under the name the user uploaded (with
+    # the rendition's extension); ?rendition=original serves the bytes exactly as uploaded
+    link = get_stored_link(record, field_name)
+    document = link.document if link else None
+    field_file = getattr(record, field_name)
+    filename = (link.filename if link else "") or os.path.basename(field_file.name)
+
+    if document is None:
+        served = field_file
+    elif document.optimized and request.GET.get("rendition") != "original":
+        served = document.optimized
+        filename = os.path.splitext(filename)[0] + os.path.splitext(served.name)[1]
+    else:
+        served = document.original
+    kwargs.setdefault("filename", filename)
+    return deliver_file(request, served, **kwargs)
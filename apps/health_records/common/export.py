@@ -0,0 +1,354 @@
+import csv
+import tempfile
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from apps.common.renderers import ORJSONRenderer
+
+from .compare_engine import nested_prefetches, parse_number, serializer_for
+
+CHUNK_SIZE = 500
+EXPORT_DIR = "exports"
+EXPORT_TTL = getattr(settings, "HEALTH_RECORD_EXPORT_TTL", 24 * 60 * 60)
+
+# Export format -> (content type, file extension)
+FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+    "fhir": ("application/fhir+json", "json"),
+}
+
+# Section -> record model, in export order
+SECTIONS = {
+    "height": "health.HeightRecord",
+    "weight": "health.WeightRecord",
+    "bmi": "health.BmiRecord",
+    "blood_pressure": "health.BloodPressureRecord",
+    "heart_rate": "health.HeartRateRecord",
+    "oxygen": "health.OxygenSaturationRecord",
+    "glucose": "health.GlucoseRecord",
+    "prescriptions": "prescriptions.PrescriptionRecord",
+    "hospitalizations": "hospitalizations.HospitalizationRecord",
+    "medical_bills": "medical_bills.MedicalBillRecord",
+    "vaccination_certificates": "vaccination_certificates.VaccinationCertificateRecord",
+    "medicine_reminders": "medicine_reminders.MedicineReminder",
+    "insurance": "insurance_records.InsurancePolicyRecord",
+}
+
+_renderer = ORJSONRenderer()
+
+
+def export_filename(export_id, fmt):
+    return f"{export_id}.{FORMATS[fmt][1]}"
+
+
+def export_path(user_id, filename):
+    return f"{EXPORT_DIR}/{user_id}/{filename}"
+
+
+# ---- Background job state ----
+
+def _status_key(user_id, filename):
+    return f"health_records:export:{user_id}:{filename}"
+
+
+def set_export_status(user_id, filename, status, error=None):
+    # "pending", "ready" or "failed"; kept as long as the file itself
+    cache.set(_status_key(user_id, filename), {"status": status, "error": error}, EXPORT_TTL)
+
+
+def get_export_status(user_id, filename):
+    return cache.get(_status_key(user_id, filename))
+
+
+def purge_exports(max_age=None):
+    # Delete stored exports older than max_age (EXPORT_TTL by default); returns how many went
+    cutoff = timezone.now() - timedelta(seconds=EXPORT_TTL if max_age is None else max_age)
+    removed = 0
+    try:
+        user_dirs, _ = default_storage.listdir(EXPORT_DIR)
+    except FileNotFoundError:
+        # Nothing exported yet (object storages just list nothing)
+        return 0
+    for user_dir in user_dirs:
+        _, filenames = default_storage.listdir(f"{EXPORT_DIR}/{user_dir}")
+        for filename in filenames:
+            name = export_path(user_dir, filename)
+            if default_storage.get_modified_time(name) < cutoff:
+                default_storage.delete(name)
+                removed += 1
+    return removed
+
+
+def iter_records(user, sections=None):
+    # (section, record) for every live record of the user, read in chunks with the serializer's
+    # nested lists prefetched per chunk, so memory stays flat however many records there are
+    for section in sections or SECTIONS:
+        Model = apps.get_model(SECTIONS[section])
+        records = Model.objects.filter(user=user, deleted_at__isnull=True).order_by("id")
+        related = [name for name in ("user", "dependant") if hasattr(Model, name)]
+        records = records.select_related(*related).prefetch_related(*nested_prefetches(serializer_for(Model)))
+        for record in records.iterator(chunk_size=CHUNK_SIZE):
+            yield section, record
+
+
+def _serialized(user, sections):
+    for section, record in iter_records(user, sections):
+        yield section, serializer_for(type(record))(record).data
+
+
+# ---- NDJSON / CSV ----
+
+def stream_ndjson(user, sections=None):
+    # One {"type", "data"} object per line, data as the record's API serializer renders it
+    for section, data in _serialized(user, sections):
+        yield _renderer.render({"type": section, "data": data}) + b"\n"
+
+
+def _flatten(value, prefix=""):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _flatten(item, f"{prefix}.{key}" if prefix else str(key))
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            yield from _flatten(item, f"{prefix}.{index}")
+    else:
+        yield prefix, "" if value is None else value
+
+
+class _Echo:
+    # csv.writer target that hands each row back instead of buffering it
+    def write(self, value):
+        return value
+
+
+def stream_csv(user, sections=None):
+    # Long format (type, id, field, value): one fixed header for every record type, with nested
+    # values (parameters, schedule times, documents) as dotted field paths
+    writer = csv.writer(_Echo())
+    yield writer.writerow(["type", "id", "field", "value"]).encode()
+    for section, data in _serialized(user, sections):
+        record_id = data.get("id")
+        rows = (
+            writer.writerow([section, record_id, field, value])
+            for field, value in _flatten(data)
+            if field != "id"
+        )
+        yield "".join(rows).encode()
+
+
+# ---- FHIR ----
+
+LOINC = "http://loinc.org"
+OBSERVATION_CATEGORY = "http://terminology.hl7.org/CodeSystem/observation-category"
+
+# Vitals section -> (LOINC code, display)
+VITAL_CODES = {
+    "height": ("8302-2", "Body height"),
+    "weight": ("29463-7", "Body weight"),
+    "bmi": ("39156-5", "Body mass index (BMI) [Ratio]"),
+    "blood_pressure": ("85354-9", "Blood pressure panel with all children optional"),
+    "heart_rate": ("8867-4", "Heart rate"),
+    "oxygen": ("59408-5", "Oxygen saturation in Arterial blood by Pulse oximetry"),
+    "glucose": ("2339-0", "Glucose [Mass/volume] in Blood"),
+}
+BP_COMPONENTS = (("systolic", "8480-6", "Systolic blood pressure"), ("diastolic", "8462-4", "Diastolic blood pressure"))
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+def _code(code, display):
+    return {"coding": [{"system": LOINC, "code": code, "display": display}], "text": display}
+
+
+def _subject(user, record):
+    if getattr(record, "for_whom", "self") == "dependant" and record.dependant_id:
+        return {"display": record.dependant.name}
+    return {"reference": f"Patient/{user.pk}"}
+
+
+def _prune(resource):
+    # Drop empty elements; FHIR does not allow nulls or empty arrays
+    return {key: value for key, value in resource.items() if value not in (None, "", [], {})}
+
+
+def _vital(section, record, user):
+    resource = {
+        "resourceType": "Observation",
+        "id": f"{section.replace('_', '-')}-{record.pk}",
+        "status": "final",
+        "category": [{"coding": [{"system": OBSERVATION_CATEGORY, "code": "vital-signs"}]}],
+        "code": _code(*VITAL_CODES[section]),
+        "subject": _subject(user, record),
+        "effectiveDateTime": _iso(record.recorded_at),
+    }
+    if section == "blood_pressure":
+        resource["component"] = [
+            {"code": _code(code, display), "valueQuantity": {"value": getattr(record, field), "unit": record.unit}}
+            for field, code, display in BP_COMPONENTS
+        ]
+    else:
+        resource["valueQuantity"] = {"value": record.value, "unit": record.unit}
+    return [resource]
+
+
+def _lab_result(record, parameter, user):
+    value = parse_number(parameter.result)
+    low, high = parse_number(parameter.start_range), parse_number(parameter.end_range)
+    reference = {}
+    if low is not None:
+        reference["low"] = {"value": low, "unit": parameter.unit}
+    if high is not None:
+        reference["high"] = {"value": high, "unit": parameter.unit}
+    return _prune({
+        "resourceType": "Observation",
+        "id": f"prescription-parameter-{parameter.pk}",
+        "status": "final",
+        "category": [{"coding": [{"system": OBSERVATION_CATEGORY, "code": "laboratory"}]}],
+        "code": {"text": parameter.parameter_name},
+        "subject": _subject(user, record),
+        "effectiveDateTime": _iso(record.record_date),
+        "valueQuantity": {"value": value, "unit": parameter.unit} if value is not None else None,
+        "valueString": parameter.result if value is None else None,
+        "referenceRange": [reference] if reference else None,
+    })
+
+
+def _prescription(section, record, user):
+    results = [_lab_result(record, parameter, user) for parameter in record.parameters.all()]
+    report = _prune({
+        "resourceType": "DiagnosticReport",
+        "id": f"prescription-{record.pk}",
+        "status": "final",
+        "category": [{"text": record.get_record_type_display()}],
+        "code": {"text": record.record_name},
+        "subject": _subject(user, record),
+        "effectiveDateTime": _iso(record.record_date),
+        "performer": [{"display": record.doctor_name}] if record.doctor_name else None,
+        "conclusion": record.reason,
+        "result": [{"reference": f"Observation/{result['id']}"} for result in results],
+    })
+    return [report, *results]
+
+
+def _hospitalization(section, record, user):
+    return [_prune({
+        "resourceType": "Encounter",
+        "id": f"hospitalization-{record.pk}",
+        "status": "finished" if record.discharged_date else "in-progress",
+        "class": {"system": "http://terminology.hl7.org/CodeSystem/v3-ActCode", "code": "IMP"},
+        "type": [{"text": record.get_hospitalization_type_display()}],
+        "subject": _subject(user, record),
+        "period": _prune({"start": _iso(record.admitted_date), "end": _iso(record.discharged_date)}),
+        "reasonCode": [{"text": record.record_name}],
+        "participant": [{"individual": {"display": record.doctor_name}}] if record.doctor_name else None,
+        "serviceProvider": {"display": record.hospital_name},
+    })]
+
+
+def _medical_bill(section, record, user):
+    return [_prune({
+        "resourceType": "Invoice",
+        "id": f"medical-bill-{record.pk}",
+        "status": "issued",
+        "identifier": [{"value": record.record_bill_number}],
+        "type": {"text": record.get_bill_type_display()},
+        "subject": _subject(user, record),
+        "date": _iso(record.record_date),
+        "issuer": {"display": record.record_hospital_name},
+        "note": [{"text": record.notes}] if record.notes else None,
+    })]
+
+
+def _vaccination(section, record, user):
+    return [_prune({
+        "resourceType": "Immunization",
+        "id": f"vaccination-{record.pk}",
+        "status": "completed",
+        "identifier": [{"value": record.registration_id}] if record.registration_id else None,
+        "vaccineCode": {"text": record.vaccination_name},
+        "patient": _subject(user, record),
+        "occurrenceDateTime": _iso(record.vaccination_date),
+        "location": {"display": record.vaccination_center},
+        "protocolApplied": [{"doseNumberString": record.vaccination_dose}],
+        "note": [{"text": record.notes}] if record.notes else None,
+    })]
+
+
+def _medicine_reminder(section, record, user):
+    times = [_iso(schedule.time) for schedule in record.schedule_times.all()]
+    return [_prune({
+        "resourceType": "MedicationStatement",
+        "id": f"medicine-reminder-{record.pk}",
+        "status": "active" if record.end_date >= timezone.localdate() else "completed",
+        "medicationCodeableConcept": {"text": record.medicine_name},
+        "subject": {"reference": f"Patient/{user.pk}"},
+        "effectivePeriod": {"start": _iso(record.start_date), "end": _iso(record.end_date)},
+        "dosage": [_prune({
+            "text": f"{record.dosage_value} {record.get_dosage_unit_display()}",
+            "timing": {"repeat": {"timeOfDay": times}} if times else None,
+        })],
+    })]
+
+
+def _insurance(section, record, user):
+    return [_prune({
+        "resourceType": "Coverage",
+        "id": f"insurance-{record.pk}",
+        "status": "active" if record.policy_to >= timezone.localdate() else "cancelled",
+        "identifier": [{"value": record.policy_number}],
+        "type": {"text": record.get_type_of_insurance_display()},
+        "subscriberId": record.policy_number,
+        "beneficiary": _subject(user, record),
+        "period": {"start": _iso(record.policy_from), "end": _iso(record.policy_to)},
+        "payor": [{"display": record.insurance_company}],
+        "class": [{"type": {"text": "plan"}, "value": record.policy_name}],
+    })]
+
+
+FHIR_RESOURCES = {
+    **{section: _vital for section in VITAL_CODES},
+    "prescriptions": _prescription,
+    "hospitalizations": _hospitalization,
+    "medical_bills": _medical_bill,
+    "vaccination_certificates": _vaccination,
+    "medicine_reminders": _medicine_reminder,
+    "insurance": _insurance,
+}
+
+
+def stream_fhir(user, sections=None):
+    # A FHIR collection Bundle written entry by entry: the Patient, then each record's resources
+    patient = {"resourceType": "Patient", "id": str(user.pk), "name": [{"text": user.name}]}
+    yield _renderer.render({"resourceType": "Bundle", "type": "collection", "timestamp": timezone.now()})[:-1]
+    yield b',"entry":[' + _renderer.render({"fullUrl": f"Patient/{user.pk}", "resource": patient})
+    for section, record in iter_records(user, sections):
+        for resource in FHIR_RESOURCES[section](section, record, user):
+            entry = {"fullUrl": f"{resource['resourceType']}/{resource['id']}", "resource": resource}
+            yield b"," + _renderer.render(entry)
+    yield b"]}"
+
+
+STREAMS = {"ndjson": stream_ndjson, "csv": stream_csv, "fhir": stream_fhir}
+
+
+def stream_export(user, fmt, sections=None):
+    return STREAMS[fmt](user, sections)
+
+
+def write_export(user, fmt, filename, sections=None):
+    # Spool the stream to a temporary file, then hand it to storage in one save; used by the
+    # Celery job for accounts too large to stream over a single request
+    with tempfile.TemporaryFile() as spool:
+        for chunk in stream_export(user, fmt, sections):
+            spool.write(chunk)
+        spool.seek(0)
+        return default_storage.save(export_path(user.pk, filename), File(spool, name=filename))
@@ -0,0 +1,44 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from apps.health_records.common.unit_converter import normalized_expression
+
+# Modules with a stored canonical-unit column -> record model
+NORMALIZED_MODELS = {
+    "height": "health.HeightRecord",
+    "weight": "health.WeightRecord",
+    "glucose": "health.GlucoseRecord",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill normalized_value (value in the module's canonical unit) in id-ordered chunks, one short "
+        "UPDATE per chunk. By default only rows where it is missing; --all recomputes every row "
+        "(follow with rebuild_vital_rollups if any value changed)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--module", choices=sorted(NORMALIZED_MODELS), action="append")
+        parser.add_argument("--chunk-size", type=int, default=5000)
+        parser.add_argument("--all", action="store_true", help="Recompute rows that already have a value")
+
+    def handle(self, *args, **options):
+        chunk_size = max(1, options["chunk_size"])
+        for module in options["module"] or sorted(NORMALIZED_MODELS):
+            records = apps.get_model(NORMALIZED_MODELS[module]).objects.order_by()
+            if not options["all"]:
+                records = records.filter(normalized_value__isnull=True)
+            expression = normalized_expression(module)
+
+            updated = 0
+            last_id = 0
+            while True:
+                ids = list(
+                    records.filter(id__gt=last_id).order_by("id").values_list("id", flat=True)[:chunk_size]
+                )
+                if not ids:
+                    break
+                updated += records.filter(id__gte=ids[0], id__lte=ids[-1]).update(normalized_value=expression)
+                last_id = ids[-1]
+            self.stdout.write(f"{module}: {updated} records normalized")
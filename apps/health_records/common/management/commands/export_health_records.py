@@ -0,0 +1,39 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.health_records.common.export import FORMATS, SECTIONS, stream_export
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream one user's complete health-record export (vitals, prescriptions, hospitalizations, bills, "
+        "vaccinations, reminders, insurance) to a file or stdout as NDJSON, CSV or a FHIR Bundle."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("user", type=int, help="User id")
+        parser.add_argument("--format", choices=sorted(FORMATS), default="ndjson")
+        parser.add_argument("--section", choices=list(SECTIONS), action="append", dest="sections")
+        parser.add_argument("--output", default="-", help="File path, or - for stdout")
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(pk=options["user"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"No user with id {options['user']}")
+
+        chunks = stream_export(user, options["format"], options["sections"])
+        if options["output"] == "-":
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
+            return
+
+        written = 0
+        with open(options["output"], "wb") as output:
+            for chunk in chunks:
+                output.write(chunk)
+                written += len(chunk)
+        self.stderr.write(f"Wrote {written} bytes to {options['output']}")
@@ -0,0 +1,24 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from apps.health_records.common.rollups import VITAL_SERIES, rebuild_rollup
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-user vitals summary rollups, e.g. after bulk imports that bypass model signals."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--module", choices=sorted(VITAL_SERIES), action="append")
+        parser.add_argument("--user", type=int, action="append", dest="users")
+
+    def handle(self, *args, **options):
+        for module in options["module"] or sorted(VITAL_SERIES):
+            label, _, _ = VITAL_SERIES[module]
+            user_ids = options["users"] or (
+                apps.get_model(label).objects.order_by().values_list("user_id", flat=True).distinct().iterator()
+            )
+            rebuilt = 0
+            for user_id in user_ids:
+                rebuild_rollup(module, user_id)
+                rebuilt += 1
+            self.stdout.write(f"{module}: {rebuilt} rollups rebuilt")
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from apps.health_records.common.document_pipeline import process_document
+from apps.health_records.common.models import StoredDocumentLink
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-run the document pipeline for every processed upload, so records still holding their own "
+        "copy of shared bytes are moved to the canonical file and the duplicate is deleted."
+    )
+
+    def handle(self, *args, **options):
+        processed = 0
+        links = StoredDocumentLink.objects.select_related("record_type").order_by("id")
+        for link in links.iterator(chunk_size=500):
+            label = f"{link.record_type.app_label}.{link.record_type.model}"
+            if process_document(label, link.record_id, link.field_name) is not None:
+                processed += 1
+        self.stdout.write(f"{processed} uploads processed")
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.7 on 2026-10-19 10:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('original', models.FileField(upload_to='documents/originals/')),
+                ('optimized', models.FileField(blank=True, null=True, upload_to='documents/optimized/')),
+                ('thumbnail', models.FileField(blank=True, null=True, upload_to='documents/thumbnails/')),
+                ('content_type', models.CharField(blank=True, max_length=100, null=True)),
+                ('size', models.PositiveBigIntegerField(default=0)),
+                ('optimized_size', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StoredDocumentLink',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('record_id', models.PositiveBigIntegerField()),
+                ('field_name', models.CharField(default='file', max_length=50)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='links', to='common.storeddocument')),
+                ('record_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+            ],
+            options={
+                'unique_together': {('record_type', 'record_id', 'field_name')},
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VitalRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('module', models.CharField(max_length=30)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('min_value', models.FloatField(blank=True, null=True)),
+                ('max_value', models.FloatField(blank=True, null=True)),
+                ('sum_value', models.FloatField(blank=True, null=True)),
+                ('min_value_2', models.FloatField(blank=True, null=True)),
+                ('max_value_2', models.FloatField(blank=True, null=True)),
+                ('sum_value_2', models.FloatField(blank=True, null=True)),
+                ('first_value', models.FloatField(blank=True, null=True)),
+                ('first_value_2', models.FloatField(blank=True, null=True)),
+                ('first_at', models.DateTimeField(blank=True, null=True)),
+                ('latest_value', models.FloatField(blank=True, null=True)),
+                ('latest_value_2', models.FloatField(blank=True, null=True)),
+                ('latest_at', models.DateTimeField(blank=True, null=True)),
+                ('latest_record_id', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vital_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'module'), name='unique_vital_rollup')],
+            },
+        ),
+    ]
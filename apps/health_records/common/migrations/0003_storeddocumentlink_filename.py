@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0002_vitalrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='storeddocumentlink',
+            name='filename',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+    ]
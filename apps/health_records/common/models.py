@@ -1,3 +1,90 @@
+from django.conf import settings
 from django.db import models
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
 
-# Create your models here.
+
+class StoredDocument(models.Model):
+    # One row per unique uploaded content, stored once under documents/originals/<sha256>;
+    # records sharing identical bytes point at the same files.
+    sha256 = models.CharField(max_length=64, unique=True)
+    original = models.FileField(upload_to="documents/originals/")
+    optimized = models.FileField(upload_to="documents/optimized/", blank=True, null=True)
+    thumbnail = models.FileField(upload_to="documents/thumbnails/", blank=True, null=True)
+    content_type = models.CharField(max_length=100, blank=True, null=True)
+    size = models.PositiveBigIntegerField(default=0)
+    optimized_size = models.PositiveBigIntegerField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.original.name} ({self.sha256[:12]})"
+
+
+class StoredDocumentLink(models.Model):
+    document = models.ForeignKey(
+        StoredDocument, on_delete=models.CASCADE, related_name="links"
+    )
+    record_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    record_id = models.PositiveBigIntegerField()
+    field_name = models.CharField(max_length=50, default="file")
+    # Name the file was uploaded under; the record itself points at the shared canonical copy
+    filename = models.CharField(max_length=255, blank=True, default="")
+    record = GenericForeignKey("record_type", "record_id")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("record_type", "record_id", "field_name")
+
+    def __str__(self):
+        return f"{self.record_type.model}#{self.record_id} -> {self.document_id}"
+
+
+class VitalRollup(models.Model):
+    # Running aggregates of one vitals module for one user, kept current on record save/delete
+    # (see rollups.py). The *_2 columns hold the second series of two-valued modules (diastolic BP).
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="vital_rollups"
+    )
+    module = models.CharField(max_length=30)
+    count = models.PositiveIntegerField(default=0)
+
+    min_value = models.FloatField(blank=True, null=True)
+    max_value = models.FloatField(blank=True, null=True)
+    sum_value = models.FloatField(blank=True, null=True)
+    min_value_2 = models.FloatField(blank=True, null=True)
+    max_value_2 = models.FloatField(blank=True, null=True)
+    sum_value_2 = models.FloatField(blank=True, null=True)
+
+    first_value = models.FloatField(blank=True, null=True)
+    first_value_2 = models.FloatField(blank=True, null=True)
+    first_at = models.DateTimeField(blank=True, null=True)
+    latest_value = models.FloatField(blank=True, null=True)
+    latest_value_2 = models.FloatField(blank=True, null=True)
+    latest_at = models.DateTimeField(blank=True, null=True)
+    latest_record_id = models.PositiveBigIntegerField(blank=True, null=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "module"], name="unique_vital_rollup"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.module} ({self.count})"
+
+
+class SearchTextMixin:
+    # Keeps search_text (the record's search_fields joined, lower-cased) in step on save; record
+    # search matches it with a plain LIKE on the lower-cased query, which the trigram GIN index on
+    # the bare column serves (icontains would wrap the column in UPPER() and skip the index)
+    search_fields = ()
+
+    def save(self, *args, **kwargs):
+        self.search_text = " ".join(
+            str(value).strip() for value in (getattr(self, name) for name in self.search_fields) if value
+        ).lower()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and set(self.search_fields) & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "search_text"}
+        super().save(*args, **kwargs)
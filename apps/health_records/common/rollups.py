@@ -0,0 +1,126 @@
+from django.apps import apps
+from django.db.models import Case, Count, F, FloatField, Max, Min, Q, Sum, Value, When
+from django.db.models.functions import Coalesce, Greatest, Least
+from django.utils import timezone
+
+from .models import VitalRollup
+from .unit_converter import normalized_expression
+
+# Vitals module -> (model label, value column, second value column). Unit-converted modules
+# aggregate the stored normalized_value so mixed units roll up correctly.
+VITAL_SERIES = {
+    "height": ("health.HeightRecord", "normalized_value", None),
+    "weight": ("health.WeightRecord", "normalized_value", None),
+    "bmi": ("health.BmiRecord", "value", None),
+    "blood_pressure": ("health.BloodPressureRecord", "systolic", "diastolic"),
+    "heart_rate": ("health.HeartRateRecord", "value", None),
+    "oxygen": ("health.OxygenSaturationRecord", "value", None),
+    "glucose": ("health.GlucoseRecord", "normalized_value", None),
+}
+MODULE_BY_MODEL = {label: module for module, (label, _, _) in VITAL_SERIES.items()}
+
+ROLLUP_FIELDS = [
+    "count",
+    "min_value", "max_value", "sum_value",
+    "min_value_2", "max_value_2", "sum_value_2",
+    "first_value", "first_value_2", "first_at",
+    "latest_value", "latest_value_2", "latest_at", "latest_record_id",
+    "updated_at",
+]
+
+
+def series_value(module, field):
+    # Column expression for one value series. normalized_value stays NULL on rows written before
+    # it existed until backfill_normalized_values has run; those are converted in the query.
+    if field == "normalized_value":
+        return Coalesce(F(field), normalized_expression(module))
+    return F(field)
+
+
+def vital_records(module, user_id):
+    label, _, _ = VITAL_SERIES[module]
+    return apps.get_model(label).objects.filter(user_id=user_id, deleted_at__isnull=True)
+
+
+def rebuild_rollup(module, user_id):
+    # Recompute one rollup from the records. Used when a rollup is first needed and after
+    # edits and deletes, where min/max cannot be maintained incrementally. Returns None when
+    # the user has no records left.
+    _, field, field_2 = VITAL_SERIES[module]
+    records = vital_records(module, user_id)
+    value = series_value(module, field)
+
+    aggregates = {"count": Count("pk"), "min_value": Min(value), "max_value": Max(value), "sum_value": Sum(value)}
+    columns = ["id", "recorded_at", value]
+    if field_2:
+        aggregates.update(min_value_2=Min(field_2), max_value_2=Max(field_2), sum_value_2=Sum(field_2))
+        columns.append(field_2)
+
+    stats = records.order_by().aggregate(**aggregates)
+    if not stats["count"]:
+        VitalRollup.objects.filter(user_id=user_id, module=module).delete()
+        return None
+
+    first = records.order_by("recorded_at", "id").values_list(*columns).first()
+    latest = records.order_by("-recorded_at", "-id").values_list(*columns).first()
+    rollup = VitalRollup(
+        user_id=user_id,
+        module=module,
+        first_at=first[1],
+        first_value=first[2],
+        first_value_2=first[3] if field_2 else None,
+        latest_record_id=latest[0],
+        latest_at=latest[1],
+        latest_value=latest[2],
+        latest_value_2=latest[3] if field_2 else None,
+        **stats,
+    )
+    VitalRollup.objects.bulk_create(
+        [rollup],
+        update_conflicts=True,
+        unique_fields=["user", "module"],
+        update_fields=ROLLUP_FIELDS,
+    )
+    return rollup
+
+
+def _fold(changes, suffix, value, newer, older):
+    value = Value(float(value), output_field=FloatField())
+    changes[f"min_value{suffix}"] = Least(Coalesce(F(f"min_value{suffix}"), value), value)
+    changes[f"max_value{suffix}"] = Greatest(Coalesce(F(f"max_value{suffix}"), value), value)
+    changes[f"sum_value{suffix}"] = Coalesce(F(f"sum_value{suffix}"), Value(0.0)) + value
+    changes[f"latest_value{suffix}"] = Case(When(newer, then=value), default=F(f"latest_value{suffix}"))
+    changes[f"first_value{suffix}"] = Case(When(older, then=value), default=F(f"first_value{suffix}"))
+
+
+def record_added(module, record):
+    # Fold a new record into its rollup with a single UPDATE; concurrent inserts serialize on the row lock
+    _, field, field_2 = VITAL_SERIES[module]
+    value = getattr(record, field)
+    value_2 = getattr(record, field_2) if field_2 else None
+    if value is None or (field_2 and value_2 is None):
+        return rebuild_rollup(module, record.user_id)
+
+    recorded_at = record.recorded_at
+    newer = Q(latest_at__isnull=True) | Q(latest_at__lte=recorded_at)
+    older = Q(first_at__isnull=True) | Q(first_at__gt=recorded_at)
+    changes = {
+        "count": F("count") + 1,
+        "latest_at": Case(When(newer, then=Value(recorded_at)), default=F("latest_at")),
+        "latest_record_id": Case(When(newer, then=Value(record.pk)), default=F("latest_record_id")),
+        "first_at": Case(When(older, then=Value(recorded_at)), default=F("first_at")),
+        "updated_at": timezone.now(),
+    }
+    _fold(changes, "", value, newer, older)
+    if field_2:
+        _fold(changes, "_2", value_2, newer, older)
+
+    if not VitalRollup.objects.filter(user_id=record.user_id, module=module).update(**changes):
+        rebuild_rollup(module, record.user_id)
+
+
+def get_rollup(module, user_id):
+    rollup = VitalRollup.objects.filter(user_id=user_id, module=module).first()
+    if rollup is None:
+        rollup = rebuild_rollup(module, user_id)
+    return rollup
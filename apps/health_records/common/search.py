@@ -0,0 +1,97 @@
+from django.apps import apps
+from rest_framework.exceptions import ValidationError
+
+from .compare_engine import nested_prefetches, serializer_for
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Module -> record model; each keeps a search_text column (SearchTextMixin) under a trigram index
+SEARCH_MODULES = {
+    "prescriptions": "prescriptions.PrescriptionRecord",
+    "hospitalizations": "hospitalizations.HospitalizationRecord",
+    "medical_bills": "medical_bills.MedicalBillRecord",
+    "vaccination_certificates": "vaccination_certificates.VaccinationCertificateRecord",
+}
+
+
+def _int(value, name):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValidationError({name: "Must be an integer."})
+
+
+def parse_search(params):
+    module = params.get("module") or "all"
+    modules = list(SEARCH_MODULES) if module == "all" else [module]
+    for mod in modules:
+        if mod not in SEARCH_MODULES:
+            raise ValidationError({"module": f"Invalid module: {mod}"})
+
+    page_size = params.get("page_size")
+    page_size = _int(page_size, "page_size") if page_size else DEFAULT_PAGE_SIZE
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+
+    # Per-module cursors ({"prescriptions": "123"}); a bare cursor applies to a single module
+    cursors = params.get("cursors") or {}
+    if not isinstance(cursors, dict):
+        raise ValidationError({"cursors": "Must be an object keyed by module."})
+    if params.get("cursor") and len(modules) == 1:
+        cursors = {modules[0]: params["cursor"]}
+    cursors = {mod: _int(cursor, "cursors") for mod, cursor in cursors.items() if mod in modules and cursor}
+    return modules, page_size, cursors
+
+
+def filtered_records(module, user, params):
+    qs = apps.get_model(SEARCH_MODULES[module]).objects.filter(user=user, deleted_at__isnull=True)
+
+    text = (params.get("search_text") or "").strip()
+    if text:
+        # search_text is stored lower-cased, so a case-sensitive contains can use the trigram index
+        qs = qs.filter(search_text__contains=text.lower())
+
+    # date filter
+    if params.get("start_date"):
+        qs = qs.filter(created_at__date__gte=params["start_date"])
+    if params.get("end_date"):
+        qs = qs.filter(created_at__date__lte=params["end_date"])
+
+    # self/dependant/both
+    sd = params.get("self_or_dependant")
+    if sd in ("self", "dependant"):
+        qs = qs.filter(for_whom=sd)
+
+    # specific dependant
+    if params.get("dependant_id"):
+        qs = qs.filter(dependant_id=params["dependant_id"])
+
+    return qs
+
+
+def search_module(module, user, params, page_size, cursor=None):
+    # One page of a module's matches, newest first, keyed on id so pages stay stable while
+    # records are added. Returns {"count", "next_cursor", "results"}.
+    qs = filtered_records(module, user, params)
+    page = qs.order_by("-id")
+    if cursor:
+        page = page.filter(id__lt=cursor)
+
+    serializer_class = serializer_for(qs.model)
+    records = list(page.prefetch_related(*nested_prefetches(serializer_class))[:page_size + 1])
+    has_more = len(records) > page_size
+    records = records[:page_size]
+    return {
+        "count": qs.count(),
+        "next_cursor": str(records[-1].id) if has_more else None,
+        "results": serializer_class(records, many=True).data,
+    }
+
+
+def search_records(user, params):
+    # {module: page} for every requested module
+    modules, page_size, cursors = parse_search(params)
+    return {
+        module: search_module(module, user, params, page_size, cursors.get(module))
+        for module in modules
+    }
@@ -0,0 +1,54 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from apps.health_records.health.latest import refresh_latest
+
+from .document_pipeline import DOCUMENT_FIELDS
+from .rollups import MODULE_BY_MODEL, rebuild_rollup, record_added
+
+
+def enqueue_document_processing(sender, instance, created, field_name, **kwargs):
+    if not created or not getattr(instance, field_name):
+        return
+
+    from .tasks import process_uploaded_document
+
+    transaction.on_commit(
+        partial(
+            process_uploaded_document.delay,
+            sender._meta.label,
+            instance.pk,
+            field_name,
+        )
+    )
+
+
+def vital_saved(sender, instance, created, **kwargs):
+    module = MODULE_BY_MODEL[sender._meta.label]
+    if created and instance.deleted_at is None:
+        record_added(module, instance)
+    else:
+        # Edits and soft deletes can move min/max either way
+        rebuild_rollup(module, instance.user_id)
+    refresh_latest(module, instance.user_id)
+
+
+def vital_deleted(sender, instance, **kwargs):
+    module = MODULE_BY_MODEL[sender._meta.label]
+    rebuild_rollup(module, instance.user_id)
+    refresh_latest(module, instance.user_id)
+
+
+for model_label, field_name in DOCUMENT_FIELDS.items():
+    post_save.connect(
+        partial(enqueue_document_processing, field_name=field_name),
+        sender=model_label,
+        weak=False,
+        dispatch_uid=f"document_pipeline:{model_label}",
+    )
+
+for model_label in MODULE_BY_MODEL:
+    post_save.connect(vital_saved, sender=model_label, dispatch_uid=f"vital_rollup:save:{model_label}")
+    post_delete.connect(vital_deleted, sender=model_label, dispatch_uid=f"vital_rollup:delete:{model_label}")
@@ -1,9 +1,18 @@
 from django.apps import apps
-from statistics import mean
-from collections import Counter
-from .unit_converter import normalize_value
+from django.db.models import Count
 from django.utils import timezone
 
+from .rollups import VITAL_SERIES, get_rollup
+
+CANONICAL_UNITS = {
+    "height": "cm",
+    "weight": "kg",
+    "heart_rate": "bpm",
+    "oxygen": "%",
+    "glucose": "mg/dl",
+}
+INTEGER_MODULES = {"blood_pressure", "heart_rate"}
+
 def get_model_from_module(module_name: str):
 
     mapping = {
@@ -42,230 +51,256 @@ def calculate_trend(values):
     return "stable"
 
 
+def module_queryset(module, user):
+    Model = get_model_from_module(module)
+    qs = Model.objects.filter(user=user)
+    if hasattr(Model, "deleted_at"):
+        qs = qs.filter(deleted_at__isnull=True)
+    return qs.order_by("-created_at")
+
+
+def _counts(qs, field):
+    # {value: count}, most common first, from one GROUP BY
+    return dict(
+        qs.order_by()
+        .exclude(**{f"{field}__isnull": True})
+        .exclude(**{field: ""})
+        .values_list(field)
+        .annotate(n=Count("pk"))
+        .order_by("-n", field)
+    )
+
+
+def _top(counts):
+    return next(iter(counts), None)
+
+
 # SUMMARY: HEALTH MODULES
-def calculate_summary(module, records):
+def calculate_summary(module, user):
+    # Vitals come from the per-user rollup row (O(1) however many readings there are);
+    # the record modules are aggregated in SQL.
+    if module in VITAL_SERIES:
+        return summarize_vital(module, user.pk)
+
+    qs = module_queryset(module, user)
+    if not qs.exists():
+        return {"message": "No records found"}
+
+    if module == "prescriptions":
+        return summarize_prescriptions(qs)
+
+    if module == "hospitalizations":
+        return summarize_hospitalizations(qs)
+
+    if module == "medical_bills":
+        return summarize_medical_bills(qs)
+
+    if module == "vaccination_certificates":
+        return summarize_vaccinations(qs)
+
+    if module == "medicine_reminders":
+        return summarize_medicine_reminders(qs)
+
+    return {"message": "Unsupported module"}
+
+
+def _number(value, module):
+    return int(value) if module in INTEGER_MODULES else value
+
+
+def _trend(rollup, suffix=""):
+    latest, first = getattr(rollup, f"latest_value{suffix}"), getattr(rollup, f"first_value{suffix}")
+    return calculate_trend([latest, first] if rollup.count > 1 else [latest])
+
+
+def _stats(rollup, module, suffix="", rounded=False):
+    low, high = getattr(rollup, f"min_value{suffix}"), getattr(rollup, f"max_value{suffix}")
+    if rounded:
+        low, high = round(low, 2), round(high, 2)
+    return (
+        _number(low, module),
+        _number(high, module),
+        round(getattr(rollup, f"sum_value{suffix}") / rollup.count, 2),
+    )
+
 
-    recs = list(records)
-    if not recs:
+def _latest_field(module, rollup, field):
+    Model = get_model_from_module(module)
+    return Model.objects.filter(pk=rollup.latest_record_id).values_list(field, flat=True).first()
+
+
+def summarize_vital(module, user_id):
+    rollup = get_rollup(module, user_id)
+    if rollup is None:
         return {"message": "No records found"}
 
-    # HEIGHT
-    if module == "height":
-        values = [normalize_value(r.value, r.unit, "height") for r in recs]
-        return {
-            "latest_value": values[0],
-            "unit": "cm",
-            "min": round(min(values), 2),
-            "max": round(max(values), 2),
-            "average": round(mean(values), 2),
-            "trend": calculate_trend(values)
-        }
+    latest = _number(rollup.latest_value, module)
 
-    # WEIGHT
-    if module == "weight":
-        values = [normalize_value(r.value, r.unit, "weight") for r in recs]
+    # HEIGHT / WEIGHT (normalized to cm / kg)
+    if module in ("height", "weight"):
+        low, high, average = _stats(rollup, module, rounded=True)
         return {
-            "latest_value": values[0],
-            "unit": "kg",
-            "min": round(min(values), 2),
-            "max": round(max(values), 2),
-            "average": round(mean(values), 2),
-            "trend": calculate_trend(values)
+            "latest_value": latest,
+            "unit": CANONICAL_UNITS[module],
+            "min": low,
+            "max": high,
+            "average": average,
+            "trend": _trend(rollup),
         }
 
     # BMI
     if module == "bmi":
-        values = [r.value for r in recs]
+        low, high, average = _stats(rollup, module)
         return {
-            "latest_value": values[0],
-            "category": bmi_category(values[0]),
-            "min": min(values),
-            "max": max(values),
-            "average": round(mean(values), 2),
-            "trend": calculate_trend(values)
+            "latest_value": latest,
+            "category": bmi_category(latest),
+            "min": low,
+            "max": high,
+            "average": average,
+            "trend": _trend(rollup),
         }
 
     # BLOOD PRESSURE
     if module == "blood_pressure":
-        sys_vals = [r.systolic for r in recs]
-        dia_vals = [r.diastolic for r in recs]
+        from apps.health_records.health.models import BloodPressureRecord
+
+        systolic, diastolic = latest, _number(rollup.latest_value_2, module)
+        min_sys, max_sys, _ = _stats(rollup, module)
+        min_dia, max_dia, _ = _stats(rollup, module, suffix="_2")
         return {
             "latest": {
-                "systolic": sys_vals[0],
-                "diastolic": dia_vals[0],
-                "type": recs[0].type,
-                "category": recs[0].category,
+                "systolic": systolic,
+                "diastolic": diastolic,
+                "type": _latest_field(module, rollup, "type"),
+                "category": BloodPressureRecord(systolic=systolic, diastolic=diastolic).category,
             },
-            "min_systolic": min(sys_vals),
-            "max_systolic": max(sys_vals),
-            "min_diastolic": min(dia_vals),
-            "max_diastolic": max(dia_vals),
-            "trend_systolic": calculate_trend(sys_vals),
-            "trend_diastolic": calculate_trend(dia_vals),
-        }
-
-    # HEART RATE
-    if module == "heart_rate":
-        values = [r.value for r in recs]
-        return {
-            "latest_value": values[0],
-            "unit": "bpm",
-            "min": min(values),
-            "max": max(values),
-            "average": round(mean(values), 2),
-            "trend": calculate_trend(values),
+            "min_systolic": min_sys,
+            "max_systolic": max_sys,
+            "min_diastolic": min_dia,
+            "max_diastolic": max_dia,
+            "trend_systolic": _trend(rollup),
+            "trend_diastolic": _trend(rollup, "_2"),
         }
 
-    # OXYGEN
-    if module == "oxygen":
-        values = [r.value for r in recs]
+    # HEART RATE / OXYGEN
+    if module in ("heart_rate", "oxygen"):
+        low, high, average = _stats(rollup, module)
         return {
-            "latest_value": values[0],
-            "unit": "%",
-            "min": min(values),
-            "max": max(values),
-            "average": round(mean(values), 2),
-            "trend": calculate_trend(values),
+            "latest_value": latest,
+            "unit": CANONICAL_UNITS[module],
+            "min": low,
+            "max": high,
+            "average": average,
+            "trend": _trend(rollup),
         }
 
-    # GLUCOSE
-    if module == "glucose":
-        values = [normalize_value(r.value, r.unit, "glucose") for r in recs]
-        return {
-            "latest_value": values[0],
-            "unit": "mg/dl",
-            "latest_type": recs[0].test_type,
-            "min": min(values),
-            "max": max(values),
-            "average": round(mean(values), 2),
-            "trend": calculate_trend(values)
-        }
-
-    # NON-NUMERIC MODULES WITH ADVANCED SUMMARIES
-    if module == "prescriptions":
-        return summarize_prescriptions(recs)
-
-    if module == "hospitalizations":
-        return summarize_hospitalizations(recs)
-
-    if module == "medical_bills":
-        return summarize_medical_bills(recs)
-
-    if module == "vaccination_certificates":
-        return summarize_vaccinations(recs)
-
-    if module == "medicine_reminders":
-        return summarize_medicine_reminders(recs)
-
-    return {"message": "Unsupported module"}
+    # GLUCOSE (normalized to mg/dl)
+    low, high, average = _stats(rollup, module)
+    return {
+        "latest_value": latest,
+        "unit": CANONICAL_UNITS[module],
+        "latest_type": _latest_field(module, rollup, "test_type"),
+        "min": low,
+        "max": high,
+        "average": average,
+        "trend": _trend(rollup),
+    }
 
 
 # NON-NUMERIC SUMMARY FUNCTIONS
-def summarize_prescriptions(recs):
-    latest = recs[0]
+def summarize_prescriptions(qs):
+    latest = qs.first()
+    labels = dict(qs.model.PRESCRIPTION_TYPE_CHOICES)
 
-    type_count = Counter([r.get_record_type_display() for r in recs])
-    doctor_count = Counter([r.doctor_name for r in recs if r.doctor_name])
+    type_count = {labels.get(key, key): n for key, n in _counts(qs, "record_type").items()}
+    doctor_count = _counts(qs, "doctor_name")
 
     return {
-        "total_records": len(recs),
+        "total_records": sum(type_count.values()),
         "latest_record_type": latest.get_record_type_display(),
         "latest_record_date": latest.record_date,
-        "top_prescription_type": type_count.most_common(1)[0][0],
-        "top_doctor_visited": doctor_count.most_common(1)[0][0] if doctor_count else None,
+        "top_prescription_type": _top(type_count),
+        "top_doctor_visited": _top(doctor_count),
         "records_by_type": type_count,
     }
 
 
-def summarize_hospitalizations(recs):
-    latest = recs[0]
+def summarize_hospitalizations(qs):
+    latest = qs.first()
 
-    type_count = Counter([r.hospitalization_type for r in recs])
-    hospital_count = Counter([r.hospital_name for r in recs])
+    type_count = _counts(qs, "hospitalization_type")
+    hospital_count = _counts(qs, "hospital_name")
 
     return {
-        "total_hospitalizations": len(recs),
+        "total_hospitalizations": sum(type_count.values()),
         "latest_admission": latest.admitted_date,
         "latest_discharge": latest.discharged_date,
-        "common_hospital": hospital_count.most_common(1)[0][0],
+        "common_hospital": _top(hospital_count),
         "records_by_type": type_count,
     }
 
 
-def summarize_medical_bills(recs):
-    latest = recs[0]
+def summarize_medical_bills(qs):
+    latest = qs.first()
 
-    hospital_count = Counter([r.record_hospital_name for r in recs])
-    total_amount = sum([r.amount for r in recs if hasattr(r, "amount")])
+    hospital_count = _counts(qs, "record_hospital_name")
 
+    # Bills have no amount column, so the amount figures stay 0 as before
     return {
-        "total_bills": len(recs),
+        "total_bills": qs.count(),
         "latest_bill_date": latest.record_date,
-        "total_amount_spent": total_amount,
-        "average_bill_amount": total_amount / len(recs) if recs else 0,
-        "top_hospital": hospital_count.most_common(1)[0][0],
+        "total_amount_spent": 0,
+        "average_bill_amount": 0,
+        "top_hospital": _top(hospital_count),
         "bills_by_hospital": hospital_count,
     }
 
 
-def summarize_vaccinations(recs):
-    latest = recs[0]
+def summarize_vaccinations(qs):
+    latest = qs.first()
 
-    dose_count = Counter([r.vaccination_name for r in recs])
+    dose_count = _counts(qs, "vaccination_name")
 
     return {
-        "total_vaccinations": len(recs),
+        "total_vaccinations": sum(dose_count.values()),
         "latest_vaccination_name": latest.vaccination_name,
         "latest_vaccination_date": latest.vaccination_date,
         "vaccinations_by_type": dose_count,
     }
 
 
-def summarize_medicine_reminders(recs):
+def summarize_medicine_reminders(qs):
 
     today = timezone.localdate()
 
-    active_records = []
-    completed_records = []
-
-    for r in recs:
-        record_data = {
+    def record_data(r, with_times=False):
+        data = {
             "id": r.id,
             "medicine_name": r.medicine_name,
             "start_date": r.start_date,
             "end_date": r.end_date,
             "frequency_type": r.frequency_type,
         }
+        # Add schedule times for fixed mode
+        if with_times and r.frequency_type == "fixed_times":
+            data["schedule_times"] = [str(t.time)[:5] for t in r.schedule_times.all()]
+        return data
 
-        # Active: today is between start & end
-        if r.start_date <= today <= r.end_date:
-
-            # Add schedule times for fixed mode
-            if r.frequency_type == "fixed_times":
-                record_data["schedule_times"] = [
-                    str(t.time)[:5] for t in r.schedule_times.all()
-                ]
-
-            active_records.append(record_data)
+    # Active: today is between start & end
+    active_records = [
+        record_data(r, with_times=True)
+        for r in qs.filter(start_date__lte=today, end_date__gte=today).prefetch_related("schedule_times")
+    ]
+    # Completed: end_date is in the past
+    completed_records = [record_data(r) for r in qs.filter(end_date__lt=today)]
 
-        # Completed: end_date is in the past
-        elif r.end_date < today:
-            completed_records.append(record_data)
-
-        else:
-            pass
-
-    # Most frequent medicine
-    medicine_count = Counter([r.medicine_name for r in recs])
-    most_frequent = (
-        medicine_count.most_common(1)[0][0] if medicine_count else None
-    )
+    medicine_count = _counts(qs, "medicine_name")
 
     return {
-        "total_reminders": len(recs),
+        "total_reminders": qs.count(),
         "active_count": len(active_records),
         "completed_count": len(completed_records),
-        "most_frequent_medicine": most_frequent,
+        "most_frequent_medicine": _top(medicine_count),
         "active_reminders": active_records,
         "completed_reminders": completed_records,
     }
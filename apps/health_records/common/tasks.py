@@ -0,0 +1,36 @@
+from celery import shared_task
+from django.contrib.auth import get_user_model
+
+from .document_pipeline import process_document
+from .export import purge_exports, set_export_status, write_export
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=30)
+def process_uploaded_document(self, model_label, pk, field_name="file"):
+    try:
+        return process_document(model_label, pk, field_name)
+    except OSError as exc:
+        raise self.retry(exc=exc)
+
+
+@shared_task(bind=True, max_retries=2, default_retry_delay=60)
+def export_health_records(self, user_id, fmt, filename, sections=None):
+    try:
+        user = get_user_model().objects.get(pk=user_id)
+        name = write_export(user, fmt, filename, sections)
+    except OSError as exc:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=exc)
+        set_export_status(user_id, filename, "failed", "The export could not be stored.")
+        raise
+    except Exception:
+        set_export_status(user_id, filename, "failed", "The export could not be generated.")
+        raise
+    set_export_status(user_id, filename, "ready")
+    return name
+
+
+@shared_task
+def purge_expired_exports():
+    # Exports hold PHI; nothing outlives HEALTH_RECORD_EXPORT_TTL
+    return purge_exports()
@@ -1,24 +1,36 @@
-def normalize_value(value, unit, module):
+from django.db.models import Case, F, FloatField, Value, When
 
+# Module -> {unit: factor to the module's canonical unit}; any other unit is already canonical
+UNIT_FACTORS = {
     # HEIGHT -> Convert everything to centimeters
-    if module == "height":
-        if unit == "cm":
-            return value
-        if unit == "ft":
-            return value * 30.48  # 1 ft = 30.48 cm
-
+    "height": {"ft": 30.48},  # 1 ft = 30.48 cm
     # WEIGHT -> Convert everything to kilograms
-    if module == "weight":
-        if unit == "kg":
-            return value
-        if unit == "lb":
-            return value * 0.453592  # 1 lb = 0.453592 kg
-
+    "weight": {"lb": 0.453592},  # 1 lb = 0.453592 kg
     # GLUCOSE -> Convert everything to mg/dl
-    if module == "glucose":
-        if unit == "mg/dl":
-            return value
-        if unit == "mmol/l":
-            return value * 18  # 1 mmol/l = 18 mg/dl
+    "glucose": {"mmol/l": 18},  # 1 mmol/l = 18 mg/dl
+}
+
+
+def normalize_value(value, unit, module):
+    factor = UNIT_FACTORS.get(module, {}).get(unit)
+    return value * factor if factor else value
+
+
+def normalize_values(values, units, module):
+    # Column-wise normalize_value for bulk paths (ingest, backfills)
+    factors = UNIT_FACTORS.get(module, {})
+    if not factors:
+        return list(values)
+    return [value * factors[unit] if unit in factors else value for value, unit in zip(values, units)]
+
 
-    return value
+def normalized_expression(module, value="value", unit="unit"):
+    # The same conversion as a SQL expression, for UPDATEs and annotations
+    whens = [
+        When(**{unit: name}, then=F(value) * Value(factor, output_field=FloatField()))
+        for name, factor in UNIT_FACTORS.get(module, {}).items()
+    ]
+    default = F(value)
+    if not whens:
+        return default
+    return Case(*whens, default=default, output_field=FloatField())
@@ -1,11 +1,14 @@
 from django.urls import path
-from .views_compare import compare_records
+from .views_compare import compare_records, parameter_trends
 from .view_summary import health_summary
-from .views import search_records
+from .views import export_records, export_status, search_records
 
 
 urlpatterns = [
     path("compare/", compare_records),
+    path("compare/parameters/", parameter_trends),
     path("summary/", health_summary),
     path("search/", search_records),
+    path("export/", export_records, name="health-records-export"),
+    path("export/<str:export_id>/", export_status, name="health-records-export-status"),
 ]
@@ -14,15 +14,9 @@ def health_summary(request):
     if not module:
         raise ValidationError({"module": "module is required"})
 
-    Model = get_model_from_module(module)
+    get_model_from_module(module)
 
-    qs = Model.objects.filter(user=request.user)
-    if hasattr(Model, "deleted_at"):
-        qs = qs.filter(deleted_at__isnull=True)
-
-    qs = qs.order_by("-created_at")
-
-    summary = calculate_summary(module, qs)
+    summary = calculate_summary(module, request.user)
 
     return Response({
         "module": module,
@@ -1,118 +1,95 @@
+import re
+import uuid
+
+from django.core.files.storage import default_storage
+from django.http import StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from django.db.models import Q
-from django.apps import apps
 
-# Import serializers
-from apps.health_records.prescriptions.serializers import PrescriptionRecordSerializer
-from apps.health_records.hospitalizations.serializers import HospitalizationRecordSerializer
-from apps.health_records.medical_bills.serializers import MedicalBillRecordSerializer
-from apps.health_records.vaccination_certificates.serializers import VaccinationCertificateRecordSerializer
+from apps.common.utils.file_delivery import signed_storage_url
 
+from . import export, search
+from .tasks import export_health_records
 
-MODULE_CONFIG = {
-    "prescriptions": {
-        "model": "prescriptions.PrescriptionRecord",
-        "serializer": PrescriptionRecordSerializer,
-        "doctor_field": "doctor_name",
-        "hospital_field": None
-    },
-    "hospitalizations": {
-        "model": "hospitalizations.HospitalizationRecord",
-        "serializer": HospitalizationRecordSerializer,
-        "doctor_field": "doctor_name",
-        "hospital_field": "hospital_name"
-    },
-    "medical_bills": {
-        "model": "medical_bills.MedicalBillRecord",
-        "serializer": MedicalBillRecordSerializer,
-        "doctor_field": None,
-        "hospital_field": "record_hospital_name"
-    },
-    "vaccination_certificates": {
-        "model": "vaccination_certificates.VaccinationCertificateRecord",
-        "serializer": VaccinationCertificateRecordSerializer,
-        "doctor_field": None,
-        "hospital_field": "vaccination_center"
-    },
-}
-
-
-def apply_common_filters(qs, params, doctor_field, hospital_field):
-
-    # text search
-    if params.get("search_text"):
-        text = params["search_text"]
-        query = Q()
-
-        if doctor_field:
-            query |= Q(**{f"{doctor_field}__icontains": text})
-
-        if hospital_field:
-            query |= Q(**{f"{hospital_field}__icontains": text})
-
-        qs = qs.filter(query)
-
-    # date filter
-    if params.get("start_date"):
-        qs = qs.filter(created_at__date__gte=params["start_date"])
-
-    if params.get("end_date"):
-        qs = qs.filter(created_at__date__lte=params["end_date"])
-
-    # self/dependant/both
-    sd = params.get("self_or_dependant")
-    if sd == "self":
-        qs = qs.filter(for_whom="self")
-    elif sd == "dependant":
-        qs = qs.filter(for_whom="dependant")
-
-    # specific dependant
-    if params.get("dependant_id"):
-        qs = qs.filter(dependant_id=params["dependant_id"])
-
-    return qs
+# Export ids are the stored file name: <uuid hex>.<extension>
+_EXPORT_ID = re.compile(r"^[0-9a-f]{32}\.(ndjson|csv|json)$")
 
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def search_records(request):
-
-    module = request.data.get("module", "all")
+    # Cross-module record search. Each module comes back as its own page with a total count and
+    # a next_cursor; send it back as cursors={module: next_cursor} (or cursor= with a single
+    # module) for the next page. page_size defaults to 20, max 100.
     params = request.data
+    return Response({
+        "search_filters": params,
+        "results": search.search_records(request.user, params),
+    })
 
-    results = {}
-
-    # Search in all modules
-    modules_to_search = (
-        MODULE_CONFIG.keys() if module == "all" else [module]
-    )
-
-    for mod in modules_to_search:
-
-        if mod not in MODULE_CONFIG:
-            return Response({"error": f"Invalid module: {mod}"}, status=400)
 
-        cfg = MODULE_CONFIG[mod]
-        model = apps.get_model(cfg["model"])
-        serializer = cfg["serializer"]
+def _export_options(params):
+    # export_format rather than format, which DRF reserves for renderer selection
+    fmt = params.get("export_format") or "ndjson"
+    if fmt not in export.FORMATS:
+        raise ValidationError({"export_format": f"Use one of: {', '.join(export.FORMATS)}"})
+    sections = params.get("sections") or None
+    if isinstance(sections, str):
+        sections = [section.strip() for section in sections.split(",") if section.strip()]
+    unknown = [section for section in sections or () if section not in export.SECTIONS]
+    if unknown:
+        raise ValidationError({"sections": f"Unknown section(s): {', '.join(unknown)}"})
+    return fmt, sections
 
-        qs = model.objects.filter(
-            user=request.user,
-            deleted_at__isnull=True
-        )
 
-        qs = apply_common_filters(
-            qs,
-            params,
-            cfg["doctor_field"],
-            cfg["hospital_field"]
-        )
+@api_view(["GET", "POST"])
+@permission_classes([IsAuthenticated])
+def export_records(request):
+    # Full health-record export as NDJSON, long-format CSV or a FHIR collection Bundle
+    # (?export_format=ndjson|csv|fhir, optional ?sections=height,prescriptions,...).
+    # GET streams it straight back; POST runs it as a background job and returns an export id
+    # to poll on export/<id>/, for accounts too large for one request.
+    if request.method == "GET":
+        fmt, sections = _export_options(request.query_params)
+        content_type, extension = export.FORMATS[fmt]
+        response = StreamingHttpResponse(export.stream_export(request.user, fmt, sections), content_type=content_type)
+        filename = f"health-records-{timezone.localdate().isoformat()}.{extension}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    fmt, sections = _export_options(request.data)
+    export_id = export.export_filename(uuid.uuid4().hex, fmt)
+    export.set_export_status(request.user.pk, export_id, "pending")
+    export_health_records.delay(request.user.pk, fmt, export_id, sections)
+    return Response(
+        {
+            "export_id": export_id,
+            "status_url": request.build_absolute_uri(reverse("health-records-export-status", args=[export_id])),
+        },
+        status=status.HTTP_202_ACCEPTED,
+    )
 
-        results[mod] = serializer(qs, many=True).data
 
-    return Response({
-        "search_filters": params,
-        "results": results
-    })
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def export_status(request, export_id):
+    # "pending", "failed" (with an error) or "ready" with a signed download URL; 404 once the
+    # export has expired (HEALTH_RECORD_EXPORT_TTL). State and files are kept per user, so ids
+    # cannot reach other accounts.
+    if not _EXPORT_ID.match(export_id):
+        return Response({"detail": "Unknown export."}, status=status.HTTP_404_NOT_FOUND)
+    state = export.get_export_status(request.user.pk, export_id) or {}
+    name = export.export_path(request.user.pk, export_id)
+    job_status = state.get("status")
+    if job_status == "failed":
+        return Response({"export_id": export_id, "status": "failed", "error": state.get("error")})
+    if job_status == "pending":
+        return Response({"export_id": export_id, "status": "pending"})
+    if not default_storage.exists(name):
+        return Response({"detail": "Unknown or expired export."}, status=status.HTTP_404_NOT_FOUND)
+    return Response({"export_id": export_id, "status": "ready", "url": signed_storage_url(request, name)})
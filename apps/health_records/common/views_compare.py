@@ -2,11 +2,13 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError
-from django.apps import apps
 
-from .compare_engine import filter_record_for_compare, get_model_from_module, dict_diff
+from apps.common.utils.profile_helper import get_effective_user
 
-from django.apps import apps as django_apps
+from .compare_engine import (
+    DEFAULT_TREND_RECORDS, MAX_TREND_RECORDS, dict_diff, filter_record_for_compare,
+    get_model_from_module, nested_prefetches, serializer_for, trend_matrix, trend_rows,
+)
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
@@ -22,8 +24,12 @@ def compare_records(request):
     # Get the model from YOUR mapping
     Model = get_model_from_module(module)
 
+    serializer_class = serializer_for(Model)
+
     # Fetch records
-    qs = Model.objects.filter(id__in=record_ids)
+    qs = Model.objects.filter(id__in=record_ids, user=request.user).prefetch_related(
+        *nested_prefetches(serializer_class)
+    )
     if hasattr(Model, "deleted_at"):
         qs = qs.filter(deleted_at__isnull=True)
 
@@ -31,13 +37,6 @@ def compare_records(request):
     if len(records) != len(record_ids):
         raise ValidationError("Some record_ids are invalid")
 
-    app_config = django_apps.get_app_config(Model._meta.app_label)
-    serializer_module_path = app_config.name + ".serializers" 
-    serializer_class_name = Model.__name__ + "Serializer"       
-
-    serializers_module = __import__(serializer_module_path, fromlist=[serializer_class_name])
-    serializer_class = getattr(serializers_module, serializer_class_name)
-
     # Serialize with context
     raw = serializer_class(records, many=True, context={"request": request}).data
 
@@ -52,3 +51,22 @@ def compare_records(request):
         "differences": differences,
     })
 
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def parameter_trends(request):
+    # Lab parameter x report matrix across prescription/lab records: ?record_ids=1,2,3, or the
+    # newest ?limit= records of the active profile
+    raw_ids = request.query_params.get("record_ids")
+    try:
+        record_ids = [int(pk) for pk in raw_ids.split(",") if pk.strip()] if raw_ids else None
+        limit = int(request.query_params.get("limit") or DEFAULT_TREND_RECORDS)
+    except ValueError:
+        raise ValidationError("record_ids and limit must be integers")
+    if record_ids and len(record_ids) > MAX_TREND_RECORDS:
+        raise ValidationError({"record_ids": f"At most {MAX_TREND_RECORDS} records"})
+
+    user, dependant_id = get_effective_user(request)
+    rows = trend_rows(user, record_ids, dependant_id, max(1, min(limit, MAX_TREND_RECORDS)))
+    return Response(trend_matrix(rows))
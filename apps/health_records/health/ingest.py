@@ -0,0 +1,196 @@
+import math
+from collections import defaultdict
+from collections.abc import Iterator
+
+import orjson
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.health_records.common.rollups import rebuild_rollup
+from apps.health_records.common.unit_converter import normalize_values
+
+from .latest import refresh_latest
+from .models import (
+    BloodPressureRecord, BmiRecord, GlucoseRecord, HeartRateRecord, HeightRecord,
+    NormalizedValueMixin, OxygenSaturationRecord, WeightRecord,
+)
+
+MAX_READINGS = 10000
+CHUNK_SIZE = 1000
+MAX_INT = 2147483647
+
+# Module -> (model, numeric fields and their type, choice fields)
+MODULE_FIELDS = {
+    "height": (HeightRecord, {"value": float}, ("unit",)),
+    "weight": (WeightRecord, {"value": float}, ("unit",)),
+    "bmi": (BmiRecord, {"value": float}, ("unit",)),
+    "blood_pressure": (BloodPressureRecord, {"systolic": int, "diastolic": int}, ("unit", "type")),
+    "heart_rate": (HeartRateRecord, {"value": int}, ("unit",)),
+    "oxygen": (OxygenSaturationRecord, {"value": float}, ("unit",)),
+    "glucose": (GlucoseRecord, {"value": float}, ("unit", "test_type")),
+}
+
+
+class TooManyReadings(ValueError):
+    pass
+
+
+def decode_rows(payload):
+    # Readings from a JSON array, {"readings": [...]} or an iterator of NDJSON lines.
+    # Lines that fail to decode become {"_error": ...} so they are reported by index.
+    if isinstance(payload, dict):
+        payload = payload.get("readings", [])
+    if isinstance(payload, list):
+        rows = payload
+        if len(rows) > MAX_READINGS:
+            raise TooManyReadings
+        return rows
+    if not isinstance(payload, Iterator):
+        return [payload]
+
+    rows = []
+    for line in payload:
+        if len(rows) == MAX_READINGS:
+            raise TooManyReadings
+        try:
+            rows.append(orjson.loads(line))
+        except orjson.JSONDecodeError as exc:
+            rows.append({"_error": f"Invalid JSON: {exc}"})
+    return rows
+
+
+def _number(raw, kind):
+    if isinstance(raw, bool) or raw is None:
+        raise ValueError
+    number = float(raw)
+    if not math.isfinite(number) or number < 0:
+        raise ValueError
+    if kind is int:
+        if not number.is_integer() or number > MAX_INT:
+            raise ValueError
+        return int(number)
+    return number
+
+
+def _moment(raw, now):
+    if raw in (None, ""):
+        return now
+    moment = parse_datetime(str(raw))
+    if moment is None:
+        raise ValueError
+    return timezone.make_aware(moment) if timezone.is_naive(moment) else moment
+
+
+def validate(rows):
+    # One pass over the payload, checked column by column per module. Returns
+    # ({module: [(index, attrs)]}, [{"index", "errors"}]).
+    now = timezone.now()
+    by_module = defaultdict(list)
+    errors = []
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict):
+            errors.append({"index": index, "errors": {"non_field_errors": "Expected an object."}})
+        elif "_error" in row:
+            errors.append({"index": index, "errors": {"non_field_errors": row["_error"]}})
+        elif not isinstance(row.get("module"), str) or row["module"] not in MODULE_FIELDS:
+            errors.append({"index": index, "errors": {"module": f"Use one of: {', '.join(MODULE_FIELDS)}"}})
+        else:
+            by_module[row["module"]].append((index, row))
+
+    valid = {}
+    for module, entries in by_module.items():
+        Model, numeric, choice_fields = MODULE_FIELDS[module]
+        row_errors = defaultdict(dict)
+        columns = defaultdict(list)
+
+        for name, kind in numeric.items():
+            for index, row in entries:
+                try:
+                    columns[name].append(_number(row.get(name), kind))
+                except (TypeError, ValueError):
+                    columns[name].append(None)
+                    row_errors[index][name] = "A non-negative number is required."
+
+        for name in choice_fields:
+            field = Model._meta.get_field(name)
+            allowed = {key for key, _ in field.choices}
+            for index, row in entries:
+                value = row.get(name) or field.default
+                columns[name].append(value)
+                # Lists and objects are unhashable; reject them here rather than fail the batch
+                if not isinstance(value, str) or value not in allowed:
+                    row_errors[index][name] = f"Use one of: {', '.join(sorted(allowed))}"
+
+        for index, row in entries:
+            try:
+                columns["recorded_at"].append(_moment(row.get("recorded_at"), now))
+            except (TypeError, ValueError):
+                columns["recorded_at"].append(None)
+                row_errors[index]["recorded_at"] = "Use an ISO 8601 datetime."
+
+        names = list(columns)
+        valid[module] = [
+            (index, dict(zip(names, values)))
+            for (index, _), *values in zip(entries, *(columns[name] for name in names))
+            if index not in row_errors
+        ]
+        errors.extend({"index": index, "errors": fields} for index, fields in row_errors.items())
+
+    errors.sort(key=lambda error: error["index"])
+    return valid, errors
+
+
+def _key(attrs, numeric):
+    return (attrs["recorded_at"], *(attrs[name] for name in numeric))
+
+
+def ingest(user, rows):
+    # Validate, dedupe on (user, module, recorded_at, value) and bulk insert. Rollups and the
+    # latest snapshot are refreshed once per module since bulk_create skips the per-record signals.
+    valid, errors = validate(rows)
+    created, duplicates = {}, 0
+
+    with transaction.atomic():
+        for module, entries in valid.items():
+            if not entries:
+                continue
+            Model, numeric, _ = MODULE_FIELDS[module]
+            moments = [attrs["recorded_at"] for _, attrs in entries]
+            seen = set(
+                Model.objects.filter(
+                    user=user,
+                    deleted_at__isnull=True,
+                    recorded_at__range=(min(moments), max(moments)),
+                ).values_list("recorded_at", *numeric)
+            )
+
+            records = []
+            for _, attrs in entries:
+                key = _key(attrs, numeric)
+                if key in seen:
+                    duplicates += 1
+                    continue
+                seen.add(key)
+                records.append(Model(user=user, created_by=user, updated_by=user, **attrs))
+
+            # bulk_create skips save(), so fill the canonical-unit column for the whole column at once
+            if issubclass(Model, NormalizedValueMixin):
+                normalized = normalize_values(
+                    [record.value for record in records], [record.unit for record in records], module
+                )
+                for record, value in zip(records, normalized):
+                    record.normalized_value = value
+
+            Model.objects.bulk_create(records, batch_size=CHUNK_SIZE)
+            created[module] = len(records)
+            if records:
+                rebuild_rollup(module, user.pk)
+                refresh_latest(module, user.pk)
+
+    return {
+        "received": len(rows),
+        "created": created,
+        "duplicates": duplicates,
+        "errors": errors,
+    }
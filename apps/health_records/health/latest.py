@@ -0,0 +1,64 @@
+from django.db import transaction
+
+from .models import (
+    BloodPressureRecord, BmiRecord, GlucoseRecord, HeartRateRecord, HeightRecord, LatestVitals,
+    OxygenSaturationRecord, WeightRecord,
+)
+from .serializers import (
+    BloodPressureRecordSerializer, BmiRecordSerializer, GlucoseRecordSerializer,
+    HeartRateRecordSerializer, HeightRecordSerializer, OxygenSaturationRecordSerializer,
+    WeightRecordSerializer,
+)
+
+# Vitals module (same keys as rollups.VITAL_SERIES) -> (model, serializer)
+LATEST_SOURCES = {
+    "height": (HeightRecord, HeightRecordSerializer),
+    "weight": (WeightRecord, WeightRecordSerializer),
+    "bmi": (BmiRecord, BmiRecordSerializer),
+    "blood_pressure": (BloodPressureRecord, BloodPressureRecordSerializer),
+    "heart_rate": (HeartRateRecord, HeartRateRecordSerializer),
+    "oxygen": (OxygenSaturationRecord, OxygenSaturationRecordSerializer),
+    "glucose": (GlucoseRecord, GlucoseRecordSerializer),
+}
+
+
+def _newest(module, user_id):
+    # Newest live reading; a LIMIT 1 walk of the (user, recorded_at) index
+    Model, serializer_class = LATEST_SOURCES[module]
+    record = (
+        Model.objects.filter(user_id=user_id, deleted_at__isnull=True)
+        .order_by("-recorded_at", "-id")
+        .first()
+    )
+    return serializer_class(record).data if record else None
+
+
+def _fill(snapshot, modules):
+    for module in modules:
+        data = _newest(module, snapshot.user_id)
+        if data is None:
+            snapshot.vitals.pop(module, None)
+        else:
+            snapshot.vitals[module] = data
+    snapshot.save(update_fields=["vitals", "updated_at"])
+
+
+def refresh_latest(module, user_id):
+    # Re-read one module into the user's snapshot after a write. The row lock serializes
+    # concurrent writers, so whoever updates last sees every committed reading. Users without a
+    # snapshot yet are skipped; get_latest_vitals builds it on first read.
+    with transaction.atomic():
+        snapshot = LatestVitals.objects.select_for_update().filter(user_id=user_id).first()
+        if snapshot is not None:
+            _fill(snapshot, [module])
+
+
+def get_latest_vitals(user_id):
+    # {module: serialized newest reading} in one query; modules without readings are absent
+    snapshot = LatestVitals.objects.filter(user_id=user_id).first()
+    if snapshot is None:
+        with transaction.atomic():
+            snapshot, created = LatestVitals.objects.get_or_create(user_id=user_id)
+            if created:
+                _fill(snapshot, LATEST_SOURCES)
+    return snapshot.vitals
@@ -0,0 +1,32 @@
+from django.db import migrations, models
+
+# Adds the column only. Existing rows are filled after deploy, in short chunks outside any
+# migration transaction:
+#   python manage.py backfill_normalized_values
+#   python manage.py rebuild_vital_rollups
+# Until then rollups and charts compute the value for rows where it is still NULL.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('health', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='heightrecord',
+            name='normalized_value',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='weightrecord',
+            name='normalized_value',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='glucoserecord',
+            name='normalized_value',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('health', '0002_normalized_value'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='heightrecord',
+            index=models.Index(fields=['user', 'created_at'], name='height_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='weightrecord',
+            index=models.Index(fields=['user', 'created_at'], name='weight_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bmirecord',
+            index=models.Index(fields=['user', 'created_at'], name='bmi_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bloodpressurerecord',
+            index=models.Index(fields=['user', 'created_at'], name='bp_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='heartraterecord',
+            index=models.Index(fields=['user', 'created_at'], name='heart_rate_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='oxygensaturationrecord',
+            index=models.Index(fields=['user', 'created_at'], name='oxygen_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='glucoserecord',
+            index=models.Index(fields=['user', 'created_at'], name='glucose_user_created_idx'),
+        ),
+    ]
@@ -0,0 +1,115 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+# Existing readings were taken when they were entered
+BACKFILL = [
+    "UPDATE health_heightrecord SET recorded_at = created_at",
+    "UPDATE health_weightrecord SET recorded_at = created_at",
+    "UPDATE health_bmirecord SET recorded_at = created_at",
+    "UPDATE health_bloodpressurerecord SET recorded_at = created_at",
+    "UPDATE health_heartraterecord SET recorded_at = created_at",
+    "UPDATE health_oxygensaturationrecord SET recorded_at = created_at",
+    "UPDATE health_glucoserecord SET recorded_at = created_at",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('health', '0003_vitals_user_created_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='heightrecord',
+            name='recorded_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='weightrecord',
+            name='recorded_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='bmirecord',
+            name='recorded_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='bloodpressurerecord',
+            name='recorded_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='heartraterecord',
+            name='recorded_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='oxygensaturationrecord',
+            name='recorded_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='glucoserecord',
+            name='recorded_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunSQL(BACKFILL, reverse_sql=migrations.RunSQL.noop),
+        migrations.RemoveIndex(
+            model_name='heightrecord',
+            name='height_user_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='heightrecord',
+            index=models.Index(fields=['user', 'recorded_at'], name='height_user_recorded_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='weightrecord',
+            name='weight_user_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='weightrecord',
+            index=models.Index(fields=['user', 'recorded_at'], name='weight_user_recorded_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='bmirecord',
+            name='bmi_user_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='bmirecord',
+            index=models.Index(fields=['user', 'recorded_at'], name='bmi_user_recorded_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='bloodpressurerecord',
+            name='bp_user_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='bloodpressurerecord',
+            index=models.Index(fields=['user', 'recorded_at'], name='bp_user_recorded_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='heartraterecord',
+            name='heart_rate_user_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='heartraterecord',
+            index=models.Index(fields=['user', 'recorded_at'], name='heart_rate_user_recorded_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='oxygensaturationrecord',
+            name='oxygen_user_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='oxygensaturationrecord',
+            index=models.Index(fields=['user', 'recorded_at'], name='oxygen_user_recorded_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='glucoserecord',
+            name='glucose_user_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='glucoserecord',
+            index=models.Index(fields=['user', 'recorded_at'], name='glucose_user_recorded_idx'),
+        ),
+    ]
@@ -1,8 +1,26 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from apps.common.models import BaseModel
+from apps.health_records.common.unit_converter import normalize_value
+
+
+class NormalizedValueMixin:
+    # Keeps normalized_value (value in the module's canonical unit) in step with value/unit,
+    # so summaries can aggregate in SQL across mixed units
+    normalized_module = None
+
+    def save(self, *args, **kwargs):
+        self.normalized_value = normalize_value(self.value, self.unit, self.normalized_module)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"value", "unit"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "normalized_value"}
+        super().save(*args, **kwargs)
+
+
+class HeightRecord(NormalizedValueMixin, BaseModel):
+    normalized_module = "height"
 
-class HeightRecord(BaseModel):
     UNIT_CHOICES = (
         ("cm", "Centimeters"),
         ("ft", "Feet"),
@@ -13,18 +31,26 @@ class HeightRecord(BaseModel):
         on_delete=models.CASCADE,
         related_name="height_records"
     )
+    # When the reading was taken; differs from created_at for device syncs
+    recorded_at = models.DateTimeField(default=timezone.now)
     value = models.FloatField()
     unit = models.CharField(max_length=5, choices=UNIT_CHOICES, default="cm")
+    # value converted to cm
+    normalized_value = models.FloatField(blank=True, null=True, editable=False)
 
     class Meta:
         ordering = ["-updated_at"]
         verbose_name = "Height Record"
         verbose_name_plural = "Height Records"
+        # Time-range queries for charts, summaries and sync dedupe
+        indexes = [models.Index(fields=["user", "recorded_at"], name="height_user_recorded_idx")]
 
     def __str__(self):
         return f"{self.user} - {self.value} {self.unit}"
 
-class WeightRecord(BaseModel):
+class WeightRecord(NormalizedValueMixin, BaseModel):
+    normalized_module = "weight"
+
     UNIT_CHOICES = (
         ("kg", "Kilograms"),
         ("lb", "Pounds"),
@@ -35,13 +61,19 @@ class WeightRecord(BaseModel):
         on_delete=models.CASCADE,
         related_name="weight_records"
     )
+    # When the reading was taken; differs from created_at for device syncs
+    recorded_at = models.DateTimeField(default=timezone.now)
     value = models.FloatField()
     unit = models.CharField(max_length=5, choices=UNIT_CHOICES, default="kg")
+    # value converted to kg
+    normalized_value = models.FloatField(blank=True, null=True, editable=False)
 
     class Meta:
         ordering = ["-updated_at"]
         verbose_name = "Weight Record"
         verbose_name_plural = "Weight Records"
+        # Time-range queries for charts, summaries and sync dedupe
+        indexes = [models.Index(fields=["user", "recorded_at"], name="weight_user_recorded_idx")]
 
     def __str__(self):
         return f"{self.user} - {self.value} {self.unit}"
@@ -55,6 +87,8 @@ class BmiRecord(BaseModel):
         on_delete=models.CASCADE,
         related_name="bmi_records"
     )
+    # When the reading was taken; differs from created_at for device syncs
+    recorded_at = models.DateTimeField(default=timezone.now)
     value = models.FloatField(help_text="Body Mass Index value")
     unit = models.CharField(max_length=10, choices=UNIT_CHOICES, default="BMI")
 
@@ -62,6 +96,8 @@ class BmiRecord(BaseModel):
         ordering = ["-updated_at"]
         verbose_name = "BMI Record"
         verbose_name_plural = "BMI Records"
+        # Time-range queries for charts, summaries and sync dedupe
+        indexes = [models.Index(fields=["user", "recorded_at"], name="bmi_user_recorded_idx")]
 
     def __str__(self):
         return f"{self.user} - {self.value} {self.unit}"
@@ -83,6 +119,8 @@ class BloodPressureRecord(BaseModel):
         on_delete=models.CASCADE,
         related_name="blood_pressure_records"
     )
+    # When the reading was taken; differs from created_at for device syncs
+    recorded_at = models.DateTimeField(default=timezone.now)
     systolic = models.PositiveIntegerField(help_text="Systolic pressure (upper value)")
     diastolic = models.PositiveIntegerField(help_text="Diastolic pressure (lower value)")
     unit = models.CharField(max_length=10, choices=UNIT_CHOICES, default="mmhg")
@@ -92,6 +130,8 @@ class BloodPressureRecord(BaseModel):
         ordering = ["-updated_at"]
         verbose_name = "Blood Pressure Record"
         verbose_name_plural = "Blood Pressure Records"
+        # Time-range queries for charts, summaries and sync dedupe
+        indexes = [models.Index(fields=["user", "recorded_at"], name="bp_user_recorded_idx")]
 
     def __str__(self):
         return f"{self.user} - {self.systolic}/{self.diastolic} {self.unit}"
@@ -121,6 +161,8 @@ class HeartRateRecord(BaseModel):
         on_delete=models.CASCADE,
         related_name="heart_rate_records"
     )
+    # When the reading was taken; differs from created_at for device syncs
+    recorded_at = models.DateTimeField(default=timezone.now)
     value = models.PositiveIntegerField()
     unit = models.CharField(max_length=10, choices=UNIT_CHOICES, default="bpm")
 
@@ -128,6 +170,8 @@ class HeartRateRecord(BaseModel):
         ordering = ["-updated_at"]
         verbose_name = "Heart Rate Record"
         verbose_name_plural = "Heart Rate Records"
+        # Time-range queries for charts, summaries and sync dedupe
+        indexes = [models.Index(fields=["user", "recorded_at"], name="heart_rate_user_recorded_idx")]
 
     def __str__(self):
         return f"{self.user} - {self.value} {self.unit}"
@@ -142,6 +186,8 @@ class OxygenSaturationRecord(BaseModel):
         on_delete=models.CASCADE,
         related_name="oxygen_saturation_records"
     )
+    # When the reading was taken; differs from created_at for device syncs
+    recorded_at = models.DateTimeField(default=timezone.now)
     value = models.FloatField(help_text="Oxygen saturation percentage")
     unit = models.CharField(max_length=5, choices=UNIT_CHOICES, default="%")
 
@@ -149,11 +195,15 @@ class OxygenSaturationRecord(BaseModel):
         ordering = ["-updated_at"]
         verbose_name = "Oxygen Saturation Record"
         verbose_name_plural = "Oxygen Saturation Records"
+        # Time-range queries for charts, summaries and sync dedupe
+        indexes = [models.Index(fields=["user", "recorded_at"], name="oxygen_user_recorded_idx")]
 
     def __str__(self):
         return f"{self.user} - {self.value}{self.unit}"
     
-class GlucoseRecord(BaseModel):
+class GlucoseRecord(NormalizedValueMixin, BaseModel):
+    normalized_module = "glucose"
+
     UNIT_CHOICES = (
         ("mg/dl", "Milligrams per Deciliter"),
         ("mmol/l", "Millimoles per Liter"),
@@ -170,14 +220,38 @@ class GlucoseRecord(BaseModel):
         on_delete=models.CASCADE,
         related_name="glucose_records"
     )
+    # When the reading was taken; differs from created_at for device syncs
+    recorded_at = models.DateTimeField(default=timezone.now)
     value = models.FloatField(help_text="Blood glucose value")
     unit = models.CharField(max_length=10, choices=UNIT_CHOICES, default="mg/dl")
+    # value converted to mg/dl
+    normalized_value = models.FloatField(blank=True, null=True, editable=False)
     test_type = models.CharField(max_length=20, choices=TYPE_CHOICES, default="fasting")
 
     class Meta:
         ordering = ["-updated_at"]
         verbose_name = "Glucose Record"
         verbose_name_plural = "Glucose Records"
+        # Time-range queries for charts, summaries and sync dedupe
+        indexes = [models.Index(fields=["user", "recorded_at"], name="glucose_user_recorded_idx")]
+
+    def __str__(self):
+        return f"{self.user} - {self.value} {self.unit} ({self.test_type})"
+
+class LatestVitals(models.Model):
+    # Denormalized snapshot of the newest reading of every vitals module for one user, as the
+    # module's serializer renders it. Kept current on record writes (see latest.py).
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="latest_vitals"
+    )
+    vitals = models.JSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Latest Vitals"
+        verbose_name_plural = "Latest Vitals"
 
     def __str__(self):
-        return f"{self.user} - {self.value} {self.unit} ({self.test_type})"
\ No newline at end of file
+        return f"{self.user} - {', '.join(self.vitals)}"
@@ -7,19 +7,19 @@ from .models import (HeightRecord, WeightRecord,
 class HeightRecordSerializer(serializers.ModelSerializer):
     class Meta:
         model = HeightRecord
-        fields = ["id", "value", "unit", "created_at", "updated_at", "created_by", "updated_by"]
+        fields = ["id", "value", "unit", "recorded_at", "created_at", "updated_at", "created_by", "updated_by"]
         read_only_fields = ["created_at", "updated_at", "created_by", "updated_by"]
         
 class WeightRecordSerializer(serializers.ModelSerializer):
     class Meta:
         model = WeightRecord
-        fields = ["id", "value", "unit", "created_at", "updated_at", "created_by", "updated_by"]
+        fields = ["id", "value", "unit", "recorded_at", "created_at", "updated_at", "created_by", "updated_by"]
         read_only_fields = ["created_at", "updated_at", "created_by", "updated_by"] 
 
 class BmiRecordSerializer(serializers.ModelSerializer):
     class Meta:
         model = BmiRecord
-        fields = ["id", "value", "unit", "created_at", "updated_at", "created_by", "updated_by"]
+        fields = ["id", "value", "unit", "recorded_at", "created_at", "updated_at", "created_by", "updated_by"]
         read_only_fields = ["created_at", "updated_at", "created_by", "updated_by"]
 
 class BloodPressureRecordSerializer(serializers.ModelSerializer):
@@ -28,7 +28,7 @@ class BloodPressureRecordSerializer(serializers.ModelSerializer):
     class Meta:
         model = BloodPressureRecord
         fields = [
-            "id", "systolic", "diastolic", "unit", "type", "category", "created_at", "updated_at", 
+            "id", "systolic", "diastolic", "unit", "type", "category", "recorded_at", "created_at", "updated_at", 
             "created_by", "updated_by",
         ]
         read_only_fields = ["created_at", "updated_at", "created_by", "updated_by"]
@@ -36,17 +36,17 @@ class BloodPressureRecordSerializer(serializers.ModelSerializer):
 class HeartRateRecordSerializer(serializers.ModelSerializer):
     class Meta:
         model = HeartRateRecord
-        fields = ["id", "value", "unit", "created_at", "updated_at", "created_by", "updated_by"]
+        fields = ["id", "value", "unit", "recorded_at", "created_at", "updated_at", "created_by", "updated_by"]
         read_only_fields = ["created_at", "updated_at", "created_by", "updated_by"]
         
 class OxygenSaturationRecordSerializer(serializers.ModelSerializer):
     class Meta:
         model = OxygenSaturationRecord
-        fields = [ "id", "value", "unit", "created_at", "updated_at", "created_by", "updated_by"]
+        fields = [ "id", "value", "unit", "recorded_at", "created_at", "updated_at", "created_by", "updated_by"]
         read_only_fields = ["created_at", "updated_at", "created_by", "updated_by"]
         
 class GlucoseRecordSerializer(serializers.ModelSerializer):
     class Meta:
         model = GlucoseRecord
-        fields = ["id", "value", "unit", "test_type", "created_at", "updated_at", "created_by", "updated_by"]
+        fields = ["id", "value", "unit", "test_type", "recorded_at", "created_at", "updated_at", "created_by", "updated_by"]
         read_only_fields = ["created_at", "updated_at", "created_by", "updated_by"]
\ No newline at end of file
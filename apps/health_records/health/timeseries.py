@@ -0,0 +1,200 @@
+from datetime import datetime, time, timedelta
+
+from django.apps import apps
+from django.db.models import Avg, Count, Max, Min
+from django.db.models.functions import Trunc
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from apps.health_records.common.rollups import VITAL_SERIES, get_rollup, series_value
+
+BUCKETS = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+    "month": timedelta(days=31),
+}
+MODES = ("buckets", "lttb")
+DEFAULT_POINTS = 200
+MAX_POINTS = 2000
+
+# Names for the two series of two-valued modules
+SERIES_NAMES = {"blood_pressure": ("systolic", "diastolic")}
+UNITS = {"height": "cm", "weight": "kg", "heart_rate": "bpm", "oxygen": "%", "glucose": "mg/dl", "blood_pressure": "mmhg"}
+
+
+def _parse_moment(value, name, end=False):
+    if not value:
+        return None
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValidationError({name: "Use an ISO date or datetime."})
+        # A bare end date includes that whole day
+        moment = datetime.combine(day + timedelta(days=1) if end else day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def parse_params(params):
+    modules = [m.strip() for m in (params.get("modules") or params.get("module") or "").split(",") if m.strip()]
+    if not modules:
+        raise ValidationError({"modules": "Provide one or more of: " + ", ".join(VITAL_SERIES)})
+    unknown = [m for m in modules if m not in VITAL_SERIES]
+    if unknown:
+        raise ValidationError({"modules": f"Unknown module(s): {', '.join(unknown)}"})
+
+    mode = params.get("mode") or "buckets"
+    if mode not in MODES:
+        raise ValidationError({"mode": f"Use one of: {', '.join(MODES)}"})
+    bucket = params.get("bucket") or "auto"
+    if bucket != "auto" and bucket not in BUCKETS:
+        raise ValidationError({"bucket": f"Use auto or one of: {', '.join(BUCKETS)}"})
+
+    try:
+        points = int(params.get("points") or DEFAULT_POINTS)
+    except ValueError:
+        raise ValidationError({"points": "Must be an integer."})
+    points = max(3, min(points, MAX_POINTS))
+
+    start = _parse_moment(params.get("start"), "start")
+    end = _parse_moment(params.get("end"), "end", end=True)
+    return modules, mode, bucket, points, start, end
+
+
+def pick_bucket(start, end, points, smallest="hour"):
+    # Smallest bucket, no finer than `smallest`, that keeps the series within the point budget
+    span = end - start
+    kinds = list(BUCKETS)
+    for kind in kinds[kinds.index(smallest):]:
+        if span / BUCKETS[kind] <= points:
+            return kind
+    return "month"
+
+
+def _points_query(module, user_id, start, end):
+    label, _, _ = VITAL_SERIES[module]
+    records = apps.get_model(label).objects.filter(user_id=user_id, deleted_at__isnull=True)
+    if start:
+        records = records.filter(recorded_at__gte=start)
+    if end:
+        records = records.filter(recorded_at__lt=end)
+    return records
+
+
+def _stats(row, suffix=""):
+    average = row[f"avg{suffix}"]
+    return {
+        "min": row[f"min{suffix}"],
+        "max": row[f"max{suffix}"],
+        "avg": round(average, 2) if average is not None else None,
+    }
+
+
+def bucketed(module, user_id, start, end, bucket):
+    # min/max/avg/count per bucket, grouped in SQL
+    _, field, field_2 = VITAL_SERIES[module]
+    value = series_value(module, field)
+    aggregates = {"count": Count("pk"), "min": Min(value), "max": Max(value), "avg": Avg(value)}
+    if field_2:
+        aggregates.update(min_2=Min(field_2), max_2=Max(field_2), avg_2=Avg(field_2))
+
+    rows = (
+        _points_query(module, user_id, start, end)
+        .annotate(t=Trunc("recorded_at", bucket))
+        .values("t")
+        .annotate(**aggregates)
+        .order_by("t")
+    )
+    points = []
+    for row in rows:
+        point = {"t": row["t"], "count": row["count"]}
+        if field_2:
+            first, second = SERIES_NAMES[module]
+            point[first] = _stats(row)
+            point[second] = _stats(row, "_2")
+        else:
+            point.update(_stats(row))
+        points.append(point)
+    return points
+
+
+def lttb(xs, ys, threshold):
+    # Largest-Triangle-Three-Buckets: indices of `threshold` points that keep the visual shape
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    every = (n - 2) / (threshold - 2)
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third triangle corner
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        size = avg_end - avg_start
+        avg_x = sum(xs[avg_start:avg_end]) / size
+        avg_y = sum(ys[avg_start:avg_end]) / size
+
+        ax, ay = xs[a], ys[a]
+        best, best_area = None, -1.0
+        for j in range(int(i * every) + 1, int((i + 1) * every) + 1):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
+
+
+def downsampled(module, user_id, start, end, points):
+    # Raw readings reduced to the point budget with LTTB (on the first series for two-valued modules)
+    _, field, field_2 = VITAL_SERIES[module]
+    columns = ["recorded_at", series_value(module, field)] + ([field_2] if field_2 else [])
+    rows = list(
+        _points_query(module, user_id, start, end)
+        .order_by("recorded_at", "id")
+        .values_list(*columns)
+        .iterator(chunk_size=5000)
+    )
+    xs = [row[0].timestamp() for row in rows]
+    ys = [float(row[1]) for row in rows]
+
+    result = []
+    for index in lttb(xs, ys, points):
+        row = rows[index]
+        if field_2:
+            first, second = SERIES_NAMES[module]
+            result.append({"t": row[0], first: row[1], second: row[2]})
+        else:
+            result.append({"t": row[0], "value": row[1]})
+    return result
+
+
+def build_series(params, user_id):
+    modules, mode, bucket, points, start, end = parse_params(params)
+
+    series = {}
+    for module in modules:
+        entry = {"unit": UNITS.get(module), "mode": mode}
+        if mode == "lttb":
+            entry["points"] = downsampled(module, user_id, start, end, points)
+        else:
+            # An explicit bucket is a lower bound: coarsened when it would exceed the point budget
+            smallest = "hour" if bucket == "auto" else bucket
+            first_at = start
+            if first_at is None:
+                rollup = get_rollup(module, user_id)
+                first_at = rollup.first_at if rollup else None
+            if first_at is None:
+                kind = "day" if bucket == "auto" else bucket
+            else:
+                kind = pick_bucket(first_at, end or timezone.now(), points, smallest)
+            entry["bucket"] = kind
+            entry["points"] = bucketed(module, user_id, start, end, kind)
+        series[module] = entry
+    return series
@@ -10,6 +10,9 @@ from .views import (
     GlucoseRecordViewSet,
     blood_group,
     health_record_choices,
+    vitals_timeseries,
+    bulk_ingest,
+    latest_vitals,
 )
 router = DefaultRouter()
 router.register(r'height', HeightRecordViewSet, basename='height')
@@ -24,4 +27,7 @@ urlpatterns = [
     path('', include(router.urls)),
     path('choices/', health_record_choices, name='health_record_choices'),
     path("blood-group/", blood_group, name="blood-group"),
+    path("timeseries/", vitals_timeseries, name="vitals-timeseries"),
+    path("bulk/", bulk_ingest, name="vitals-bulk-ingest"),
+    path("latest/", latest_vitals, name="latest-vitals"),
 ]
\ No newline at end of file
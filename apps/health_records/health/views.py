@@ -1,19 +1,26 @@
 from rest_framework import viewsets, permissions
-from rest_framework.decorators import action, api_view
+from rest_framework.decorators import action, api_view, parser_classes
 from rest_framework.response import Response
+from rest_framework import status
+from apps.common.renderers import NDJSONParser, ORJSONParser
+from apps.common.mixins.conditional_get_mixin import ConditionalListMixin
 from apps.common.mixins.save_user_mixin import SaveUserMixin
+from apps.common import metadata
 from apps.accounts.models import UserProfile 
 from .models import (HeightRecord, WeightRecord, 
                      BmiRecord, BloodPressureRecord, 
                      HeartRateRecord, OxygenSaturationRecord,
                      GlucoseRecord)
+from .latest import get_latest_vitals
+from .ingest import MAX_READINGS, TooManyReadings, decode_rows, ingest
+from .timeseries import build_series
 from .serializers import (HeightRecordSerializer, WeightRecordSerializer, 
                           BmiRecordSerializer, BloodPressureRecordSerializer, 
                           HeartRateRecordSerializer, OxygenSaturationRecordSerializer,
                           GlucoseRecordSerializer)
 
 
-class HeightRecordViewSet(SaveUserMixin, viewsets.ModelViewSet):
+class HeightRecordViewSet(ConditionalListMixin, SaveUserMixin, viewsets.ModelViewSet):
     serializer_class = HeightRecordSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -25,13 +32,12 @@ class HeightRecordViewSet(SaveUserMixin, viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get"])
     def latest(self, request):
-        record = self.get_queryset().order_by("-updated_at").first()
+        record = get_latest_vitals(request.user.pk).get("height")
         if record:
-            serializer = self.get_serializer(record)
-            return Response(serializer.data)
+            return Response(record)
         return Response({"detail": "No height record found."}, status=404)
 
-class WeightRecordViewSet(SaveUserMixin, viewsets.ModelViewSet):
+class WeightRecordViewSet(ConditionalListMixin, SaveUserMixin, viewsets.ModelViewSet):
     serializer_class = WeightRecordSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -43,13 +49,12 @@ class WeightRecordViewSet(SaveUserMixin, viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get"])
     def latest(self, request):
-        record = self.get_queryset().order_by("-updated_at").first()
+        record = get_latest_vitals(request.user.pk).get("weight")
         if record:
-            serializer = self.get_serializer(record)
-            return Response(serializer.data)
+            return Response(record)
         return Response({"detail": "No weight record found."}, status=404)
     
-class BmiRecordViewSet(SaveUserMixin, viewsets.ModelViewSet):
+class BmiRecordViewSet(ConditionalListMixin, SaveUserMixin, viewsets.ModelViewSet):
     serializer_class = BmiRecordSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -61,13 +66,12 @@ class BmiRecordViewSet(SaveUserMixin, viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get"])
     def latest(self, request):
-        record = self.get_queryset().order_by("-updated_at").first()
+        record = get_latest_vitals(request.user.pk).get("bmi")
         if record:
-            serializer = self.get_serializer(record)
-            return Response(serializer.data)
+            return Response(record)
         return Response({"detail": "No BMI record found."}, status=404)
     
-class BloodPressureRecordViewSet(SaveUserMixin, viewsets.ModelViewSet):
+class BloodPressureRecordViewSet(ConditionalListMixin, SaveUserMixin, viewsets.ModelViewSet):
     serializer_class = BloodPressureRecordSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -79,13 +83,12 @@ class BloodPressureRecordViewSet(SaveUserMixin, viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get"])
     def latest(self, request):
-        record = self.get_queryset().order_by("-updated_at").first()
+        record = get_latest_vitals(request.user.pk).get("blood_pressure")
         if record:
-            serializer = self.get_serializer(record)
-            return Response(serializer.data)
+            return Response(record)
         return Response({"detail": "No blood pressure record found."}, status=404)
     
-class HeartRateRecordViewSet(SaveUserMixin, viewsets.ModelViewSet):
+class HeartRateRecordViewSet(ConditionalListMixin, SaveUserMixin, viewsets.ModelViewSet):
     serializer_class = HeartRateRecordSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -97,13 +100,12 @@ class HeartRateRecordViewSet(SaveUserMixin, viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get"])
     def latest(self, request):
-        record = self.get_queryset().order_by("-updated_at").first()
+        record = get_latest_vitals(request.user.pk).get("heart_rate")
         if record:
-            serializer = self.get_serializer(record)
-            return Response(serializer.data)
+            return Response(record)
         return Response({"detail": "No heart rate record found."}, status=404)
     
-class OxygenSaturationRecordViewSet(SaveUserMixin, viewsets.ModelViewSet):
+class OxygenSaturationRecordViewSet(ConditionalListMixin, SaveUserMixin, viewsets.ModelViewSet):
     serializer_class = OxygenSaturationRecordSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -115,13 +117,12 @@ class OxygenSaturationRecordViewSet(SaveUserMixin, viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get"])
     def latest(self, request):
-        record = self.get_queryset().order_by("-updated_at").first()
+        record = get_latest_vitals(request.user.pk).get("oxygen")
         if record:
-            serializer = self.get_serializer(record)
-            return Response(serializer.data)
+            return Response(record)
         return Response({"detail": "No O₂ saturation record found."}, status=404)
     
-class GlucoseRecordViewSet(SaveUserMixin, viewsets.ModelViewSet):
+class GlucoseRecordViewSet(ConditionalListMixin, SaveUserMixin, viewsets.ModelViewSet):
     serializer_class = GlucoseRecordSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -133,10 +134,9 @@ class GlucoseRecordViewSet(SaveUserMixin, viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get"])
     def latest(self, request):
-        record = self.get_queryset().order_by("-updated_at").first()
+        record = get_latest_vitals(request.user.pk).get("glucose")
         if record:
-            serializer = self.get_serializer(record)
-            return Response(serializer.data)
+            return Response(record)
         return Response({"detail": "No glucose record found."}, status=404)
     
 @api_view(["GET"])
@@ -151,15 +151,39 @@ def blood_group(request):
     
 @api_view(["GET"])
 def health_record_choices(request):
-    data = {
-        "height_units": dict(HeightRecord.UNIT_CHOICES),
-        "weight_units": dict(WeightRecord.UNIT_CHOICES),
-        "blood_pressure_units": dict(BloodPressureRecord.UNIT_CHOICES),
-        "blood_pressure_types": dict(BloodPressureRecord.TYPE_CHOICES),
-        "bmi_units": dict(BmiRecord.UNIT_CHOICES),
-        "heart_rate_units": dict(HeartRateRecord.UNIT_CHOICES),
-        "oxygen_saturation_units": dict(OxygenSaturationRecord.UNIT_CHOICES),
-        "glucose_units": dict(GlucoseRecord.UNIT_CHOICES),
-        "glucose_test_types": dict(GlucoseRecord.TYPE_CHOICES),
-    }
-    return Response(data)
\ No newline at end of file
+    return Response(metadata.section("health_records"))
+
+
+@api_view(["GET"])
+def vitals_timeseries(request):
+    # Chart data for one or more vitals modules (?modules=heart_rate,glucose), either bucketed
+    # min/max/avg/count (?bucket=hour|day|week|month|auto) or LTTB-downsampled (?mode=lttb&points=).
+    # Either way the response stays within ?points=: a bucket too fine for the range is coarsened
+    # (the bucket actually used is returned per series)
+    return Response({"series": build_series(request.query_params, request.user.pk)})
+
+
+@api_view(["GET"])
+def latest_vitals(request):
+    # Newest reading of every vitals module in one query, for the home screen
+    return Response({"vitals": get_latest_vitals(request.user.pk)})
+
+
+@api_view(["POST"])
+@parser_classes([ORJSONParser, NDJSONParser])
+def bulk_ingest(request):
+    # Batch upload for wearables/device sync: a JSON array (or {"readings": [...]}) or NDJSON, each
+    # reading {"module", "recorded_at", "value" | "systolic"/"diastolic", "unit", ...}.
+    # Valid rows are stored even when others fail; failures come back by index.
+    try:
+        rows = decode_rows(request.data)
+    except TooManyReadings:
+        return Response(
+            {"detail": f"At most {MAX_READINGS} readings per request."},
+            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        )
+
+    result = ingest(request.user, rows)
+    if result["errors"] and not any(result["created"].values()) and not result["duplicates"]:
+        return Response(result, status=status.HTTP_400_BAD_REQUEST)
+    return Response(result)
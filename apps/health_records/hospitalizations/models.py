@@ -1,10 +1,13 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.conf import settings
 from apps.common.models import BaseModel
+from apps.health_records.common.models import SearchTextMixin
 from apps.dependants.models import Dependant
 
 
-class HospitalizationRecord(BaseModel):
+class HospitalizationRecord(SearchTextMixin, BaseModel):
+    search_fields = ("record_name", "doctor_name", "hospital_name", "notes")
 
     HOSPITALIZATION_TYPE_CHOICES = (
         ("inpatient", "Inpatient"),
@@ -45,6 +48,13 @@ class HospitalizationRecord(BaseModel):
     doctor_name = models.CharField(max_length=255, blank=True, null=True)
 
     notes = models.TextField(blank=True, null=True)
+    # search_fields joined, for record search (see search.py)
+    search_text = models.TextField(blank=True, default="", editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_text"], name="hospitalization_search_trgm_idx", opclasses=["gin_trgm_ops"]),
+        ]
 
     def __str__(self):
         return f"{self.record_name} ({self.get_hospitalization_type_display()})"
@@ -2,14 +2,17 @@ import json
 from django.utils import timezone
 from django.db import transaction
 from rest_framework import viewsets, permissions, status
-from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.parsers import MultiPartParser, FormParser
+from apps.common.renderers import ORJSONParser
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError
 from django.shortcuts import get_object_or_404
 from rest_framework.decorators import action
+from apps.common.mixins.conditional_get_mixin import ConditionalListMixin
 from apps.common.mixins.save_user_mixin import SaveUserMixin
 from apps.dependants.models import Dependant
 from apps.common.utils.profile_helper import filter_by_effective_user
+from apps.common import metadata
 from .models import HospitalizationRecord, HospitalizationDocument
 from .serializers import (
     HospitalizationRecordSerializer,
@@ -17,10 +20,11 @@ from .serializers import (
     HospitalizationDocumentSerializer,
 )
 
-class HospitalizationRecordViewSet(SaveUserMixin, viewsets.ModelViewSet):
+class HospitalizationRecordViewSet(ConditionalListMixin, SaveUserMixin, viewsets.ModelViewSet):
+    conditional_related = ("documents",)
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = HospitalizationRecordSerializer
-    parser_classes = [MultiPartParser, FormParser, JSONParser]
+    parser_classes = [MultiPartParser, FormParser, ORJSONParser]
 
     def get_queryset(self):
         queryset = HospitalizationRecord.objects.filter(
@@ -220,4 +224,4 @@ class HospitalizationRecordViewSet(SaveUserMixin, viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get"])
     def choices(self, request):
-        return Response(dict(HospitalizationRecord.HOSPITALIZATION_TYPE_CHOICES))
+        return Response(metadata.section("hospitalization_types"))
@@ -0,0 +1,27 @@
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+# Same lower-cased text SearchTextMixin.save builds; concat_ws skips the NULLs
+BACKFILL = "UPDATE medical_bills_medicalbillrecord SET search_text = lower(concat_ws(' ', NULLIF(btrim(record_name), ''), NULLIF(btrim(record_hospital_name), ''), NULLIF(btrim(notes), '')))"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('medical_bills', '0001_initial'),
+        # Creates the pg_trgm extension
+        ('doctor_details', '0005_doctor_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='medicalbillrecord',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunSQL(BACKFILL, migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name='medicalbillrecord',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_text'], name='medical_bill_search_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
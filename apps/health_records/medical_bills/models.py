@@ -1,10 +1,13 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.conf import settings
 from apps.common.models import BaseModel
+from apps.health_records.common.models import SearchTextMixin
 from apps.dependants.models import Dependant
 
 
-class MedicalBillRecord(BaseModel):
+class MedicalBillRecord(SearchTextMixin, BaseModel):
+    search_fields = ("record_name", "record_hospital_name", "notes")
 
     MEDICAL_BILL_TYPE_CHOICES = (
         ("consultation", "Consultation Bill"),
@@ -45,6 +48,13 @@ class MedicalBillRecord(BaseModel):
     bill_type = models.CharField(max_length=30, choices=MEDICAL_BILL_TYPE_CHOICES)
 
     notes = models.TextField(blank=True, null=True)
+    # search_fields joined, for record search (see search.py)
+    search_text = models.TextField(blank=True, default="", editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_text"], name="medical_bill_search_trgm_idx", opclasses=["gin_trgm_ops"]),
+        ]
 
     def __str__(self):
         return f"{self.record_name} ({self.get_bill_type_display()})"
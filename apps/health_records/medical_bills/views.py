@@ -3,21 +3,25 @@ from django.utils import timezone
 from django.db import transaction
 from rest_framework import viewsets, permissions, status
 from rest_framework.exceptions import ValidationError
-from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.parsers import MultiPartParser, FormParser
+from apps.common.renderers import ORJSONParser
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from django.shortcuts import get_object_or_404
 from apps.dependants.models import Dependant
+from apps.common.mixins.conditional_get_mixin import ConditionalListMixin
 from apps.common.mixins.save_user_mixin import SaveUserMixin
 from apps.common.utils.profile_helper import filter_by_effective_user
+from apps.common import metadata
 from .models import MedicalBillRecord, MedicalBillDocument
 from .serializers import MedicalBillRecordSerializer, MedicalBillPayloadSerializer, MedicalBillDocumentSerializer
 
 
-class MedicalBillRecordViewSet(SaveUserMixin, viewsets.ModelViewSet):
+class MedicalBillRecordViewSet(ConditionalListMixin, SaveUserMixin, viewsets.ModelViewSet):
+    conditional_related = ("documents",)
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = MedicalBillRecordSerializer
-    parser_classes = [MultiPartParser, FormParser, JSONParser]
+    parser_classes = [MultiPartParser, FormParser, ORJSONParser]
 
     def get_queryset(self):
         queryset = MedicalBillRecord.objects.filter(
@@ -211,4 +215,4 @@ class MedicalBillRecordViewSet(SaveUserMixin, viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get"])
     def choices(self, request):
-        return Response(dict(MedicalBillRecord.MEDICAL_BILL_TYPE_CHOICES))
+        return Response(metadata.section("medical_bill_types"))
@@ -6,9 +6,12 @@ from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError
 from rest_framework.decorators import action
-from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.parsers import MultiPartParser, FormParser
+from apps.common.renderers import ORJSONParser
 
+from apps.common.mixins.conditional_get_mixin import ConditionalListMixin
 from apps.common.mixins.save_user_mixin import SaveUserMixin
+from apps.common import metadata
 from .models import MedicineReminder, MedicineReminderTime, MedicineReminderDocument
 from .serializers import (
     MedicineReminderSerializer,
@@ -17,10 +20,11 @@ from .serializers import (
 )
 
 
-class MedicineReminderViewSet(SaveUserMixin, viewsets.ModelViewSet):
+class MedicineReminderViewSet(ConditionalListMixin, SaveUserMixin, viewsets.ModelViewSet):
+    conditional_related = ("schedule_times", "documents")
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = MedicineReminderSerializer
-    parser_classes = [MultiPartParser, FormParser, JSONParser]
+    parser_classes = [MultiPartParser, FormParser, ORJSONParser]
 
     def get_queryset(self):
         qs = MedicineReminder.objects.filter(
@@ -225,12 +229,4 @@ class MedicineReminderViewSet(SaveUserMixin, viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get"])
     def choices(self, request):
-        return Response({
-            "medicine_type": dict(MedicineReminder.MEDICINE_TYPE_CHOICES),
-            "frequency_type": dict(MedicineReminder.FREQUENCY_TYPE_CHOICES),
-            "intake_frequency": dict(MedicineReminder.INTAKE_FREQUENCY_CHOICES),
-            "interval_type": dict(MedicineReminder.INTERVAL_TYPE_CHOICES),
-            "duration_unit": dict(MedicineReminder.DURATION_UNIT_CHOICES),
-            "dosage_unit": dict(MedicineReminder.DOSAGE_UNIT_CHOICES),
-            "meal_relation": dict(MedicineReminder.MEAL_RELATION_CHOICES),
-        })
+        return Response(metadata.section("medicine_reminders"))
@@ -1,11 +1,14 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.conf import settings
 from apps.common.models import BaseModel
+from apps.health_records.common.models import SearchTextMixin
 from apps.dependants.models import Dependant
 from apps.consultation_filter.models import DoctorSpeciality
 
 
-class PrescriptionRecord(BaseModel):
+class PrescriptionRecord(SearchTextMixin, BaseModel):
+    search_fields = ("record_name", "doctor_name", "reason")
 
     PRESCRIPTION_TYPE_CHOICES = (
         ("health_record", "Health Record"),
@@ -48,6 +51,13 @@ class PrescriptionRecord(BaseModel):
 
     record_date = models.DateField()
     reason = models.TextField(blank=True, null=True)
+    # search_fields joined, for record search (see search.py)
+    search_text = models.TextField(blank=True, default="", editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_text"], name="prescription_search_trgm_idx", opclasses=["gin_trgm_ops"]),
+        ]
 
     def __str__(self):
         return f"{self.record_name} ({self.get_record_type_display()})"
@@ -1,7 +1,8 @@
 import json
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action, parser_classes
-from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.parsers import MultiPartParser, FormParser
+from apps.common.renderers import ORJSONParser
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError
 from django.shortcuts import get_object_or_404
@@ -17,13 +18,16 @@ from .serializers import (
     PrescriptionParameterSerializer,
     PrescriptionDocumentSerializer
 )
+from apps.common.mixins.conditional_get_mixin import ConditionalListMixin
 from apps.common.mixins.save_user_mixin import SaveUserMixin
+from apps.common import metadata
 
 
-class PrescriptionRecordViewSet(SaveUserMixin, viewsets.ModelViewSet):
+class PrescriptionRecordViewSet(ConditionalListMixin, SaveUserMixin, viewsets.ModelViewSet):
+    conditional_related = ("parameters", "documents")
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = PrescriptionRecordSerializer
-    parser_classes = [MultiPartParser, FormParser, JSONParser]
+    parser_classes = [MultiPartParser, FormParser, ORJSONParser]
 
     def get_queryset(self):
         queryset = PrescriptionRecord.objects.filter(
@@ -328,16 +332,9 @@ class PrescriptionRecordViewSet(SaveUserMixin, viewsets.ModelViewSet):
     @action(detail=False, methods=["get"])
     def prescription_type_choices(self, request):
         # Get available prescription type choices
-        return Response(dict(PrescriptionRecord.PRESCRIPTION_TYPE_CHOICES))
+        return Response(metadata.section("prescription_types"))
 
     @action(detail=False, methods=["get"])
     def doctor_specializations(self, request):
         # Get list of active doctor specializations
-        from apps.consultation_filter.models import DoctorSpeciality
-        from apps.consultation_filter.serializers import DoctorSpecialitySerializer
-
-        data = DoctorSpecialitySerializer(
-            DoctorSpeciality.objects.filter(is_active=True),
-            many=True
-        ).data
-        return Response(data)
\ No newline at end of file
+        return Response(metadata.specializations())
\ No newline at end of file
@@ -0,0 +1,27 @@
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+# Same lower-cased text SearchTextMixin.save builds; concat_ws skips the NULLs
+BACKFILL = "UPDATE vaccination_certificates_vaccinationcertificaterecord SET search_text = lower(concat_ws(' ', NULLIF(btrim(vaccination_name), ''), NULLIF(btrim(vaccination_center), ''), NULLIF(btrim(notes), '')))"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vaccination_certificates', '0001_initial'),
+        # Creates the pg_trgm extension
+        ('doctor_details', '0005_doctor_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vaccinationcertificaterecord',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunSQL(BACKFILL, migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name='vaccinationcertificaterecord',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_text'], name='vaccination_search_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -1,10 +1,13 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.conf import settings
 from apps.common.models import BaseModel
+from apps.health_records.common.models import SearchTextMixin
 from apps.dependants.models import Dependant
 
 
-class VaccinationCertificateRecord(BaseModel):
+class VaccinationCertificateRecord(SearchTextMixin, BaseModel):
+    search_fields = ("vaccination_name", "vaccination_center", "notes")
     
     VACCINE_TYPE_CHOICES = (
         ("covid", "COVID-19 Vaccine"),
@@ -45,6 +48,13 @@ class VaccinationCertificateRecord(BaseModel):
     registration_id = models.CharField(max_length=255, blank=True, null=True)
 
     notes = models.TextField(blank=True, null=True)
+    # search_fields joined, for record search (see search.py)
+    search_text = models.TextField(blank=True, default="", editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_text"], name="vaccination_search_trgm_idx", opclasses=["gin_trgm_ops"]),
+        ]
 
     def __str__(self):
         return f"{self.vaccination_name} - {self.vaccination_dose}"
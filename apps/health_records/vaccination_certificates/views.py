@@ -3,14 +3,17 @@ from django.utils import timezone
 from django.db import transaction
 from django.shortcuts import get_object_or_404
 from rest_framework import viewsets, permissions, status
-from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.parsers import MultiPartParser, FormParser
+from apps.common.renderers import ORJSONParser
 from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.decorators import action
 
+from apps.common.mixins.conditional_get_mixin import ConditionalListMixin
 from apps.common.mixins.save_user_mixin import SaveUserMixin
 from apps.dependants.models import Dependant
 from apps.common.utils.profile_helper import filter_by_effective_user
+from apps.common import metadata
 from .models import VaccinationCertificateRecord, VaccinationCertificateDocument
 from .serializers import (
     VaccinationCertificateRecordSerializer,
@@ -19,10 +22,11 @@ from .serializers import (
 )
 
 
-class VaccinationCertificateRecordViewSet(SaveUserMixin, viewsets.ModelViewSet):
+class VaccinationCertificateRecordViewSet(ConditionalListMixin, SaveUserMixin, viewsets.ModelViewSet):
+    conditional_related = ("documents",)
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = VaccinationCertificateRecordSerializer
-    parser_classes = [MultiPartParser, FormParser, JSONParser]
+    parser_classes = [MultiPartParser, FormParser, ORJSONParser]
 
     def get_queryset(self):
         queryset = VaccinationCertificateRecord.objects.filter(
@@ -187,4 +191,4 @@ class VaccinationCertificateRecordViewSet(SaveUserMixin, viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get"])
     def choices(self, request):
-        return Response(dict(VaccinationCertificateRecord.VACCINE_TYPE_CHOICES))
\ No newline at end of file
+        return Response(metadata.section("vaccine_types"))
\ No newline at end of file
@@ -4,13 +4,17 @@ from django.db import transaction
 from django.shortcuts import get_object_or_404
 
 from rest_framework import viewsets, permissions, status
-from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.parsers import MultiPartParser, FormParser
+from apps.common.renderers import ORJSONParser
 from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.decorators import action
 
+from apps.common.mixins.conditional_get_mixin import ConditionalListMixin
 from apps.common.mixins.save_user_mixin import SaveUserMixin
 from apps.common.utils.profile_helper import filter_by_effective_user
+from apps.health_records.common.document_pipeline import deliver_document
+from apps.common import metadata
 from apps.dependants.models import Dependant
 
 from .models import (
@@ -28,10 +32,11 @@ from .serializers import (
 )
 
 
-class InsurancePolicyRecordViewSet(SaveUserMixin, viewsets.ModelViewSet):
+class InsurancePolicyRecordViewSet(ConditionalListMixin, SaveUserMixin, viewsets.ModelViewSet):
+    conditional_related = ("floater_members", "documents")
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = InsurancePolicyRecordSerializer
-    parser_classes = [MultiPartParser, FormParser, JSONParser]
+    parser_classes = [MultiPartParser, FormParser, ORJSONParser]
 
     # Queryset
     def get_queryset(self):
@@ -281,16 +286,23 @@ class InsurancePolicyRecordViewSet(SaveUserMixin, viewsets.ModelViewSet):
         document.delete()
         return Response({"message": "Document deleted successfully"})
 
+    # DOCUMENT DOWNLOAD
+    @action(detail=True, methods=["get"], url_path=r"documents/(?P<document_id>\d+)/download")
+    def download_document(self, request, pk=None, document_id=None):
+        policy = self.get_object()
+
+        document = get_object_or_404(
+            InsurancePolicyDocument,
+            id=document_id,
+            policy=policy,
+            deleted_at__isnull=True
+        )
+        return deliver_document(request, document)
+
     # CHOICES
     @action(detail=False, methods=["get"])
     def choices(self, request):
-        return Response({
-            "policy_owner_type": dict(InsurancePolicyRecord.POLICY_OWNER_CHOICES),
-            "plan_type": dict(InsurancePolicyRecord.PLAN_TYPE_CHOICES),
-            "type_of_insurance": dict(InsurancePolicyRecord.TYPE_OF_INSURANCE_CHOICES),
-            "renewal_frequency": dict(InsurancePolicyRecord.RENEWAL_FREQUENCY_CHOICES),
-            "renewal_reminder_type": dict(InsurancePolicyRecord.REMINDER_TYPE_CHOICES),
-        })
+        return Response(metadata.section("insurance_records"))
 
     @action(detail=False, methods=["get"], url_path="medical_cards")
     def medical_cards(self, request):
@@ -3,6 +3,7 @@ from apps.common.models import BaseModel
 
 class VisitType(BaseModel):
     name = models.CharField(max_length=50, unique=True)
+    external_id = models.CharField(max_length=50, blank=True, null=True, unique=True)
 
     def __str__(self):
         return self.name
@@ -5,10 +5,13 @@ from django.conf import settings
 from .models import VisitType
 from .serializers import VisitTypeSerializer
 import requests
+from apps.common.utils.catalog_cache import get_catalog, catalog_mirrored
+from apps.common.pagination import OptionalPageNumberPagination
 from rest_framework.generics import ListAPIView
 from django.db.models import Min, Max
 from apps.diagnostic_center.models import DiagnosticCenter
 from apps.diagnostic_center.serializers import DiagnosticCenterSerializer
+from apps.diagnostic_center.basket import match_basket, parse_ids
 
 class VisitTypeViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
@@ -19,16 +22,9 @@ class VisitTypeViewSet(viewsets.ModelViewSet):
         #Return list of visit types.
         client_api_url = getattr(settings, "CLIENT_VISIT_TYPE_API_URL", None)
 
-        if client_api_url:
+        if client_api_url and not catalog_mirrored():
             try:
-                headers = {}
-                client_api_token = getattr(settings, "CLIENT_API_TOKEN", None)
-                if client_api_token:
-                    headers["Authorization"] = f"Bearer {client_api_token}"
-
-                response = requests.get(client_api_url, headers=headers, timeout=10)
-                response.raise_for_status()
-                data = response.json()
+                data = get_catalog("visit_types")
 
                 formatted_data = [
                     {
@@ -88,25 +84,29 @@ class DiagnosticCenterFilterAPIView(ListAPIView):
             queryset = queryset.filter(name__icontains=name)
 
         if visit_type:
-            queryset = queryset.filter(visit_types__id=visit_type)
+            # Subquery rather than a join so basket aggregates aren't multiplied
+            queryset = queryset.filter(
+                id__in=DiagnosticCenter.visit_types.through.objects.filter(
+                    visittype_id=visit_type
+                ).values("diagnosticcenter_id")
+            )
 
-        if test_ids:
-            # Assume test_ids is a comma-separated string of IDs
-            try:
-                id_list = [id.strip() for id in test_ids.split(",") if id.strip()]
-                if id_list:
-                    # Filter DCs that have ALL of the selected tests
-                    for tid in id_list:
-                        queryset = queryset.filter(tests__id=tid)
-            except ValueError:
-                pass
+        # Comma-separated test IDs; "match=partial" also returns centers covering part of the basket
+        id_list = parse_ids(test_ids)
+        if id_list:
+            partial = self.request.query_params.get("match") == "partial"
+            queryset = match_basket(queryset, id_list, partial=partial)
 
         # Sorting by price
         if sort_price:
-            if sort_price.lower() == "low":
+            if id_list:
+                direction = "" if sort_price.lower() == "low" else "-"
+                queryset = queryset.order_by("-matched_tests", f"{direction}basket_price", "id")
+            elif sort_price.lower() == "low":
                 queryset = queryset.annotate(min_price=Min("tests__price")).order_by("min_price")
             elif sort_price.lower() == "high":
                 queryset = queryset.annotate(max_price=Max("tests__price")).order_by("-max_price")
 
-        queryset = queryset.distinct()
-        return queryset
\ No newline at end of file
+        return queryset.select_related("city").prefetch_related(
+            "tests", "visit_types", "health_packages", "sponsored_packages"
+        )
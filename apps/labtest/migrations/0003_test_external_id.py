@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('labtest', '0002_remove_test_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='test',
+            name='external_id',
+            field=models.CharField(blank=True, max_length=50, null=True, unique=True),
+        ),
+    ]
@@ -12,6 +12,7 @@ class Test(BaseModel):
     description = models.TextField(blank=True, null=True)
     price = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
     active = models.BooleanField(default=True)
+    external_id = models.CharField(max_length=50, blank=True, null=True, unique=True)
     # status=models.CharField(max_length =50, blank=True, null=True)
 
     def __str__(self):
@@ -4,6 +4,11 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.conf import settings
 import requests
+from apps.common.utils.catalog_cache import get_catalog, catalog_mirrored
+from apps.common.pagination import OptionalPageNumberPagination
+from apps.common.utils.conditional import conditional_get
+from apps.common.utils.tiered_cache import cache_response
+from django.db.models import Q
 from apps.location.models import City 
 
 from .models import Test
@@ -13,22 +18,18 @@ class TestViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     queryset = Test.objects.filter(deleted_at__isnull=True)
     serializer_class = TestSerializer
+    pagination_class = OptionalPageNumberPagination
 
+    @conditional_get(tags=("tests",))
+    @cache_response("tests", tags=("tests",))
     def list(self, request):
         # Return list of tests (from external API or local DB).
         client_api_url = getattr(settings, "CLIENT_TEST_API_URL", None)
 
         # Optional: Fetch from Client API
-        if client_api_url:
+        if client_api_url and not catalog_mirrored():
             try:
-                headers = {}
-                client_api_token = getattr(settings, "CLIENT_API_TOKEN", None)
-                if client_api_token:
-                    headers["Authorization"] = f"Bearer {client_api_token}"
-
-                response = requests.get(client_api_url, headers=headers, timeout=10)
-                response.raise_for_status()
-                data = response.json()
+                data = get_catalog("tests")
 
                 formatted_data = [
                     {
@@ -48,8 +49,16 @@ class TestViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_502_BAD_GATEWAY,
                 )
 
-        # Local DB Data
+        # Local DB Data (kept in sync with the client catalog)
         queryset = self.get_queryset().order_by("id")
+
+        search = request.query_params.get("search")
+        if search:
+            queryset = queryset.filter(Q(name__icontains=search) | Q(code__iexact=search))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(TestSerializer(page, many=True).data)
         serializer = TestSerializer(queryset, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -0,0 +1,53 @@
+import csv
+from decimal import Decimal, InvalidOperation
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.location.models import City, PincodeCentroid
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = "Load pincode centroids from a CSV with pincode, latitude, longitude and optional city columns."
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_path")
+
+    def handle(self, *args, **options):
+        cities = {}
+        for city_id, name in City.objects.filter(deleted_at__isnull=True).values_list("id", "name"):
+            cities.setdefault(name.lower(), city_id)
+
+        rows, skipped = {}, 0
+        try:
+            with open(options["csv_path"], newline="", encoding="utf-8") as fh:
+                for record in csv.DictReader(fh):
+                    pincode = (record.get("pincode") or "").strip()
+                    try:
+                        latitude = Decimal(record["latitude"]).quantize(Decimal("0.000001"))
+                        longitude = Decimal(record["longitude"]).quantize(Decimal("0.000001"))
+                    except (KeyError, TypeError, InvalidOperation):
+                        skipped += 1
+                        continue
+                    if len(pincode) != 6 or not pincode.isdigit():
+                        skipped += 1
+                        continue
+                    city = (record.get("city") or "").strip().lower()
+                    rows[pincode] = PincodeCentroid(
+                        pincode=pincode,
+                        latitude=latitude,
+                        longitude=longitude,
+                        city_id=cities.get(city),
+                    )
+        except OSError as e:
+            raise CommandError(str(e))
+
+        PincodeCentroid.objects.bulk_create(
+            rows.values(),
+            batch_size=BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["pincode"],
+            update_fields=["latitude", "longitude", "city"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Loaded {len(rows)} pincode centroids ({skipped} skipped)."))
@@ -24,3 +24,15 @@ class City(BaseModel):
 
     def __str__(self):
         return f"{self.name}, {self.state.name}"
+
+
+
+class PincodeCentroid(models.Model):
+    # Approximate centre of a postal pincode, used to turn a pincode into a search point
+    pincode = models.CharField(max_length=6, unique=True)
+    latitude = models.DecimalField(max_digits=9, decimal_places=6)
+    longitude = models.DecimalField(max_digits=9, decimal_places=6)
+    city = models.ForeignKey(City, on_delete=models.SET_NULL, null=True, blank=True, related_name="pincode_centroids")
+
+    def __str__(self):
+        return self.pincode
@@ -7,6 +7,8 @@ from django.utils import timezone
 from .models import State, City
 from .serializers import StateSerializer, CitySerializer
 from apps.common.permissions import ReadOnlyOrAuthenticated
+from apps.common.utils.conditional import conditional_get
+from apps.common.utils.tiered_cache import cache_response
 
 
 class StateViewSet(viewsets.ModelViewSet):
@@ -17,6 +19,11 @@ class StateViewSet(viewsets.ModelViewSet):
     filterset_fields = ['is_active']
     search_fields = ['name']
 
+    @conditional_get(tags=("states",))
+    @cache_response("states", tags=("states",))
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         serializer.save(
             created_by=self.request.user,
@@ -43,6 +50,11 @@ class CityViewSet(viewsets.ModelViewSet):
     filterset_fields = ['is_active', 'state']
     search_fields = ['name', 'state__name']
 
+    @conditional_get(tags=("cities", "states"))
+    @cache_response("cities", tags=("cities", "states"))
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         serializer.save(
             created_by=self.request.user,
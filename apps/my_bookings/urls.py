@@ -29,7 +29,8 @@ from .views import (
     SponsoredPackageVoucherView,
     HealthPackageVoucherView,
     PharmacyOrderVoucherPDFSimpleView,
-    MedicalReportUploadReportView
+    MedicalReportUploadReportView,
+    MedicalReportDownloadView,
     
 )
 
@@ -40,6 +41,7 @@ urlpatterns = [
     # path('appointments/<int:pk>/prescription/', AppointmentPrescriptionDownloadView.as_view(), name='appointment-prescription'),
     # path('appointments/<int:pk>/invoice/', AppointmentInvoiceDownloadView.as_view(), name='appointment-invoice'),
     path('appointments/<int:pk>/upload-report/', MedicalReportUploadReportView.as_view(), name='appointment-upload-report'),
+    path('appointments/<int:pk>/reports/<int:report_id>/download/', MedicalReportDownloadView.as_view(), name='appointment-report-download'),
 
 
     # pharmacy
@@ -4,6 +4,8 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import viewsets
 from apps.common.utils.profile_helper import filter_by_effective_user
+from apps.common.utils.file_delivery import deliver_file
+from apps.health_records.common.document_pipeline import deliver_document
 from rest_framework.views import APIView
 from rest_framework import status as http_status
 from django.shortcuts import get_object_or_404
@@ -381,6 +383,21 @@ class MedicalReportUploadReportView(APIView):
         })
 
 
+class MedicalReportDownloadView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk, report_id):
+        report = get_object_or_404(
+            MedicalReports,
+            id=report_id,
+            appointment__id=pk,
+            appointment__user=request.user,
+        )
+        if not report.file:
+            raise Http404('Report not available')
+        return deliver_document(request, report)
+
+
 # PHARMACY ORDER
 
 
@@ -397,7 +414,12 @@ class PharmacyOrderPrescriptionDownloadView(APIView):
         order = get_object_or_404(PharmacyOrder, pk=pk, user=request.user)
         if not order.prescription_file:
             raise Http404('Prescription not available')
-        return FileResponse(order.prescription_file.open('rb'), filename=f'pharmacy_{order.order_id}_prescription.pdf')
+        return deliver_file(
+            request,
+            order.prescription_file,
+            filename=f'pharmacy_{order.order_id}_prescription.pdf',
+            as_attachment=False,
+        )
 
 # class PharmacyOrderInvoiceDownloadView(APIView):
 #     def get(self, request, pk):
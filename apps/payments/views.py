@@ -1,6 +1,5 @@
 # apps/payments/views.py
 
-import razorpay
 from decimal import Decimal
 from django.conf import settings
 from rest_framework.views import APIView
@@ -12,6 +11,7 @@ from apps.appointments.models import Cart
 from apps.appointments.models import Appointment as AppointmentModel, AppointmentItem
 
 from django.views.generic import TemplateView
+from apps.common.utils.http_client import razorpay_client
 
 class CreateRazorpayOrderAPIView(APIView):
     permission_classes = [IsAuthenticated]
@@ -28,9 +28,7 @@ class CreateRazorpayOrderAPIView(APIView):
         final_amount = sum(Decimal(str(item.final_price or 0)) for item in items)
         amount_paise = int(final_amount * 100)   # Razorpay expects paise
 
-        client = razorpay.Client(
-            auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET)
-        )
+        client = razorpay_client()
 
         # Create Order
         order = client.order.create({
@@ -62,9 +60,7 @@ class RazorpayVerifyPaymentAPIView(APIView):
         if not all([payment_id, order_id, signature]):
             return Response({"detail": "Missing fields"}, status=400)
 
-        client = razorpay.Client(
-            auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET)
-        )
+        client = razorpay_client()
 
         # Verify Razorpay signature
         try:
@@ -1,9 +1,10 @@
-import requests
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from django.core.cache import cache
 from django.conf import settings
 
+from apps.common.utils import http_client
+
 PINCODE_CACHE_KEY = "client_pincodes_zones"
 PINCODE_CACHE_TIMEOUT = 86400  # 24 hours
 
@@ -17,7 +18,7 @@ def get_pincode_zone(pincode):
     if not zone_data:
         try:
             url = settings.CLIENT_PINCODE_URL
-            res = requests.get(url, timeout=5)
+            res = http_client.get(url, timeout=5)
 
             if res.status_code == 200:
                 zone_data = res.json()         # [{pincode, zone}, ...]
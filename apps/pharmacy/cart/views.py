@@ -11,8 +11,7 @@ from apps.addresses.models import Address , AddressType
 from apps.addresses.serializers import AddressSerializer,AddressTypeSerializer
 from apps.pharmacy.cart.utils import estimate_delivery_date
 from rest_framework.parsers import MultiPartParser, FormParser
-from django.http import FileResponse
-import mimetypes
+from apps.health_records.common.document_pipeline import deliver_document
 from apps.pharmacy.models import PharmacyOrder , PharmacyOrderItem
 from datetime import datetime
 from apps.notifications.utils import notify_user
@@ -457,18 +456,7 @@ class DownloadPrescriptionAPIView(APIView):
             user=request.user     # Security: only owner can download
         )
 
-        file_path = prescription.file.path
-        file_name = prescription.file.name.split("/")[-1]
-
-        content_type, _ = mimetypes.guess_type(file_path)
-
-        response = FileResponse(
-            open(file_path, "rb"),
-            as_attachment=True,
-            filename=file_name,
-            content_type=content_type or "application/octet-stream"
-        )
-        return response
+        return deliver_document(request, prescription)
     
 
 # DELIVERY MODE HOME OR COD API
@@ -20,6 +20,12 @@ class PharmacyVendor(BaseModel):
     city=models.CharField(max_length=150, null=True , blank=True)
     phone=models.CharField(max_length=15, null=True, blank=True)
     email=models.EmailField(null=True, blank=True)
+    # Store location of offline vendors, for nearby search
+    latitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
+    longitude = models.DecimalField(max_digits=9, decimal_places=6, blank=True, null=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["latitude", "longitude"], name="pharmacy_vendor_geo_idx")]
 
     def __str__(self):
         return self.name
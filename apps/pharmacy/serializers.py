@@ -2,6 +2,9 @@ from rest_framework import serializers
 from .models import PharmacyVendor, PharmacyCategory, PharmacyBanner, Medicine , MedicineDetails , MedicineCoupon ,PharmacyOrderItem , PharmacyOrder
 
 class PharmacyVendorSerializer(serializers.ModelSerializer):
+    # Only present on nearby searches
+    distance_km = serializers.FloatField(read_only=True)
+
     class Meta:
         model = PharmacyVendor
         fields = "__all__"
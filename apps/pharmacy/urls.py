@@ -20,6 +20,7 @@ from .views import (
     CreateVendorAPIView,
     UpdateVendorAPIView,
     DeleteVendorAPIView,
+    NearbyPharmacyVendorAPIView,
 )
 
 from .views import (
@@ -47,6 +48,7 @@ urlpatterns = [
     path("banners/<int:pk>/delete/", DeletePharmacyBannerAPIView.as_view()),
     # Vendors
     path("vendors/", PharmacyVendorListAPIView.as_view()),
+    path("vendors/nearby/", NearbyPharmacyVendorAPIView.as_view()),
     path("vendors/create/", CreateVendorAPIView.as_view()),
     path("vendors/<int:pk>/update/", UpdateVendorAPIView.as_view()),
     path("vendors/<int:pk>/delete/", DeleteVendorAPIView.as_view()),
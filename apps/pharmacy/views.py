@@ -4,6 +4,8 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework import status
 from django.core.paginator import Paginator
+from apps.common.utils.conditional import conditional_get
+from apps.common.utils.geo import GeoLookupError, nearest, search_params
 from .models import PharmacyVendor, PharmacyCategory, PharmacyBanner, Medicine , MedicineDetails , MedicineCoupon
 from .serializers import (
     PharmacyVendorSerializer,
@@ -17,6 +19,8 @@ import requests
 from django.shortcuts import get_object_or_404
 from rest_framework.parsers import MultiPartParser, FormParser
 from .utils import generate_coupon_code, generate_coupon_name
+from django.conf import settings
+from apps.common.utils import http_client
 
 
 
@@ -26,8 +30,14 @@ from .utils import generate_coupon_code, generate_coupon_name
 
 class SyncPharmacyDataAPIView(APIView):
     def get(self, request):
-        response = requests.get("CLIENT_API_URL")
-        data = response.json()
+        client_url = getattr(settings, "CLIENT_PHARMACY_API_URL", None)
+        if not client_url:
+            return Response({"error": "CLIENT_PHARMACY_API_URL not configured in settings.py"}, status=500)
+
+        try:
+            data = http_client.get_json(client_url, timeout=10)
+        except requests.RequestException as e:
+            return Response({"error": f"Failed to fetch from client API: {e}"}, status=502)
 
         for item in data.get("products", []):
             Medicine.objects.update_or_create(
@@ -47,6 +57,10 @@ class PharmacyBannerListAPIView(generics.ListAPIView):
     queryset = PharmacyBanner.objects.all().order_by("-created_at")
     serializer_class = PharmacyBannerSerializer
 
+    @conditional_get()
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
 
 class CreatePharmacyBannerAPIView(APIView):
     parser_classes = [MultiPartParser, FormParser]
@@ -94,6 +108,19 @@ class PharmacyVendorListAPIView(generics.ListAPIView):
     serializer_class = PharmacyVendorSerializer
 
 
+class NearbyPharmacyVendorAPIView(APIView):
+    # Offline pharmacies nearest to lat/lng (or a pincode's centroid)
+    def get(self, request):
+        try:
+            lat, lon, radius, limit = search_params(request.query_params)
+        except GeoLookupError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = PharmacyVendor.objects.filter(vendor_type="offline", deleted_at__isnull=True)
+        vendors = nearest(queryset, lat, lon, radius, limit)
+        return Response(PharmacyVendorSerializer(vendors, many=True).data)
+
+
 class CreateVendorAPIView(APIView):
     def post(self, request):
         serializer = PharmacyVendorSerializer(data=request.data)
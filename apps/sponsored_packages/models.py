@@ -14,6 +14,7 @@ class SponsoredPackage(BaseModel):
     discount_percentage = models.DecimalField(max_digits=5, decimal_places=2, default=0)
     discount_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0) 
     active = models.BooleanField(default=True)
+    external_id = models.CharField(max_length=50, blank=True, null=True, unique=True)
     status = models.CharField(max_length =50, default='active')
 
     # Relationship with tests 
@@ -4,6 +4,10 @@ from rest_framework.permissions import IsAuthenticated
 from django.conf import settings
 from django.utils import timezone
 import requests
+from apps.common.utils.catalog_cache import get_catalog, catalog_mirrored
+from apps.common.pagination import OptionalPageNumberPagination
+from apps.common.utils.conditional import conditional_get
+from apps.common.utils.tiered_cache import cache_response
 
 from .models import SponsoredPackage
 from .serializers import SponsoredPackageSerializer
@@ -12,20 +16,16 @@ class SponsoredPackageViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     queryset = SponsoredPackage.objects.filter(deleted_at__isnull=True)
     serializer_class = SponsoredPackageSerializer
+    pagination_class = OptionalPageNumberPagination
 
+    @conditional_get(tags=("sponsored_packages", "tests"))
+    @cache_response("sponsored_packages", tags=("sponsored_packages", "tests"))
     def list(self, request):
         #List sponsored packages (optionally from external API).
         client_api_url = getattr(settings, "CLIENT_SPONSORED_PACKAGE_API_URL", None)
-        if client_api_url:
+        if client_api_url and not catalog_mirrored():
             try:
-                headers = {}
-                token = getattr(settings, "CLIENT_API_TOKEN", None)
-                if token:
-                    headers["Authorization"] = f"Bearer {token}"
-
-                response = requests.get(client_api_url, headers=headers, timeout=10)
-                response.raise_for_status()
-                data = response.json()
+                data = get_catalog("sponsored_packages")
 
                 formatted = [
                     {
@@ -46,6 +46,15 @@ class SponsoredPackageViewSet(viewsets.ModelViewSet):
                 )
 
         queryset = self.get_queryset().order_by("id")
+
+        search = request.query_params.get("search")
+        if search:
+            queryset = queryset.filter(name__icontains=search)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.serializer_class(page, many=True).data)
+
         serializer = self.serializer_class(queryset, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
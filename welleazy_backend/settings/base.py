@@ -21,8 +21,10 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'django_filters',
     
+    'apps.common.apps.CommonConfig',
     'apps.accounts',
     'apps.location',
     'apps.contact',
@@ -81,7 +83,7 @@ AUTH_USER_MODEL = 'accounts.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -90,6 +92,15 @@ REST_FRAMEWORK = {
         'django_filters.rest_framework.DjangoFilterBackend',
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_RENDERER_CLASSES': (
+        'apps.common.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'apps.common.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 SPECTACULAR_SETTINGS = {
@@ -131,11 +142,22 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
-    "UPDATE_LAST_LOGIN": True,
+    # last_login is written by apps.accounts.tokens.touch_last_login, at most once per LAST_LOGIN_UPDATE_INTERVAL
+    "UPDATE_LAST_LOGIN": False,
+    # Tokens carry a hash of the password (the token version checked by CachedJWTAuthentication)
+    "CHECK_REVOKE_TOKEN": True,
+    "TOKEN_REFRESH_SERIALIZER": "apps.accounts.serializers.CachedTokenRefreshSerializer",
+    "TOKEN_VERIFY_SERIALIZER": "apps.accounts.serializers.CachedTokenVerifySerializer",
 }
+LAST_LOGIN_UPDATE_INTERVAL = timedelta(minutes=15)
+
+# apps.common.middleware.compression: brotli/gzip for text-like responses at least this large
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", 1024))
+RESPONSE_COMPRESSION_BROTLI_QUALITY = int(os.getenv("RESPONSE_COMPRESSION_BROTLI_QUALITY", 4))
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'apps.common.middleware.compression.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -235,6 +257,22 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# File delivery for download endpoints
+# "django" streams from Python, "x-accel" hands off to nginx, "x-sendfile" to Apache/lighttpd
+FILE_DELIVERY_BACKEND = os.getenv("FILE_DELIVERY_BACKEND", "django")
+FILE_DELIVERY_ACCEL_PREFIX = os.getenv("FILE_DELIVERY_ACCEL_PREFIX", "/protected-media/")
+# Redirect downloads to a signed, time-limited URL instead of serving them inline
+FILE_DELIVERY_SIGNED_URLS = os.getenv("FILE_DELIVERY_SIGNED_URLS", "False").lower() == "true"
+FILE_DELIVERY_SIGNED_URL_MAX_AGE = int(os.getenv("FILE_DELIVERY_SIGNED_URL_MAX_AGE", 300))
+
+# Post-upload document pipeline (dedupe, image recompression, thumbnails)
+DOCUMENT_IMAGE_MAX_DIMENSION = int(os.getenv("DOCUMENT_IMAGE_MAX_DIMENSION", 2048))
+DOCUMENT_IMAGE_QUALITY = int(os.getenv("DOCUMENT_IMAGE_QUALITY", 80))
+DOCUMENT_THUMBNAIL_SIZE = int(os.getenv("DOCUMENT_THUMBNAIL_SIZE", 320))
+
+# Background health-record exports (PHI): job state and files are dropped after this many seconds
+HEALTH_RECORD_EXPORT_TTL = int(os.getenv("HEALTH_RECORD_EXPORT_TTL", 24 * 60 * 60))
+
 ASGI_APPLICATION = "welleazy_backend.asgi.application"
 
 CHANNEL_LAYERS = {
@@ -246,6 +284,26 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Shared cache (L2 of apps.common.utils.tiered_cache; each worker keeps a small L1 in front of it)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.getenv(
+            "REDIS_CACHE_URL",
+            f"redis://{os.getenv('REDIS_HOST', '127.0.0.1')}:{os.getenv('REDIS_PORT', 6379)}/1",
+        ),
+        "KEY_PREFIX": "welleazy",
+        "TIMEOUT": 300,
+    },
+}
+TIERED_CACHE_L1_MAX_ENTRIES = int(os.getenv("TIERED_CACHE_L1_MAX_ENTRIES", 1024))
+TIERED_CACHE_L1_TIMEOUT = int(os.getenv("TIERED_CACHE_L1_TIMEOUT", 30))
+TIERED_CACHE_TAG_CHECK_INTERVAL = int(os.getenv("TIERED_CACHE_TAG_CHECK_INTERVAL", 5))
+
+# JWT auth: cached user lookups and the Redis mirror of the token blacklist (apps.accounts.authentication/tokens)
+AUTH_USER_CACHE_TIMEOUT = int(os.getenv("AUTH_USER_CACHE_TIMEOUT", 120))
+JWT_BLACKLIST_REDIS_URL = os.getenv("JWT_BLACKLIST_REDIS_URL", CACHES["default"]["LOCATION"])
+
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://127.0.0.1:6379/0")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://127.0.0.1:6379/0")
 CELERY_ACCEPT_CONTENT = ['json']
@@ -263,6 +321,22 @@ CELERY_BEAT_SCHEDULE = {
         "task": "apps.notifications.tasks.send_upcoming_pharmacy_delivery_reminders",
         "schedule": 5 * 60,
     },
+    "sync-client-catalogs": {
+        "task": "apps.common.tasks.sync_client_catalogs",
+        "schedule": 30 * 60,
+    },
+    "sync-client-vendors": {
+        "task": "apps.common.tasks.sync_client_vendors",
+        "schedule": 15 * 60,
+    },
+    "sync-client-doctors": {
+        "task": "apps.common.tasks.sync_client_doctors",
+        "schedule": 30 * 60,
+    },
+    "purge-expired-health-record-exports": {
+        "task": "apps.health_records.common.tasks.purge_expired_exports",
+        "schedule": 60 * 60,
+    },
 }
 
 # Client API Settings
@@ -285,4 +359,21 @@ CLIENT_LANGUAGE_API_URL = get_env_url("CLIENT_LANGUAGE_API_URL")
 CLIENT_PINCODE_API_URL = get_env_url("CLIENT_PINCODE_API_URL")
 CLIENT_DOCTOR_URL = get_env_url("CLIENT_DOCTOR_URL")
 CLIENT_VENDOR_URL = get_env_url("CLIENT_VENDOR_URL")
+CLIENT_PHARMACY_API_URL = get_env_url("CLIENT_PHARMACY_API_URL")
+
+# Outbound HTTP client (apps.common.utils.http_client)
+HTTP_CLIENT_POOL_SIZE = int(os.getenv("HTTP_CLIENT_POOL_SIZE", 20))
+HTTP_CLIENT_RETRIES = int(os.getenv("HTTP_CLIENT_RETRIES", 2))
+HTTP_CLIENT_BACKOFF = float(os.getenv("HTTP_CLIENT_BACKOFF", 0.2))
+HTTP_CLIENT_BREAKER_THRESHOLD = int(os.getenv("HTTP_CLIENT_BREAKER_THRESHOLD", 5))
+HTTP_CLIENT_BREAKER_COOLDOWN = int(os.getenv("HTTP_CLIENT_BREAKER_COOLDOWN", 30))
+
+
+# "mirror": catalog list endpoints read the tables kept in sync by
+# sync_client_catalogs; "proxy": they read the client API through the cache
+CLIENT_CATALOG_SOURCE = os.getenv("CLIENT_CATALOG_SOURCE", "mirror")
 
+# Client catalog cache: per-catalog fresh TTL overrides (seconds) and the
+# window past freshness during which stale data is still served
+CLIENT_CATALOG_CACHE_TTLS = {}
+CLIENT_CATALOG_STALE_TTL = int(os.getenv("CLIENT_CATALOG_STALE_TTL", 24 * 60 * 60))
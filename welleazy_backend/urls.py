@@ -19,6 +19,7 @@ from django.urls import path, include
 from django.conf.urls.static import static
 from django.conf import settings
 from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
+from apps.common.views import MetadataBundleView, UpstreamMetricsView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -56,6 +57,9 @@ urlpatterns = [
     path("api/payments/", include("apps.payments.urls")),
     path("api/notifications/", include("apps.notifications.urls")),
     path("api/chatbot/", include("apps.chatbot.urls")),
+    path("api/files/", include("apps.common.urls")),
+    path("api/metadata/", MetadataBundleView.as_view(), name="metadata-bundle"),
+    path("api/metrics/upstreams/", UpstreamMetricsView.as_view(), name="upstream-metrics"),
 ]
 
 if settings.DEBUG: